@@ -0,0 +1,72 @@
+"""
+Measures the throughput and the latency of Handler.aprocess_text under concurrent requests
+with different latency windows of the micro-batcher.
+
+    python benchmarks/aio.py [--requests 2000] [--clients 64] [--windows 0 0.001 0.005 0.02] [--dict-size 200000]
+
+Each client sends the paragraphs of benchmarks/data/sentences_ru.txt one by one. The larger window gives
+the larger batches, so the replacers look up less words, but each request waits longer.
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+from tps import Handler, modules as md
+
+from batch import load_texts, random_dict
+
+
+async def run(handler, texts, clients):
+    latencies = []
+    texts = iter(texts)
+
+    async def client():
+        for text in texts:
+            start = time.perf_counter()
+            await handler.aprocess_text(text, keep_delimiters=False)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[client() for _ in range(clients)])
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 0.001, 0.005, 0.02])
+    parser.add_argument("--dict-size", type=int, default=200000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    paragraphs = load_texts()
+    texts = [random.choice(paragraphs) for _ in range(args.requests)]
+    words = {word.strip(".,!?;:«»()—") for text in paragraphs for word in text.split()}
+
+    stress = {word: word.replace("а", "+а", 1) for word in random_dict(words, args.dict_size)}
+    handler = Handler("ru", [
+        md.BlindReplacer(random_dict(words, args.dict_size), name="Yoficator"),
+        md.RuEmphasizer(stress)
+    ], sentence_splitter="rule")
+
+    start = time.perf_counter()
+    for text in texts:
+        handler.process_text(text, keep_delimiters=False)
+    print("synchronous: {:.0f} requests/s\n".format(len(texts) / (time.perf_counter() - start)))
+
+    print("{:>10} {:>14} {:>12} {:>12}".format("window, s", "requests/s", "p50, ms", "p99, ms"))
+    for window in args.windows:
+        handler.configure_async(latency=window)
+
+        start = time.perf_counter()
+        latencies = asyncio.run(run(handler, texts, args.clients))
+        elapsed = time.perf_counter() - start
+
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print("{:>10} {:>14.0f} {:>12.1f} {:>12.1f}".format(window, len(texts) / elapsed, p50 * 1000, p99 * 1000))
+
+
+if __name__ == "__main__":
+    main()
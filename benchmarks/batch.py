@@ -0,0 +1,102 @@
+"""
+Measures the throughput of Handler.process_batch with different numbers of worker processes.
+
+    python benchmarks/batch.py [--texts 20000] [--workers 1 2 4 8] [--dict-size 200000] [--document]
+
+The texts are the paragraphs of benchmarks/data/sentences_ru.txt, the handler has a yoficator and an emphasizer
+with random dictionaries of the passed size, so the workers have something to inherit. The throughput
+should grow almost linearly with the number of workers up to the number of CPUs.
+
+With --document the texts are joined into one long document, which is processed by Handler.generate_text
+with the passed numbers of workers; the time of the first sentence is reported as well.
+"""
+
+import os
+import time
+import random
+import argparse
+
+from tps import Handler, modules as md
+
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def load_texts():
+    with open(os.path.join(data_dir, "sentences_ru.txt"), "r", encoding="utf-8") as stream:
+        paragraphs = stream.read().split("\n\n")
+    return [" ".join(paragraph.split("\n")).strip() for paragraph in paragraphs if paragraph.strip()]
+
+
+def random_dict(words, size):
+    alphabet = "абвгдежзиклмнопрстуфхцчшщэюя"
+    entries = {word.lower(): word.lower().replace("е", "ё", 1) for word in words}
+    while len(entries) < size:
+        word = "".join(random.choice(alphabet) for _ in range(random.randint(3, 12)))
+        entries[word] = word
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dict-size", type=int, default=200000)
+    parser.add_argument("--document", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(0)
+    paragraphs = load_texts()
+    texts = [random.choice(paragraphs) for _ in range(args.texts)]
+    words = {word.strip(".,!?;:«»()—") for text in paragraphs for word in text.split()}
+
+    stress = {word: word.replace("а", "+а", 1) for word in random_dict(words, args.dict_size)}
+    handler = Handler("ru", [
+        md.BlindReplacer(random_dict(words, args.dict_size), name="Yoficator"),
+        md.RuEmphasizer(stress)
+    ], sentence_splitter="rule")
+
+    if args.document:
+        document(handler, " ".join(texts), args.workers)
+        return
+
+    print("{} texts, {} CPUs\n".format(len(texts), os.cpu_count()))
+    print("{:>8} {:>12} {:>14} {:>9}".format("workers", "time, s", "texts/s", "scaling"))
+
+    base = None
+    expected = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = handler.process_batch(texts, workers=workers, keep_delimiters=False)
+        elapsed = time.perf_counter() - start
+
+        expected = results if expected is None else expected
+        assert results == expected
+
+        base = elapsed if base is None else base
+        print("{:>8} {:>12.2f} {:>14.0f} {:>8.2f}x".format(workers, elapsed, len(texts) / elapsed, base / elapsed))
+
+
+def document(handler, text, workers_list):
+    print("{} characters, {} CPUs\n".format(len(text), os.cpu_count()))
+    print("{:>8} {:>12} {:>16} {:>9}".format("workers", "time, s", "first sentence, s", "scaling"))
+
+    base = None
+    expected = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        results = handler.generate_text(text, keep_delimiters=False, batch_size=None, workers=workers)
+        first = [next(results)]
+        first_elapsed = time.perf_counter() - start
+        results = first + list(results)
+        elapsed = time.perf_counter() - start
+
+        expected = results if expected is None else expected
+        assert results == expected
+
+        base = elapsed if base is None else base
+        print("{:>8} {:>12.2f} {:>16.3f} {:>8.2f}x".format(workers, elapsed, first_elapsed, base / elapsed))
+
+
+if __name__ == "__main__":
+    main()
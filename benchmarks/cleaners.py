@@ -0,0 +1,121 @@
+"""
+Compares punctuation_cleaners of tps.utils.cleaners with the former engine, which searched the text again
+after each replacement, on russian dialog paragraphs of growing length.
+
+    python benchmarks/cleaners.py [--sizes 1 4 16 64] [--runs 3]
+
+The cost per character of punctuation_cleaners must not grow with the length of a paragraph.
+Then a chain of cleaners compiled by compile_cleaners is compared with resolving and calling them one by one,
+as Handler.process did, on single sentences: 'compiled' reuses the chain, 'per call' compiles it for each sentence
+(which is a cache lookup). At last english_cleaners is compared with the former pipeline of separate passes.
+"""
+
+import random
+import argparse
+from timeit import repeat
+
+from tps.utils import cleaners
+from tps.utils.cleaners import punctuation_cleaners, compile_cleaners, english_cleaners
+from tests.cleaners import legacy_punctuation_cleaners, legacy_english_cleaners
+
+
+sentences = [
+    "- Привет! - сказал он. - Как дела?.. - Хорошо.",
+    "Да, - ответил он, - конечно.",
+    "А. С. Пушкин (поэт) родился в Москве.",
+    "Кое-как, во-первых – тире… и ‑ дефис.",
+    "Синтез речи — это увлекательно: текст, ударения, паузы; и снова текст...",
+    "Съешь же ещё этих мягких французских булок, да выпей чаю.",
+    "| - Новая строка, (незакрытая скобка и .слово"
+]
+
+
+def measure(function, text, runs):
+    number = max(1, 2 ** 14 // len(text))
+    return min(repeat(lambda: function(text), number=number, repeat=runs)) / number
+
+
+def legacy_chain(text, names):
+    for name in names:
+        if callable(name):
+            cleaner = name
+        elif hasattr(cleaners, name):
+            cleaner = getattr(cleaners, name)
+        else:
+            continue
+        text = cleaner(text)
+    return text
+
+
+def chains(runs):
+    configs = [
+        ["light_punctuation_cleaners"],
+        ["punctuation_cleaners", "light_punctuation_cleaners", "collapse_whitespace"],
+        ["transliteration_cleaners", "basic_cleaners"]
+    ]
+
+    print("\n{:<72} {:>10} {:>10} {:>10}".format("cleaners", "compiled", "per call", "legacy"))
+    for names in configs:
+        for sentence in sentences:
+            assert compile_cleaners(names)(sentence) == legacy_chain(sentence, names)
+
+        chain = compile_cleaners(names)
+        compiled = min(repeat(lambda: [chain(s) for s in sentences], number=200, repeat=runs))
+        current = min(repeat(lambda: [compile_cleaners(names)(s) for s in sentences], number=200, repeat=runs))
+        legacy = min(repeat(lambda: [legacy_chain(s, names) for s in sentences], number=200, repeat=runs))
+
+        scale = 1e6 / 200 / len(sentences)
+        print("{:<72} {:>10.2f} {:>10.2f} {:>10.2f}".format(
+            ", ".join(names), compiled * scale, current * scale, legacy * scale))
+
+
+english_sentences = [
+    "Mr. Smith paid $3.50 for 2 apples on the 21st of May, 1999.",
+    "Dr. Who owes 1,250 dollars to St. John Co. Ltd. and 0.5 pounds to Mrs. Hudson.",
+    "In 2005 there were 2,000,000 people in 12 cities and 3 villages.",
+    "The quick brown fox jumps over the lazy dog."
+]
+
+
+def english(runs):
+    for sentence in english_sentences:
+        assert english_cleaners(sentence) == legacy_english_cleaners(sentence)
+
+    current = min(repeat(lambda: [english_cleaners(s) for s in english_sentences], number=50, repeat=runs))
+    legacy = min(repeat(lambda: [legacy_english_cleaners(s) for s in english_sentences], number=50, repeat=runs))
+
+    scale = 1e6 / 50 / len(english_sentences)
+    print("\n{:<72} {:>10.2f} {:>10} {:>10.2f}".format("english_cleaners", current * scale, "", legacy * scale))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16, 64], help="paragraph sizes in KB")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--legacy-limit", type=int, default=16, help="max size in KB to measure the former engine")
+    args = parser.parse_args()
+
+    random.seed(0)
+    print("{:>6} {:>14} {:>14} {:>9}".format("KB", "ns/char", "legacy ns/char", "speedup"))
+
+    for size in args.sizes:
+        words = []
+        while sum(len(sentence) + 1 for sentence in words) < size * 1024:
+            words.append(random.choice(sentences))
+        text = " ".join(words)
+
+        current = measure(punctuation_cleaners, text, args.runs) / len(text) * 1e9
+
+        if size <= args.legacy_limit:
+            assert punctuation_cleaners(text) == legacy_punctuation_cleaners(text)
+            legacy = measure(legacy_punctuation_cleaners, text, args.runs) / len(text) * 1e9
+            print("{:>6} {:>14.1f} {:>14.1f} {:>8.1f}x".format(size, current, legacy, legacy / current))
+        else:
+            print("{:>6} {:>14.1f} {:>14} {:>9}".format(size, current, "-", "-"))
+
+    chains(args.runs)
+    english(args.runs)
+
+
+if __name__ == "__main__":
+    main()
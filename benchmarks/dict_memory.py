@@ -0,0 +1,81 @@
+"""
+Compares the memory footprint and the lookup time of the dictionary storages.
+
+    python benchmarks/dict_memory.py [--dict path/to/stress.dict]
+
+By default the stress dictionary is searched (or downloaded) in the data folder of the repository.
+'heap' is the memory held by python objects after loading, 'mapped' is the size of the memory-mapped file,
+whose pages are shared by all the processes.
+"""
+
+import os
+import gc
+import random
+import argparse
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from tps.content import ops
+from tps.utils import load_dict
+from tps.dicts import DAWG, StressDict, DiskDict, ParadigmDict, compile_dict, build_disk_dict
+
+
+cfd = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(cfd, "../data")
+
+
+def measure(name, build, keys, mapped_file=None):
+    gc.collect()
+    tracemalloc.start()
+    t1 = perf_counter()
+    entries = build()
+    load_time = perf_counter() - t1
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t1 = perf_counter()
+    for key in keys:
+        entries.get(key)
+    lookup_time = (perf_counter() - t1) / len(keys)
+
+    mapped = os.path.getsize(mapped_file) if mapped_file is not None else 0
+
+    print("{:<10} heap {:>8.1f} MB   mapped {:>7.1f} MB   load {:>7.3f} s   lookup {:>6.2f} us".format(
+        name, heap / 2 ** 20, mapped / 2 ** 20, load_time, lookup_time * 1e6))
+
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dict", default=None, help="path to the plane dictionary")
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    filepath = args.dict
+    if filepath is None:
+        filepath = ops.find("stress.dict", data_dir) or ops.download("stress.dict", data_dir)
+
+    entries = load_dict(filepath, "plane")
+    keys = random.sample(list(entries), min(args.lookups, len(entries)))
+    print("{}: {} entries".format(filepath, len(entries)))
+    del entries
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compiled_path = compile_dict(filepath, os.path.join(tmp_dir, "dict.cdict"), "plane")
+        dawg_path = DAWG.from_mapping(filepath, "plane").save(os.path.join(tmp_dir, "dict.dawg"))
+        disk_path = build_disk_dict(filepath, os.path.join(tmp_dir, "dict.sqlite"), "plane")
+        paradigm_path = ParadigmDict.from_mapping(filepath, "plane").save(os.path.join(tmp_dir, "dict.pdict"))
+
+        measure("dict", lambda: load_dict(filepath, "plane"), keys)
+        measure("compiled", lambda: load_dict(compiled_path), keys, compiled_path).close()
+        measure("dawg", lambda: load_dict(dawg_path), keys, dawg_path)
+        measure("stress", lambda: StressDict.from_file(filepath, "plane"), keys)
+        measure("disk", lambda: DiskDict(disk_path, ram_budget=4 * 2 ** 20), keys).close()
+        measure("paradigm", lambda: ParadigmDict.load(paradigm_path), keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Measures the time of 'import tps' in fresh interpreters.
+
+    python benchmarks/import_time.py [--runs 10] [--max 0.5] [--top 10]
+
+With --max the script fails if the median import time exceeds the limit (in seconds), so it can guard
+the startup time of CLI tools and short-lived jobs. --top prints the slowest imported modules.
+"""
+
+import sys
+import argparse
+import subprocess
+from statistics import median
+
+
+def measure(runs):
+    code = "import time; t = time.perf_counter(); import tps; print(time.perf_counter() - t)"
+    return [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+            for _ in range(runs)]
+
+
+def slowest_modules(top):
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tps"],
+                            capture_output=True, text=True, check=True).stderr
+
+    modules = []
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        modules.append((int(cumulative), name.strip()))
+
+    return sorted(modules, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max", type=float, default=None, help="maximum median import time in seconds")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    times = measure(args.runs)
+    print("import tps: median {:.3f} s, min {:.3f} s, max {:.3f} s".format(median(times), min(times), max(times)))
+
+    for cumulative, name in slowest_modules(args.top):
+        print("{:>10.1f} ms  {}".format(cumulative / 1000, name))
+
+    if args.max is not None and median(times) > args.max:
+        sys.exit("Median import time {:.3f} s exceeds {:.3f} s".format(median(times), args.max))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compares the accuracy and the speed of the sentence splitters on the corpora in benchmarks/data.
+
+    python benchmarks/sentence_split.py [--runs 20]
+
+Each corpus consists of paragraphs separated by empty lines, one reference sentence per line.
+The paragraphs are joined and split again: 'precision' and 'recall' are computed over the sentence boundaries,
+'exact' is the share of paragraphs split exactly as the reference. 'prompt' is the time of splitting a short
+request without terminal punctuation, 'paragraph' is the average time per paragraph of the corpus.
+"""
+
+import os
+import argparse
+from timeit import repeat
+
+from tps.modules import PunktSplitter, RuleSplitter
+
+
+cfd = os.path.dirname(os.path.abspath(__file__))
+corpora = {
+    "russian": (os.path.join(cfd, "data/sentences_ru.txt"), "привет как дела"),
+    "english": (os.path.join(cfd, "data/sentences_en.txt"), "hello how are you")
+}
+
+
+def read_corpus(filepath):
+    with open(filepath, encoding="utf-8") as file:
+        return [paragraph.split("\n") for paragraph in file.read().strip().split("\n\n")]
+
+
+def boundaries(sentences):
+    positions, position = set(), 0
+    for sentence in sentences[:-1]:
+        position += len(sentence.replace(" ", ""))
+        positions.add(position)
+    return positions
+
+
+def evaluate(splitter, paragraphs, prompt, runs):
+    true_positive = predicted = expected = exact = 0
+    for reference in paragraphs:
+        result = splitter.split(" ".join(reference))
+        exact += result == reference
+
+        reference, result = boundaries(reference), boundaries(result)
+        true_positive += len(reference & result)
+        predicted += len(result)
+        expected += len(reference)
+
+    texts = [" ".join(reference) for reference in paragraphs]
+    paragraph_time = min(repeat(lambda: [splitter.split(text) for text in texts], number=1, repeat=runs)) / len(texts)
+    prompt_time = min(repeat(lambda: splitter.split(prompt), number=100, repeat=runs)) / 100
+
+    print("{:<14} precision {:>6.3f}   recall {:>6.3f}   exact {:>6.3f}   prompt {:>7.2f} us   "
+          "paragraph {:>7.2f} us".format(type(splitter).__name__, true_positive / max(predicted, 1),
+                                         true_positive / max(expected, 1), exact / len(paragraphs),
+                                         prompt_time * 1e6, paragraph_time * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    for language, (filepath, prompt) in corpora.items():
+        paragraphs = read_corpus(filepath)
+        print("{}: {} paragraphs, {} sentences".format(
+            language, len(paragraphs), sum(len(paragraph) for paragraph in paragraphs)))
+
+        for splitter in [RuleSplitter(language), PunktSplitter(language)]:
+            try:
+                evaluate(splitter, paragraphs, prompt, args.runs)
+            except LookupError:
+                print("{:<14} the Punkt model is not found, try to download it: nltk.download('punkt')".format(
+                    type(splitter).__name__))
+        print()
+
+
+if __name__ == "__main__":
+    main()
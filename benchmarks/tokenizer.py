@@ -0,0 +1,100 @@
+"""
+Compares the tokenizer of tps.utils with the former marker-substitution one on long russian paragraphs.
+
+    python benchmarks/tokenizer.py [--sentences 200] [--paragraphs 50] [--runs 5]
+
+'weight' is Processor._calc_weight of a paragraph, which is called for each unit while splitting a sentence
+by max_unit_length.
+"""
+
+import random
+import argparse
+from timeit import repeat
+
+from tps.modules import Processor
+from tps.symbols import shields, separator
+from tps.utils import split_to_tokens, tokenize, token_spans, _punct_re
+
+
+sentences = [
+    "В чащах юга жил бы цитрус? Да, но фальшивый экземпляр!",
+    "Съешь же ещё этих мягких французских булок, да выпей чаю.",
+    "Широкая электрификация южных губерний даст мощный толчок подъёму сельского хозяйства.",
+    "«Любя, съешь щипцы», — вздохнёт мэр, — «кайф жгуч».",
+    "Эх, чужак, общий съём цен шляп (юфть) — вдрызг!",
+    "Синтез речи — это увлекательно: текст, ударения, паузы; и снова текст...",
+    "Друг мой, эльф! Яшке б свёз птиц южных чащ!",
+    "Шеф взъярён тчк щипцы с эхом гудбай Жюль.",
+    "Все_таки {это} слово с под_чёркиванием и в фигурных скобках."
+]
+
+
+def legacy_split_to_tokens(text, punct_re=None):
+    punct_re = _punct_re if punct_re is None else punct_re
+
+    prepared = punct_re.sub(lambda elem: "⁑{}⁑".format(elem.group(0)), text)
+
+    prepared = prepared.split("⁑")
+    prepared = [t for t in prepared if t != ""]
+
+    return prepared
+
+
+def legacy_calc_weight(text):
+    _text = text
+    for symb in shields:
+        _text = _text.replace(symb, "")
+
+    _text = legacy_split_to_tokens(_text)
+
+    return sum(len(s.split(separator)) if separator in s else len(s) for s in _text)
+
+
+def measure(name, function, paragraphs, runs):
+    def run():
+        for paragraph in paragraphs:
+            function(paragraph)
+
+    best = min(repeat(run, number=1, repeat=runs))
+    chars = sum(len(paragraph) for paragraph in paragraphs)
+
+    print("{:<28} {:>8.2f} ms   {:>7.1f} MB/s".format(name, best * 1e3, chars / best / 2 ** 20))
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=200, help="number of sentences in a paragraph")
+    parser.add_argument("--paragraphs", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    paragraphs = [
+        " ".join(random.choice(sentences) for _ in range(args.sentences)) for _ in range(args.paragraphs)
+    ]
+
+    processor = Processor()
+    for paragraph in paragraphs:
+        assert split_to_tokens(paragraph) == legacy_split_to_tokens(paragraph)
+        assert processor._calc_weight(paragraph) == legacy_calc_weight(paragraph)
+
+    print("{} paragraphs of {} chars on average\n".format(
+        len(paragraphs), sum(len(paragraph) for paragraph in paragraphs) // len(paragraphs)))
+
+    cases = [
+        ("split_to_tokens", legacy_split_to_tokens, split_to_tokens),
+        ("weight", legacy_calc_weight, processor._calc_weight)
+    ]
+    for name, legacy, current in cases:
+        legacy_time = measure("{} (legacy)".format(name), legacy, paragraphs, args.runs)
+        current_time = measure(name, current, paragraphs, args.runs)
+        print("{:<28} {:>8.2f}x\n".format("speedup", legacy_time / current_time))
+
+    measure("tokenize", tokenize, paragraphs, args.runs)
+    measure("token_spans", lambda paragraph: sum(1 for _ in token_spans(paragraph)), paragraphs, args.runs)
+
+
+if __name__ == "__main__":
+    main()
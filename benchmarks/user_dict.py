@@ -0,0 +1,97 @@
+"""
+Compares the former Handler.dict_check with tps.dicts.CompiledUserDict on a big user dictionary.
+
+    python benchmarks/user_dict.py [--words 5000] [--phrases 1000] [--sentences 200]
+
+The dictionary consists of random words and phrase keys with several literal phrases each,
+the sentences contain some of them.
+"""
+
+import re
+import random
+import argparse
+from timeit import repeat
+
+from tps.modules import Processor
+from tps.dicts import CompiledUserDict
+
+
+alphabet = "абвгдежзиклмнопрстуфхцчшщэюя"
+
+
+def legacy_dict_check(string, user_dict):
+    words = Processor.split_to_words(string)
+
+    regexp_case = []
+    for i, word in enumerate(words):
+        key = word.lower()
+        if key in user_dict:
+            item = user_dict[key]
+
+            if word.istitle():
+                item = item.capitalize()
+
+            if isinstance(item, dict):
+                regexp_case.append(word)
+            else:
+                words[i] = item
+
+    regexp_case = set(regexp_case)
+    string = Processor.join_words(words)
+
+    for word in regexp_case:
+        for case, value in user_dict[word].items():
+            regexp = re.compile(case, re.IGNORECASE)
+            string = regexp.sub(lambda elem: value, string)
+
+    return string
+
+
+def random_word():
+    return "".join(random.choice(alphabet) for _ in range(random.randint(3, 10)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--phrases", type=int, default=1000)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    user_dict = {random_word(): random_word() + "+" for _ in range(args.words)}
+    for _ in range(args.phrases):
+        key = random_word()
+        user_dict[key] = {"{} {}".format(random_word(), key): random_word() for _ in range(3)}
+
+    keys = list(user_dict)
+    sentences = []
+    for _ in range(args.sentences):
+        words = [random_word() for _ in range(12)] + random.sample(keys, 3)
+        phrase_key = random.choice(keys)
+        if isinstance(user_dict[phrase_key], dict):
+            words.append(random.choice(list(user_dict[phrase_key])))
+        random.shuffle(words)
+        sentences.append(" ".join(words).capitalize() + ".")
+
+    t_compile = min(repeat(lambda: CompiledUserDict(user_dict), number=1, repeat=args.runs))
+    compiled = CompiledUserDict(user_dict)
+    t_compiled = min(repeat(lambda: [compiled.process(s) for s in sentences], number=1, repeat=args.runs))
+
+    print("{} words, {} phrase keys, {} sentences".format(args.words, args.phrases, len(sentences)))
+    print("{:<22} {:>9.2f} ms".format("compilation", t_compile * 1e3))
+    print("{:<22} {:>9.2f} us/sentence".format("CompiledUserDict", t_compiled / len(sentences) * 1e6))
+
+    try:
+        t_legacy = min(repeat(lambda: [legacy_dict_check(s, user_dict) for s in sentences], number=1, repeat=args.runs))
+    except LookupError:
+        print("{:<22} the Punkt model is not found, try to download it: nltk.download('punkt')".format("legacy"))
+        return
+
+    print("{:<22} {:>9.2f} us/sentence".format("legacy dict_check", t_legacy / len(sentences) * 1e6))
+    print("{:<22} {:>9.2f}x".format("speedup", t_legacy / t_compiled))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import re
+import random
+
+from unidecode import unidecode
+
+from tps.utils import cleaners
+from tps.utils.cleaners import punctuation_cleaners, apply_regexp, compile_cleaners, english_cleaners
+from tps.utils.numbs import normalize_numbers
+
+
+data_dir = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "data")
+
+_hyphen = re.compile(r"\b-\b")
+_star = re.compile(r"\b\#\b")
+_phrase_1 = re.compile(r"([?!.]+ - (?=[А-Я]))")
+_phrase_2 = re.compile(", - ")
+_phrase_3 = re.compile(r"(\| |^ |\|- |^- )")
+_bracket_1 = re.compile(r"\([^)]+$")
+_bracket_2 = re.compile(r"^[^(]+\)(?=.+$)")
+_signs_3 = re.compile(r"(?<=\W)[А-Я]{1}\.(?= [А-Я+])")
+_signs_5 = re.compile(r"\.(?=[А-Яа-я+])")
+
+
+def legacy_punctuation_cleaners(text):
+    text = text.replace("–", "-")
+    text = text.replace("‑", "-")
+    text = text.replace("…", ".")
+
+    text = apply_regexp(_hyphen, text, lambda elem: "#")
+
+    text = apply_regexp(_phrase_1, text, lambda elem: elem[0] + " ")
+    text = apply_regexp(_phrase_2, text, lambda elem: elem[1:])
+    text = apply_regexp(_phrase_3, text, lambda elem: "")
+
+    text = apply_regexp(_bracket_1, text, lambda elem: elem[1:])
+    text = apply_regexp(_bracket_2, text, lambda elem: elem[:-1])
+
+    text = apply_regexp(_signs_3, text, lambda elem: elem[0])
+    text = apply_regexp(_signs_5, text, lambda elem: "")
+
+    text = apply_regexp(_star, text, lambda elem: "-")
+    text = text.replace(" - ", " — ")
+
+    return text
+
+
+def legacy_english_cleaners(text):
+    text = unidecode(text).lower()
+    text = normalize_numbers(text)
+    text = cleaners.expand_abbreviations_en(text)
+    text = cleaners.collapse_whitespace(text)
+    return text
+
+
+def corpus():
+    texts = [
+        "- Привет! - сказал он. - Как дела?.. - Хорошо.",
+        "Да, - ответил он, - конечно, -, - Нет.",
+        "|- Реплика|  - вторая| третья",
+        "Текст (с пояснением) и (незакрытой скобкой",
+        "незакрытой) скобкой (и открытой",
+        "А. С. Пушкин и .слово с точкой, ...Многоточие",
+        "Кое-как, во-первых – тире… и ‑ дефис"
+    ]
+
+    for filename in ("sentences_ru.txt", "sentences_en.txt"):
+        with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as stream:
+            texts.extend(line.rstrip("\n") for line in stream)
+
+    return texts
+
+
+def reference():
+    for text in corpus():
+        assert punctuation_cleaners(text) == legacy_punctuation_cleaners(text), text
+
+
+def fuzz():
+    random.seed(0)
+    alphabets = [
+        list("аБВ a-|( )\n.,!?#–…+") + ["- ", " - ", "| ", "А. ", ", - "],
+        list("|- a"),
+        list("()\na"),
+        list(".!?, -АаЁ|"),
+        list(", -Б")
+    ]
+
+    for alphabet in alphabets:
+        for _ in range(2000):
+            text = "".join(random.choice(alphabet) for _ in range(random.randint(0, 24)))
+            assert punctuation_cleaners(text) == legacy_punctuation_cleaners(text), text
+
+
+def long_text():
+    # the legacy engine is quadratic on these, so the results are written out
+    count = 5000
+    assert punctuation_cleaners(", -" * count + " Б") == "Б"
+    assert punctuation_cleaners("|- " * count + "Б") == "Б"
+    assert punctuation_cleaners("а" + ")" * count + "б(") == "аб("
+    assert punctuation_cleaners("(" * count + "а)" + "(" * count + "б") == "(" * count + "а)б"
+    assert punctuation_cleaners("." * count + "Б") == "Б"
+
+
+def compiled():
+    configs = [
+        "light_punctuation_cleaners",
+        ["punctuation_cleaners", "light_punctuation_cleaners", "collapse_whitespace"],
+        ("lowercase", "basic_cleaners", cleaners.collapse_whitespace),
+        ["transliteration_cleaners", "english_cleaners"]
+    ]
+    texts = corpus() + [' «Да» - сказал  он\t\n "ну" – … ', "Mr. Smith paid $3.50 to Dr.  Who\n"]
+
+    for config in configs:
+        chain = compile_cleaners(config)
+        assert chain is compile_cleaners(config)
+
+        functions = [config] if isinstance(config, str) else config
+        functions = [getattr(cleaners, f) if isinstance(f, str) else f for f in functions]
+        for text in texts:
+            expected = text
+            for function in functions:
+                expected = function(expected)
+            assert chain(text) == expected, (config, text)
+
+    chain = compile_cleaners([{"ё": "е", "«": ""}, {"е": "э"}, "punctuation_cleaners"])
+    assert len(chain) == 2
+    assert chain("«Ёлка» – ель…") == "Ёлка» — эль."
+
+    assert len(compile_cleaners(["unknown", "lowercase"])) == 1
+    assert len(compile_cleaners(["compile_cleaners", "CompiledCleaners", "Callable", "apply_regexp"])) == 0
+
+
+def english():
+    texts = [
+        "Mr. Smith paid $3.50 for 2 apples on the 21st of May, 1999.",
+        "Dr. Who owes 1,250 dollars to St. John Co. Ltd., £2 to Mrs. Hudson and 0.5 to Capt. Col.",
+        "In 2005 and 1900 there were 2,000,000 people; st.co. and co.st. are expanded differently.",
+        "Café «Ñandú» $1.2.3 costs $.5, $0.01 and 1.5th of ft.lt.drs."
+    ]
+    with open(os.path.join(data_dir, "sentences_en.txt"), "r", encoding="utf-8") as stream:
+        texts.extend(line.rstrip("\n") for line in stream)
+
+    random.seed(0)
+    words = list("0123456789.,$ stndrh") + ["mr", "mrs", "st", "co", "col", "ltd", "1st", "2nd", "3rd", "£", "é"]
+    for _ in range(3000):
+        texts.append("".join(random.choice(words) for _ in range(random.randint(0, 12))))
+
+    for text in texts:
+        try:
+            expected = legacy_english_cleaners(text)
+        except ValueError:  # e.g. "$1,2": both versions fail on the malformed amounts
+            continue
+        assert english_cleaners(text) == expected, text
+
+
+def test():
+    reference()
+    fuzz()
+    long_text()
+    compiled()
+    english()
+
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,47 @@
+import os
+import json
+import hashlib
+import tempfile
+
+from tps.content import ops
+
+
+def checksum_cache():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "test.dict")
+        cache_path = filepath + ops.checksum_suffix
+        with open(filepath, "w", encoding="utf-8") as stream:
+            stream.write("привет|прив+ет\n")
+
+        checksum = ops.calc_checksum(filepath)
+        with open(filepath, "rb") as stream:
+            assert checksum == hashlib.md5(stream.read()).hexdigest()
+        assert os.listdir(tmp_dir) == ["test.dict"]  # calc_checksum caches nothing
+
+        assert ops.find("test.dict", tmp_dir, checksum=checksum, use_cache=False) == filepath
+        assert not os.path.exists(cache_path)
+
+        assert ops.find("test.dict", tmp_dir, checksum=checksum) == filepath
+        with open(cache_path, "r", encoding="utf-8") as stream:
+            cached = json.load(stream)
+        assert cached["checksum"] == checksum
+
+        cached["checksum"] = "cached"
+        with open(cache_path, "w", encoding="utf-8") as stream:
+            json.dump(cached, stream)
+        assert ops.find("test.dict", tmp_dir, checksum="cached") == filepath
+        assert ops.find("test.dict", tmp_dir, checksum="cached", use_cache=False) is None
+
+        with open(filepath, "a", encoding="utf-8") as stream:
+            stream.write("мир|м+ир\n")
+        checksum = ops.calc_checksum(filepath)
+        assert ops.find("test.dict", tmp_dir, checksum="cached") is None
+        assert ops.find("test.dict", tmp_dir, checksum=checksum) == filepath
+
+
+def test():
+    checksum_cache()
+
+
+if __name__ == "__main__":
+    test()
@@ -0,0 +1,230 @@
+import os
+import pickle
+import tempfile
+
+from tps import modules as md
+from tps.utils import load_dict
+from tps.dicts import CompiledDict, SharedDict, ShardedDict, DAWG, StressDict, DiskDict, ParadigmDict, \
+    CompiledUserDict, AhoCorasick, compile_dict, build_composite, build_disk_dict
+
+
+entries = {
+    "привет": "прив+ет",
+    "мир": "м+ир",
+    "ежик": "ёжик",
+    "синтез": "с+интэз",
+    "hello": "hell+o"
+}
+
+
+def compiled():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = compile_dict(entries, os.path.join(tmp_dir, "test.cdict"))
+
+        compiled_dict = load_dict(filepath)
+        assert isinstance(compiled_dict, CompiledDict)
+        assert len(compiled_dict) == len(entries)
+        assert dict(compiled_dict.items()) == entries
+        assert compiled_dict.get("ежик") == "ёжик"
+        assert compiled_dict.get("ёжик") is None
+        assert "мир" in compiled_dict and "миры" not in compiled_dict
+
+        module = md.Emphasizer([filepath, "compiled"])
+        module.warmup()
+        assert module("привет, мир!") == "прив+ет, м+ир!"
+
+        compiled_dict.close()
+
+
+def shared():
+    shared_dict = SharedDict.create(entries)
+    attached = SharedDict.attach(shared_dict.name)
+    assert dict(attached.items()) == entries
+
+    unpickled = pickle.loads(pickle.dumps(shared_dict))
+    assert unpickled.name == shared_dict.name
+    assert unpickled.get("синтез") == "с+интэз"
+
+    module = md.BlindReplacer(attached)
+    assert module("синт+ез речи") == "с+интэз речи"
+
+    unpickled.close()
+    attached.close()
+    shared_dict.close()
+
+
+def sharded():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "test.dict")
+        with open(filepath, "w", encoding="utf-8") as stream:
+            stream.write("\n".join("{}|{}".format(key, value) for key, value in entries.items()))
+
+        sharded_dict = ShardedDict(filepath, prefix_length=1, max_shards=1)
+        assert os.path.exists(sharded_dict.index_path)
+        assert len(sharded_dict) == len(entries)
+        assert sharded_dict.loaded_shards == []
+
+        assert sharded_dict["мир"] == "м+ир"
+        assert sharded_dict.get("ежик") == "ёжик"
+        assert sharded_dict.loaded_shards == ["е"]
+        assert "мирный" not in sharded_dict and "ёжик" not in sharded_dict
+        assert sorted(sharded_dict) == sorted(entries)
+
+        sharded_dict = ShardedDict(filepath, prefix_length=2)
+        module = md.Emphasizer(sharded_dict)
+        assert module("привет, мир!") == "прив+ет, м+ир!"
+        assert sorted(sharded_dict.loaded_shards) == ["ми", "пр"]
+
+
+def dawg():
+    _entries = dict(entries, **{"мирный": "м+ирный", "с+ерый": "с+ерый", "всё": "всё"})
+    automaton = DAWG.from_mapping(_entries)
+
+    assert len(automaton) == len(_entries)
+    assert dict(automaton.items()) == _entries
+    assert automaton["мирный"] == "м+ирный" and automaton["ежик"] == "ёжик"
+    assert automaton.get("мирн") is None and "миры" not in automaton
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = automaton.save(os.path.join(tmp_dir, "test.dawg"))
+        module = md.Emphasizer([filepath, "dawg"])
+        assert module("привет, мирный мир!") == "прив+ет, м+ирный м+ир!"
+
+
+def stress():
+    pairs = list(entries.items()) + [("мирный", "м+ирный"), ("всё", "всё"), ("молоко", "м+олок+о"),
+                                     ("мир", "мир"), ("мир", "м+ир")]
+    _entries = dict(pairs)
+    stress_dict = StressDict(pairs)
+
+    assert len(stress_dict) == len(_entries)
+    assert dict(stress_dict.items()) == _entries
+    assert stress_dict["ежик"] == "ёжик" and stress_dict["мир"] == "м+ир"
+    assert stress_dict.get("мирн") is None and "миры" not in stress_dict
+
+    module = md.Emphasizer(stress_dict)
+    assert module("привет, мирный мир!") == "прив+ет, м+ирный м+ир!"
+
+
+def disk():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = build_disk_dict(entries, os.path.join(tmp_dir, "test.sqlite"))
+        disk_dict = DiskDict(filepath, ram_budget=2000)
+
+        assert len(disk_dict) == len(entries)
+        assert dict(disk_dict.items()) == entries
+        assert all(key in disk_dict.bloom for key in entries)
+
+        module = md.Emphasizer(disk_dict)
+        assert module("привет, мир! привет, мир!") == "прив+ет, м+ир! прив+ет, м+ир!"
+        assert disk_dict.stats["disk_hits"] == 2 and disk_dict.stats["ram_hits"] >= 2
+
+        def counters(disk_dict):
+            return {name: disk_dict.stats[name] for name in ["ram_hits", "disk_hits", "misses", "bloom_rejects"]}
+
+        # an absent word, which is rejected by the Bloom filter, is never looked up on disk
+        absent = next(word for word in ("мирн{}".format(idx) for idx in range(1000)) if word not in disk_dict.bloom)
+        disk_dict.reset_stats()
+        assert disk_dict.get(absent) is None and disk_dict.get(absent) is None
+        assert counters(disk_dict) == {"ram_hits": 0, "disk_hits": 0, "misses": 0, "bloom_rejects": 2}
+
+        # without the filter, the first lookup misses on disk and the second one finds the absence in the cache
+        no_bloom_dict = DiskDict(filepath, ram_budget=2000, use_bloom=False)
+        assert no_bloom_dict.get(absent) is None and no_bloom_dict.get(absent) is None
+        assert counters(no_bloom_dict) == {"ram_hits": 1, "disk_hits": 0, "misses": 1, "bloom_rejects": 0}
+        assert disk_dict.stats["cache_size"] <= 2000
+        no_bloom_dict.close()
+
+        disk_dict = pickle.loads(pickle.dumps(disk_dict))
+        assert disk_dict["hello"] == "hell+o"
+        disk_dict.close()
+
+
+def paradigm():
+    _entries = dict(entries)
+    for stem, accent_pos in [("стол", None), ("слон", None), ("кот", None), ("дом", None), ("мост", 1)]:
+        for ending in ["", "а", "у", "ом", "е", "ы", "ов", "ам", "ами", "ах"]:
+            word = stem + ending
+            pos = len(stem) + ending.find("а") if accent_pos is None and "а" in ending else accent_pos or 1
+            _entries[word] = word[:pos] + "+" + word[pos:]
+    _entries.update({"молоко": "м+олок+о", "всё": "всё", "с+ерый": "с+ерый"})
+
+    paradigm_dict = ParadigmDict.from_mapping(_entries, min_confidence=0.8)
+    assert len(paradigm_dict) == len(_entries)
+    assert dict(paradigm_dict.items()) == _entries
+    assert paradigm_dict.stats["paradigms"] < paradigm_dict.stats["stems"] < len(_entries)
+    assert paradigm_dict.get("столами") == "стол+ами" and "столик" not in paradigm_dict
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paradigm_dict = ParadigmDict.load(paradigm_dict.save(os.path.join(tmp_dir, "test.pdict")), guess=True)
+        assert dict(paradigm_dict.items()) == _entries
+        assert paradigm_dict.get("пост") is None and paradigm_dict.get("постами") == "пост+ами"
+
+        module = md.Emphasizer(paradigm_dict)
+        assert module("привет, слонам!") == "прив+ет, слон+ам!"
+
+
+def composite():
+    # the replacements of several tokens are processed by the next modules token by token
+    e_dict = {"синтез": "с+интэз", "стресс": "стр+эсс", "кафе": "каф+э, елкой"}
+    yo_dict = {"ежик": "ёжик", "елкой": "ёлкой", "нашел": "нашёл", "елке": "ёлке, под"}
+    stress_dict = {"речи": "р+ечи", "под": "п+од", "ёжик": "ёжик", "стрэсс": "стр+эсс", "м+ука": "мук+а"}
+
+    text = "синтез речи, еж+ик под елкой нашел стр+есс и всё, п+од ёлкой в кафе на елке, м+ука"
+    for prefer_user in [True, False]:
+        chain = [
+            md.BlindReplacer(e_dict, name="Eficator"),
+            md.BlindReplacer(yo_dict, name="Yoficator"),
+            md.RuEmphasizer(stress_dict, prefer_user)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = build_composite(e_dict, yo_dict, stress_dict, os.path.join(tmp_dir, "composite.cdict"),
+                                       prefer_user)
+            module = md.RuCompositeEmphasizer([filepath, "compiled"], prefer_user)
+
+            for kwargs in [{}, {"mask_stress": True}]:
+                target = text
+                for chain_module in chain:
+                    target = chain_module(target, **kwargs)
+
+                assert module(text, **kwargs) == target
+
+
+def user():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    assert sorted(automaton.finditer("ushers")) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+    assert automaton.findall("ushers") == [(1, 4, 1)]
+
+    user_dict = CompiledUserDict({
+        "hello": "hell+o",
+        "compact": {
+            "a compact bag": "a c+ompact bag",
+            "to compact something": "to comp+act something",
+            r"compact(?= car)": "c+ompact"
+        },
+        "e.g": "for example"
+    })
+    assert "Hello" in user_dict and "bag" not in user_dict
+
+    text = "Hello, it's a compact bag, e.g. «A COMPACT BAG» or a compact car. Compact!"
+    target = "Hell+o, it's a c+ompact bag, for example. «a c+ompact bag» or a c+ompact car. Compact!"
+    assert user_dict.process(text) == target
+    assert user_dict.process("a compact bag is not here") == "a c+ompact bag is not here"
+    assert user_dict.process("no bag") == "no bag"
+
+
+def test():
+    compiled()
+    shared()
+    sharded()
+    dawg()
+    stress()
+    disk()
+    paradigm()
+    composite()
+    user()
+
+
+if __name__ == "__main__":
+    test()
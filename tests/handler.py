@@ -1,7 +1,9 @@
 import os
+import asyncio
+import tempfile
 from time import time
 
-from tps import Handler
+from tps import Handler, modules as md
 
 
 cfd = os.path.dirname(os.path.abspath(__file__))
@@ -9,7 +11,7 @@ data_dir = os.path.join(cfd, "../data")
 
 
 def russian():
-    handler = Handler.from_charset("ru", data_dir=data_dir, silent=True)
+    handler = Handler.from_charset("ru", data_dir=data_dir, silent=True, warmup=True)
     text = "В чащах юга жил бы цитрус? Да, но фальшивый экземпляр! " \
            "Ежик испытвал стресс, потому что под елкой не было грибочка. " \
            "Но детектив нашел его для ежика. Это столило ежику триста руб. " \
@@ -47,9 +49,181 @@ def english():
     assert result == target
 
 
+def snapshot():
+    modules = [
+        md.BlindReplacer({"ежик": "ёжик", "елкой": "ёлкой"}, name="Yoficator"),
+        md.RuEmphasizer({"под": "п+од", "ёжик": "ёжик", "грибы": "гриб+ы"})
+    ]
+    handler = Handler("ru", modules)
+    text = "Ежик нашел грибы под елкой."
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        restored = Handler.load_snapshot(handler.save_snapshot(os.path.join(tmp_dir, "ru.snapshot")))
+
+        assert [type(module) for module in restored.modules] == [type(module) for module in handler.modules]
+        assert restored.process_text(text, keep_delimiters=False) == handler.process_text(text, keep_delimiters=False)
+        assert restored.text2vec("+ёжик") == handler.text2vec("+ёжик")
+
+
+def normalization():
+    handler = Handler("ru", [md.Lower(), md.Cleaner("ru"), md.Emphasizer({"мир": "м+ир"})], sentence_splitter="rule")
+    assert [type(module) for module in handler.modules] == [md.Normalizer, md.Emphasizer]
+
+    handler = Handler("ru", [md.Lower()], sentence_splitter="rule")
+    assert [type(module) for module in handler.modules] == [md.Cleaner, md.Lower]
+
+    assert Handler("ru", sentence_splitter="rule").process_text("Привет,\tМИР!", keep_delimiters=False) == "привет,мир!"
+
+
+def batch():
+    modules = [
+        md.BlindReplacer({"ежик": "ёжик", "елкой": "ёлкой"}, name="Yoficator"),
+        md.RuEmphasizer({"под": "п+од", "ёжик": "+ёжик", "грибы": "гриб+ы"})
+    ]
+    handler = Handler("ru", modules, sentence_splitter="rule")
+    texts = ["Ежик нашел грибы под елкой. Ежик рад!", ["Ежик.", "Грибы под елкой"], "Синтез   -  это увлекательно."]
+    texts = texts * 20
+    params = dict(cleaners="light_punctuation_cleaners", user_dict={"рад": "счастлив"})
+
+    def strings(results):
+        return [[str(item) for item in result] if isinstance(result, list) else result for result in results]
+
+    expected = strings([handler.process_text(text, **params) for text in texts])
+    assert strings(handler.process_batch(texts, workers=2, **params)) == expected
+    assert strings(handler.process_batch(texts, workers=3, chunksize=7, **params)) == expected
+    assert strings(handler.process_batch(texts, workers=1, **params)) == expected
+    assert handler.process_batch([], workers=2) == []
+
+    sentences = ["Ежик нашел грибы под елкой.", "Грибы под елкой!", "Ежик рад."] * 5
+    expected = [handler.process(sentence, **params) for sentence in sentences]
+    assert handler.process_sentences(sentences, **params) == expected
+    assert handler.process_text(" ".join(sentences), keep_delimiters=False, **params) == " ".join(expected)
+    assert list(handler.generate_text(" ".join(sentences), keep_delimiters=False, batch_size=4, **params)) == expected
+
+
+def document():
+    modules = [
+        md.BlindReplacer({"ежик": "ёжик", "елкой": "ёлкой"}, name="Yoficator"),
+        md.RuEmphasizer({"под": "п+од", "ёжик": "+ёжик", "грибы": "гриб+ы"})
+    ]
+    handler = Handler("ru", modules, out_max_length=20, sentence_splitter="rule")
+    text = " ".join("Ежик {} нашел грибы под елкой, но не съел их! Синтез   -  это увлекательно.".format(idx)
+                    for idx in range(50))
+    params = dict(cleaners="light_punctuation_cleaners", user_dict={"съел": "скушал"})
+
+    expected = [str(item) for item in handler.generate_text(text, **params)]
+    assert [str(item) for item in handler.generate_text(text, workers=2, batch_size=3, in_flight=2, **params)] == expected
+    assert [str(item) for item in handler.process_text(text, workers=3, **params)] == expected
+    assert handler.process_text(text, workers=2, keep_delimiters=False) == handler.process_text(text, keep_delimiters=False)
+
+    generator = handler.generate_text(text, workers=2, batch_size=1, in_flight=1, **params)
+    assert [str(next(generator)) for _ in range(5)] == expected[:5]
+    generator.close()
+
+
+def asynchronous():
+    modules = [
+        md.BlindReplacer({"ежик": "ёжик", "елкой": "ёлкой"}, name="Yoficator"),
+        md.RuEmphasizer({"под": "п+од", "ёжик": "+ёжик", "грибы": "гриб+ы"})
+    ]
+    handler = Handler("ru", modules, out_max_length=20, sentence_splitter="rule")
+    texts = ["Ежик нашел грибы под елкой. Ежик рад!", ["Ежик.", "Грибы под елкой"], "Синтез   -  это увлекательно."]
+    texts = texts * 10
+    params = dict(cleaners="light_punctuation_cleaners", user_dict={"рад": "счастлив"})
+
+    def strings(results):
+        return [[str(item) for item in result] if isinstance(result, list) else result for result in results]
+
+    expected = strings([handler.process_text(text, **params) for text in texts])
+
+    sentences = ["Ежик рад под елкой.", "Грибы рад!", "Синтез   -  это увлекательно."] * 10
+    expected_sentences = [handler.process_text(sentence, keep_delimiters=False, **params) for sentence in sentences]
+
+    batches = []
+    process_sentences = handler.process_sentences
+
+    def counting(sentences, **kwargs):
+        if any("ошибка" in sentence for sentence in sentences):
+            raise ValueError("ошибка")
+        batches.append(len(sentences))
+        return process_sentences(sentences, **kwargs)
+
+    handler.process_sentences = counting
+
+    async def run():
+        handler.configure_async(latency=0.01, max_batch_size=16, concurrency=8)
+        results = await asyncio.gather(*[handler.aprocess_text(text, **params) for text in texts])
+        assert strings(results) == expected
+        assert max(batches) > 1 and sum(batches) == 50
+
+        items = [str(item) async for item in handler.agenerate_text(texts[0], **params)]
+        assert items == expected[0]
+
+        task = asyncio.ensure_future(handler.aprocess_text(" ".join(texts[2::3]), keep_delimiters=False))
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert task.cancelled()
+
+        result = await handler.aprocess_text(texts[2], keep_delimiters=False)
+        assert result == handler.process_text(texts[2], keep_delimiters=False)
+
+        # single sentences of the concurrent requests with their own user dicts are processed together
+        handler.configure_async(latency=0.2, max_batch_size=64)
+        batches.clear()
+        results = await asyncio.gather(*[
+            handler.aprocess_text(sentence, keep_delimiters=False, **params) for sentence in sentences
+        ])
+        assert results == expected_sentences
+        assert batches == [len(sentences)]
+
+        # at most 2 requests are processed at once, a parked iterator doesn't hold its turn
+        handler.configure_async(latency=0.05, max_batch_size=64, concurrency=2)
+        batches.clear()
+        results = await asyncio.gather(*[
+            handler.aprocess_text(sentence, keep_delimiters=False, **params) for sentence in sentences[:6]
+        ])
+        assert results == expected_sentences[:6]
+        assert max(batches) <= 2 and sum(batches) == 6
+
+        parked = [handler.agenerate_text(texts[0]) for _ in range(2)]
+        for iterator in parked:
+            await iterator.__anext__()
+        result = await asyncio.wait_for(handler.aprocess_text(texts[2], keep_delimiters=False, **params), 2)
+        assert result == expected_sentences[2]
+        for iterator in parked:
+            await iterator.aclose()
+
+        # an error is raised only by the request, which has caused it, even if the batch is shared
+        handler.configure_async(latency=0.05)
+        batches.clear()
+        results = await asyncio.gather(handler.aprocess_text("Это ошибка."), handler.aprocess_text("Ежик рад."),
+                                       return_exceptions=True)
+        assert isinstance(results[0], ValueError) and results[1] == ["+ёжик рад."]
+
+        results = await asyncio.gather(handler.aprocess_text("Это ошибка."),
+                                       handler.aprocess_text("Ежик рад.", mask_stress=True), return_exceptions=True)
+        assert isinstance(results[0], ValueError) and results[1] == ["ёжик рад."]
+
+        # the replaced configurations don't leave their dispatchers running
+        await asyncio.sleep(0)
+        assert len(asyncio.all_tasks()) == 2  # this one and the dispatcher of the current configuration
+
+    asyncio.run(run())
+    del handler.process_sentences
+
+
 def test():
     russian()
     english()
+    snapshot()
+    normalization()
+    batch()
+    document()
+    asynchronous()
 
 
 if __name__ == "__main__":
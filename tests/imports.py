@@ -0,0 +1,20 @@
+import sys
+import subprocess
+
+
+heavy_modules = ["nltk", "numpy", "yaml", "inflect", "tqdm", "urllib.request"]
+
+
+def lazy_imports():
+    code = "import sys, tps; print(' '.join(name for name in {} if name in sys.modules))".format(heavy_modules)
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+
+    assert not loaded, "Importing tps loads {}".format(loaded)
+
+
+def test():
+    lazy_imports()
+
+
+if __name__ == "__main__":
+    test()
@@ -1,6 +1,9 @@
 import os
+import random
 
 from tps import modules as md
+from tps.types import TokenKind, Charset
+from tps.utils import token_spans
 from tps.content import ops
 
 
@@ -28,6 +31,88 @@ def processor():
     assert len(module.split_to_sentences(text, keep_delimiters=True)) == 3
 
 
+def tokens():
+    text = "привет, tts мир"
+    tokens, kinds = md.Processor.tokenize(text)
+
+    assert tokens == ["привет", ",", " ", "tts", " ", "мир"]
+    assert list(kinds) == [
+        TokenKind.word, TokenKind.punctuation, TokenKind.space, TokenKind.word, TokenKind.space, TokenKind.word
+    ]
+
+    chain = [
+        md.Replacer({"TTS": "синтез речи"}),
+        md.Lower(),
+        md.Emphasizer({"привет": "прив+ет", "синтез": "с+интэз", "речи": "р+ечи"})
+    ]
+    target = text.upper()
+    for module in chain:
+        target = module(target)
+
+    tokens, kinds = md.Processor.tokenize(text.upper())
+    for module in chain:
+        module.process_tokens(tokens, kinds)
+
+    assert md.Processor.join_tokens(tokens) == target == "прив+ет, с+интэз р+ечи мир"
+    assert (tokens, kinds) == md.Processor.tokenize(target)
+
+    text = "a⁑b, {под_чёркивание}"
+    tokens = md.Processor.split_to_tokens(text)
+    assert tokens == ["a⁑b", ",", " ", "{под_чёркивание}"]
+    assert [text[start:end] for start, end, _ in token_spans(text)] == tokens
+    assert md.Processor()._calc_weight(text) == 7
+
+    text = "a\\b]c^d"  # the punctuation chars, which are special in the character classes
+    tokens, kinds = md.Processor.tokenize(text)
+    assert tokens == md.Processor.split_to_tokens(text) == ["a", "\\", "b", "]", "c", "^", "d"]
+    assert list(kinds) == [TokenKind.word, TokenKind.punctuation] * 3 + [TokenKind.word]
+    assert md.Processor()._calc_weight("+\\_") == 4
+    assert md.Replacer({"b": "в"})(text) == "a\\в]c^d"
+
+
+def phrases():
+    module = md.Replacer({
+        "compact": "c+ompact",
+        "a compact": "a c+ompact",
+        "a compact bag": "a c+ompact bag",
+        "to compact something": "to comp+act something"
+    }, phrases=True)
+
+    text = "to compact something in a compact bag, a compact, compact bag"
+    target = "to comp+act something in a c+ompact bag, a c+ompact, c+ompact bag"
+    assert module(text) == target
+    assert module(text, mask=True) == text
+
+    tokens, kinds = module.tokenize(text)
+    module.process_tokens(tokens, kinds)
+    assert (tokens, kinds) == module.tokenize(target)
+
+    assert md.Replacer(module.entries)(text) == text.replace("compact", "c+ompact")
+
+
+def splitter():
+    text = "Поэт А. С. Пушкин жил на ул. Мойки в 1836 г. Его дом сохранился! «Кто там?» — спросил он."
+    target = [
+        "Поэт А. С. Пушкин жил на ул. Мойки в 1836 г.",
+        "Его дом сохранился!",
+        "«Кто там?» — спросил он."
+    ]
+
+    module = md.RuleSplitter("russian")
+    assert module.split(text) == target
+    assert module.split("  без знаков препинания ") == ["без знаков препинания"]
+    assert module.split(" ") == []
+
+    sentences = md.Processor.split_to_sentences(text, keep_delimiters=True, splitter="rule")
+    assert sentences[::2] == target and len(sentences) == 5
+
+    module = md.RuleSplitter("english")
+    assert module.split("Mr. Smith met Dr. Brown at 5 p.m. They talked, e.g. about J. R. R. Tolkien.") == [
+        "Mr. Smith met Dr. Brown at 5 p.m.",
+        "They talked, e.g. about J. R. R. Tolkien."
+    ]
+
+
 def check_replacer_module(module_obj, module_dict, text, target):
     try:
         module_dict = ops.find(module_dict, data_dir=data_dir, raise_exception=True)
@@ -65,8 +150,51 @@ def russian():
         check_replacer_module(module_obj, module_dict, text, target)
 
 
+def normalizer():
+    random.seed(0)
+    alphabet = "AbZаЯЁё \t\n\r-—,.!?;:()+_{}~<>@İΣß0" + "".join(chr(code) for code in range(0, 0x500, 7))
+
+    for charset in Charset:
+        lower, cleaner, module = md.Lower(), md.Cleaner(charset), md.Normalizer(charset)
+        for _ in range(5000):
+            text = "".join(random.choice(alphabet) for _ in range(random.randint(0, 20)))
+            assert module(text) == cleaner(lower(text)), (charset, text)
+
+    assert md.Normalizer(Charset.ru)("Съешь,\tещё  этих «мягких» булок!\n") == "съешь,ещё этих мягких булок!"
+
+
+def batch():
+    sentences = [
+        "to compact something in a compact bag.",
+        "ёжик, ежик и елка под елкой; a compact",
+        "прив+ет, ежик! прив+ет"
+    ] * 3
+    chain = [
+        md.Replacer({"a compact bag": "a c+ompact bag", "ежик": "ёжик", "елка": "ёлка, ель"}, phrases=True),
+        md.BlindReplacer({"под": "п+од", "елкой": "ёлкой"}),
+        md.Emphasizer({"ёжик": "+ёжик", "привет": "прив+ет", "ёлкой": "ёлк+ой", "ель": "+ель"})
+    ]
+
+    for kwargs in [{}, {"mask_stress": True}, {"mask": True}]:
+        expected = [md.Processor.tokenize(sentence) for sentence in sentences]
+        for module in chain:
+            for tokens, kinds in expected:
+                module.process_tokens(tokens, kinds, **kwargs)
+
+        batch = [md.Processor.tokenize(sentence) for sentence in sentences]
+        for module in chain:
+            module.process_tokens_batch(batch, **kwargs)
+
+        assert batch == expected
+
+
 def test():
     processor()
+    tokens()
+    phrases()
+    splitter()
+    normalizer()
+    batch()
     russian()
 
 
@@ -1,9 +1,3 @@
-import nltk
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
-
 from tps.handler import Handler, get_symbols_length
 from tps.utils import cleaners, load_dict, save_dict, prob2bool, split_to_tokens
 from tps.content.ops import download, find, get_checksum, calc_checksum
@@ -0,0 +1,270 @@
+import asyncio
+import weakref
+from typing import AsyncIterator, Union
+
+from tps.modules.ssml.elements import Pause
+
+
+"""
+asyncio interface of the Handler (see Handler.aprocess_text and Handler.agenerate_text).
+
+The cleaners and the user dictionary of each request are applied to its sentences in the executor, then the sentences
+of all the concurrent requests are put into one queue. The dispatcher waits for the latency window after the first
+queued sentence, takes up to max_batch_size sentences and processes the ones with the same masks by one
+Handler.process_sentences call in the executor, so the event loop is never blocked, and the replacers look up
+the words repeated across the requests once. The next batch is collected while the current one is processed.
+"""
+
+_handlers = weakref.WeakKeyDictionary()  # default AsyncHandler of each Handler
+
+
+class AsyncHandler:
+    def __init__(self, handler, executor=None, latency: float=0.002, max_batch_size: int=64, concurrency: int=None):
+        """
+        Processes the texts of concurrent asyncio requests with the micro-batches of their sentences.
+
+        :param handler: tps.Handler
+            Its state (see save_state) is not collected.
+        :param executor: Optional[concurrent.futures.Executor]
+            Executor of the processing, the default executor of the event loop if None.
+            The batches are processed one by one, so a single thread is enough.
+        :param latency: float
+            Time in seconds to wait for the sentences of other requests after the first one is queued.
+        :param max_batch_size: int
+            Maximum number of the sentences processed together.
+        :param concurrency: Optional[int]
+            Maximum number of the requests processed at once, the others wait for their turn. Not limited if None.
+            A request takes its turn until all its sentences are processed, even if they are not consumed yet.
+        """
+        if handler.save_state:
+            raise ValueError("The state of the Handler can't be saved in asynchronous processing")
+
+        self.handler = handler
+        self.executor = executor
+        self.latency = latency
+        self.max_batch_size = max(1, max_batch_size)
+        self.concurrency = concurrency
+
+        self._loop = None
+        self._queue = None
+        self._semaphore = None
+        self._dispatcher = None
+
+
+    async def process_text(self, text: Union[str, list], cleaners=None, user_dict=None, keep_delimiters: bool=True,
+                           **kwargs) -> Union[str, list]:
+        """
+        Does the same as Handler.process_text without blocking the event loop.
+
+        :param text, cleaners, user_dict, keep_delimiters, kwargs:
+            See Handler.generate_text
+
+        :return: Union[str, list]
+            See Handler.process_text
+        """
+        return_string = isinstance(text, str) and not keep_delimiters
+        processed = [item async for item in self.generate_text(text, cleaners, user_dict, keep_delimiters, **kwargs)]
+
+        return " ".join(processed) if return_string else processed
+
+
+    async def generate_text(self, text: Union[str, list], cleaners=None, user_dict=None, keep_delimiters: bool=True,
+                            **kwargs) -> AsyncIterator[Union[str, Pause]]:
+        """
+        Does the same as Handler.generate_text without blocking the event loop: the sentences are yielded
+        as soon as their batches are processed. If the iteration is cancelled or stopped, the sentences, which are
+        not processed yet, are dropped from the queue.
+
+        :param text, cleaners, user_dict, keep_delimiters, kwargs:
+            See Handler.generate_text
+
+        :return: AsyncIterator[Union[str, tps.modules.ssml.Pause]]
+        """
+        loop = self._start()
+        semaphore = self._semaphore
+
+        if semaphore is not None:
+            await semaphore.acquire()
+
+        futures = []
+        try:
+            sentences, strings, params = await loop.run_in_executor(
+                self.executor, lambda: self._prepare_text(text, cleaners, user_dict, keep_delimiters, **kwargs)
+            )
+            key = _params_key(params)
+            request = object()
+
+            for string in strings:
+                future = loop.create_future()
+                self._queue.put_nowait((key, params, request, string, future))
+                futures.append(future)
+        finally:
+            if semaphore is not None:  # the request is counted until its sentences are processed, not consumed
+                asyncio.gather(*futures, return_exceptions=True).add_done_callback(lambda _: semaphore.release())
+
+        try:
+            futures_iter = iter(futures)
+            for sentence in sentences:
+                if not isinstance(sentence, Pause):
+                    for unit in self.handler._split_output(await next(futures_iter), keep_delimiters):
+                        yield unit
+                elif keep_delimiters:
+                    yield sentence
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+    def close(self):
+        """
+        Stops the dispatcher without waiting for it, the queued sentences are cancelled.
+        """
+        dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None and not dispatcher.done() and not dispatcher.get_loop().is_closed():
+            dispatcher.cancel()
+        return dispatcher
+
+
+    async def aclose(self):
+        """
+        Stops the dispatcher and waits for it, the queued sentences are cancelled.
+        """
+        dispatcher = self.close()
+        if dispatcher is not None and dispatcher.get_loop() is asyncio.get_running_loop():
+            try:
+                await dispatcher
+            except asyncio.CancelledError:
+                pass
+
+
+    def _prepare_text(self, text, cleaners, user_dict, keep_delimiters, **kwargs):
+        """
+        Splits the text into sentences and applies the cleaners and the user dictionary to them, so the sentences
+        of the requests with different ones can be processed together.
+
+        :return: Tuple[list, List[str], dict]
+            Sentences with Pause tokens, prepared sentences and keyword arguments of Handler.process_sentences.
+        """
+        handler = self.handler
+        sentences, params = handler._prepare_text(text, cleaners, user_dict, keep_delimiters, **kwargs)
+        cleaners, user_dict = params.pop("cleaners"), params.pop("user_dict")
+
+        strings = [sentence for sentence in sentences if not isinstance(sentence, Pause)]
+        if cleaners is not None:
+            strings = [cleaners(string) for string in strings]
+        if user_dict is not None:
+            strings = [handler.dict_check(string, user_dict) for string in strings]
+
+        return sentences, strings, params
+
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+
+        if loop is not self._loop or self._dispatcher is None or self._dispatcher.done():
+            # the queue and the semaphore are bound to the loop, so they are created again for each new one
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.concurrency) if self.concurrency else None
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        return loop
+
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+
+        items = []
+        try:
+            while True:
+                items = [await queue.get()]
+                if queue.qsize() < self.max_batch_size - 1:
+                    await asyncio.sleep(self.latency)
+
+                while len(items) < self.max_batch_size and not queue.empty():
+                    items.append(queue.get_nowait())
+
+                groups = {}
+                for key, params, request, sentence, future in items:
+                    if not future.done():  # the request may be cancelled while waiting
+                        groups.setdefault(key, (params, []))[1].append((request, sentence, future))
+
+                for params, group in groups.values():
+                    try:
+                        await self._process(loop, params, group)
+                    except Exception:
+                        # the sentences are processed again request by request, so only the request,
+                        # which has caused the error, gets it
+                        requests = {}
+                        for item in group:
+                            requests.setdefault(item[0], []).append(item)
+
+                        for request in requests.values():
+                            try:
+                                await self._process(loop, params, request)
+                            except Exception as e:
+                                for _, _, future in request:
+                                    if not future.done():
+                                        future.set_exception(e)
+        finally:
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            for item in items:
+                item[-1].cancel()
+
+
+    async def _process(self, loop, params, group):
+        sentences = [sentence for _, sentence, _ in group]
+        processed = await loop.run_in_executor(
+            self.executor, lambda: self.handler.process_sentences(sentences, **params)
+        )
+
+        for (_, _, future), sentence in zip(group, processed):
+            if not future.done():
+                future.set_result(sentence)
+
+
+def _params_key(params):
+    return tuple((name, value if _hashable(value) else id(value)) for name, value in sorted(params.items()))
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def get_async_handler(handler) -> AsyncHandler:
+    """
+    :param handler: tps.Handler
+
+    :return: AsyncHandler
+        The AsyncHandler of the Handler, it's created with the default parameters on the first call
+        (see Handler.configure_async).
+    """
+    async_handler = _handlers.get(handler)
+    if async_handler is None:
+        async_handler = _handlers[handler] = AsyncHandler(handler)
+    return async_handler
+
+
+def configure(handler, **params) -> AsyncHandler:
+    """
+    Replaces the AsyncHandler of the Handler. The previous one is stopped, the sentences of its queue are cancelled
+    (see AsyncHandler.close).
+
+    :param handler: tps.Handler
+    :param params:
+        See AsyncHandler
+
+    :return: AsyncHandler
+    """
+    previous = _handlers.get(handler)
+    if previous is not None:
+        previous.close()
+
+    _handlers[handler] = AsyncHandler(handler, **params)
+    return _handlers[handler]
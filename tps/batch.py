@@ -0,0 +1,180 @@
+import os
+import pickle
+import tempfile
+import itertools
+import multiprocessing
+from typing import Iterator
+from collections import deque
+from contextlib import contextmanager
+
+from tps.utils.cleaners import compile_cleaners
+from tps.dicts import CompiledUserDict
+
+
+"""
+Process pools of Handler workers (see Handler.process_batch and the workers parameter of Handler.generate_text).
+
+The workers are started by the default start method of multiprocessing. If it's fork (Linux before Python 3.14),
+the workers inherit the Handler with all its dictionaries from the parent process, so nothing is pickled except
+the texts and the results; the memory pages of the dictionaries are shared until they are written. Otherwise
+the Handler is saved as a snapshot (see tps.snapshot), which each worker maps into memory, so the dictionaries are
+not copied either, and the parameters of the processing are pickled.
+"""
+
+_states = {}  # Handler and parameters of each pool in the parent process, inherited by the forked workers
+_state = None  # Handler and parameters of the current worker process
+_tokens = itertools.count()
+
+
+def _init_worker(token, snapshot_path, params):
+    global _state
+
+    if snapshot_path is None:
+        _state = _states[token]
+    else:
+        from tps.snapshot import load_snapshot
+        _state = (load_snapshot(snapshot_path), params)
+
+
+def _process_text(text):
+    handler, params = _state
+    return handler.process_text(text, **params)
+
+
+def _process_sentences(sentences):
+    handler, params = _state
+    return handler.process_sentences(sentences, **params)
+
+
+def prepare_params(cleaners=None, user_dict=None, keep_delimiters=True, **kwargs) -> dict:
+    """
+    Compiles the cleaners and the user dictionary once for all the texts of a batch.
+
+    :param cleaners, user_dict, keep_delimiters, kwargs:
+        See tps.Handler.generate_text
+
+    :return: dict
+        Keyword arguments of tps.Handler.process_text.
+    """
+    if cleaners is not None:
+        cleaners = compile_cleaners(cleaners)
+    if user_dict is not None and not isinstance(user_dict, CompiledUserDict):
+        user_dict = CompiledUserDict(user_dict)
+
+    return dict(cleaners=cleaners, user_dict=user_dict, keep_delimiters=keep_delimiters, **kwargs)
+
+
+@contextmanager
+def worker_pool(handler, workers: int, params: dict):
+    """
+    :param handler: tps.Handler
+    :param workers: int
+        Number of the worker processes.
+    :param params: dict
+        Keyword arguments of tps.Handler.process_text or tps.Handler.process_sentences for all the tasks.
+
+    :return: ContextManager[multiprocessing.pool.Pool]
+        Pool, which processes the texts by the _process_text function or the sentences by _process_sentences.
+    """
+    token = next(_tokens)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        context = multiprocessing.get_context()  # the default one of the platform or the one set by the user
+        if context.get_start_method() == "fork":
+            _states[token] = (handler, params)
+            initargs = (token, None, None)
+        else:
+            _check_picklable(params)
+            initargs = (token, handler.save_snapshot(os.path.join(tmp_dir, "handler.snapshot")), params)
+
+        try:
+            with context.Pool(workers, _init_worker, initargs) as pool:
+                yield pool
+        finally:
+            _states.pop(token, None)
+
+
+def _check_picklable(params):
+    try:
+        pickle.dumps(params)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError("The parameters are sent to the worker processes, so they must be picklable, "
+                         "e.g. the cleaners must be module-level functions, not lambdas: {}".format(e)) from e
+
+
+def process_batch(handler, texts: list, workers: int=None, chunksize: int=None, **params) -> list:
+    """
+    Processes the texts in the pool of worker processes.
+
+    :param handler: tps.Handler
+    :param texts: List[Union[str, list]]
+    :param workers: Optional[int]
+        Number of the worker processes, the number of CPUs by default.
+        If it's 1, the texts are processed in the current process.
+    :param chunksize: Optional[int]
+        Number of the texts sent to a worker at once. By default the texts are split into about
+        4 chunks per worker, as in multiprocessing.Pool.map.
+    :param params:
+        See tps.Handler.generate_text
+
+    :return: list
+        Results of tps.Handler.process_text in the order of the texts.
+    """
+    texts = list(texts)
+    params = prepare_params(**params)
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = max(1, min(workers, len(texts)))
+    if workers == 1:
+        return [handler.process_text(text, **params) for text in texts]
+
+    if chunksize is None:
+        chunksize = max(1, -(-len(texts) // (workers * 4)))
+
+    with worker_pool(handler, workers, params) as pool:
+        return list(pool.imap(_process_text, texts, chunksize))
+
+
+def generate_sentences(handler, sentences: list, workers: int=None, batch_size: int=None, in_flight: int=None,
+                       **params) -> Iterator[str]:
+    """
+    Processes the blocks of sentences of one text in the pool of worker processes and yields the processed
+    sentences in the original order as soon as all the blocks before them are done.
+
+    :param handler: tps.Handler
+    :param sentences: List[str]
+    :param workers: Optional[int]
+        Number of the worker processes, the number of CPUs by default.
+    :param batch_size: Optional[int]
+        Number of the sentences in a block (see tps.Handler.process_sentences).
+        By default the sentences are split into about 4 blocks per worker.
+    :param in_flight: Optional[int]
+        Maximum number of the blocks sent to the workers and not yielded yet, twice the number of workers by default.
+        It bounds the memory, which is taken by the results, if they are consumed slower than produced.
+    :param params:
+        Keyword arguments of tps.Handler.process_sentences, the cleaners and the user dictionary should be compiled.
+
+    :return: Iterator[str]
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = max(1, min(workers, len(sentences)))
+
+    if batch_size is None:
+        batch_size = max(1, -(-len(sentences) // (workers * 4)))
+    blocks = (sentences[start:start + batch_size] for start in range(0, len(sentences), batch_size))
+
+    if workers == 1:
+        for block in blocks:
+            yield from handler.process_sentences(block, **params)
+        return
+
+    in_flight = max(1, workers * 2 if in_flight is None else in_flight)
+    with worker_pool(handler, workers, params) as pool:
+        pending = deque()
+        for block in blocks:
+            if len(pending) == in_flight:
+                yield from pending.popleft().get()
+            pending.append(pool.apply_async(_process_sentences, (block,)))
+
+        while pending:
+            yield from pending.popleft().get()
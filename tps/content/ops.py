@@ -1,12 +1,11 @@
 import os
 import sys
+import json
 import hashlib
-from urllib.request import urlopen
+import threading
 from math import ceil
 
 from loguru import logger
-from tqdm import tqdm
-from nltk.internals import is_writable
 
 
 path_list = []
@@ -35,14 +34,59 @@ _content_info = {
 }
 
 
-def calc_checksum(file):
+checksum_suffix = ".checksum"
+
+
+def calc_checksum(file, chunksize=2 ** 20):
+    """
+    Calculates md5 checksum of the file.
+
+    :param file: str
+    :param chunksize: int
+        Size of the read chunks in bytes.
+
+    :return: str
+    """
     hash_md5 = hashlib.md5()
-    with open(file, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+    with open(file, "rb", buffering=0) as f:
+        for chunk in iter(lambda: f.read(chunksize), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
 
 
+def _cached_checksum(filepath):
+    """
+    Returns the checksum of the file, which is cached in the sidecar file next to it by the file size,
+    modification time and inode, so unchanged files are not read again. If the sidecar file can't be written,
+    the checksum is just not cached.
+    """
+    stat = os.stat(filepath)
+    signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    cache_path = filepath + checksum_suffix
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as stream:
+            cached = json.load(stream)
+        if cached["signature"] == signature:
+            return cached["checksum"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    checksum = calc_checksum(filepath)
+
+    tmp_path = "{}.{}.{}.tmp".format(cache_path, os.getpid(), threading.get_ident())
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as stream:
+            json.dump({"signature": signature, "checksum": checksum}, stream)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        logger.debug("Can not save the checksum of {} to {}".format(filepath, cache_path))
+
+    return checksum
+
+
 def get_checksum(name):
     try:
         _, checksum = _content_info[name]
@@ -53,7 +97,7 @@ def get_checksum(name):
         return
 
 
-def find(name, data_dir=None, raise_exception=False, checksum=None):
+def find(name, data_dir=None, raise_exception=False, checksum=None, use_cache=True):
     """
     Performs searching for a 'name' file.
 
@@ -63,6 +107,11 @@ def find(name, data_dir=None, raise_exception=False, checksum=None):
         If provided, it's appended to a list of paths to be searched.
     :param raise_exception: bool
         If True and no file is found a FileNotFoundError exception will be raised.
+    :param checksum: Optional[str]
+        If provided, the file is returned only if its md5 checksum is equal to this one.
+    :param use_cache: bool
+        Whether to take the checksum from the sidecar file next to the file (see checksum_suffix),
+        which is updated when the file is read.
 
     :return: Optional[str]
         Returns path to the file, if file was found. Returns None, if no file was found
@@ -76,7 +125,7 @@ def find(name, data_dir=None, raise_exception=False, checksum=None):
         if os.path.exists(filepath):
             if checksum is None:
                 return filepath
-            elif calc_checksum(filepath) == checksum:
+            elif (_cached_checksum(filepath) if use_cache else calc_checksum(filepath)) == checksum:
                 return filepath
             else:
                 logger.warning("File named {} exists, but its checksum is not correct. Try ro redownload it.".
@@ -120,7 +169,7 @@ def download(name, destination=None, chunksize=4096, force=False):
         return
 
     if not force:
-        filepath = find(name, destination, False, checksum)
+        filepath = find(name, destination, False, checksum, use_cache=False)
         if filepath is not None:
             return filepath
 
@@ -135,6 +184,9 @@ def download(name, destination=None, chunksize=4096, force=False):
               .format(filepath))
         return filepath
 
+    from urllib.request import urlopen
+    from tqdm import tqdm
+
     try:
         infile = urlopen(url)
         length = infile.length
@@ -155,6 +207,11 @@ def download(name, destination=None, chunksize=4096, force=False):
     return filepath
 
 
+def _is_writable(path):
+    from nltk.internals import is_writable
+    return is_writable(path)
+
+
 def get_download_dir(data_dir=None):
     """
     Checks which directory is writeable and returns path to it.
@@ -172,7 +229,7 @@ def get_download_dir(data_dir=None):
         except OSError:
             pass
 
-        if not is_writable(data_dir):
+        if not _is_writable(data_dir):
             logger.warning("Permission denied: it's not possible to write in {} folder. Checking other defaults...".
                            format(data_dir))
     else:
@@ -182,12 +239,12 @@ def get_download_dir(data_dir=None):
         except OSError:
             pass
 
-        if not is_writable(data_dir):
+        if not _is_writable(data_dir):
             logger.warning("Permission denied: it's not possible to write in {} folder. Checking other defaults...".
                            format(data_dir))
 
             for _data_dir in path_list:
-                if os.path.exists(_data_dir) and is_writable(_data_dir):
+                if os.path.exists(_data_dir) and _is_writable(_data_dir):
                     return _data_dir
 
             logger.warning("Can not get access to any data directory. Try to check permissions.")
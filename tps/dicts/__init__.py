@@ -0,0 +1,9 @@
+from tps.dicts.compiled import CompiledDict, compile_dict, ensure_compiled
+from tps.dicts.shared import SharedDict
+from tps.dicts.sharded import ShardedDict
+from tps.dicts.composite import compose_dicts, build_composite, ensure_composite
+from tps.dicts.dawg import DAWG, ensure_dawg
+from tps.dicts.stress import StressDict
+from tps.dicts.disk import DiskDict, BloomFilter, build_disk_dict, ensure_disk_dict
+from tps.dicts.paradigm import ParadigmDict, ensure_paradigm
+from tps.dicts.user import CompiledUserDict, AhoCorasick
@@ -0,0 +1,307 @@
+import os
+import sys
+import mmap
+import struct
+import zlib
+from array import array
+from collections.abc import Mapping
+from typing import Union
+
+from tps.utils import load_dict
+from tps.content import ops
+
+
+"""
+Binary layout of a compiled dictionary (all numbers are little-endian):
+
+    header            magic (4s), version (H), reserved (H), number of entries (I), hash table size (I)
+    hash table        table_size * uint32, open addressing table of (entry index + 1), 0 marks an empty slot
+    key offsets       (count + 1) * uint32, offsets of the keys inside the key blob
+    value offsets     (count + 1) * uint32, offsets of the values inside the value blob
+    key blob          utf-8 encoded keys sorted in byte order
+    value blob        utf-8 encoded values in the same order
+
+The table is addressed by crc32 of the utf-8 encoded key with linear probing, so a lookup
+costs a single hash computation and usually one key comparison right over the mapped buffer.
+"""
+
+MAGIC = b"TPSD"
+VERSION = 1
+
+_header = struct.Struct("<4sHHII")
+
+
+class CompiledDict(Mapping):
+    def __init__(self, buffer):
+        """
+        Read-only dictionary over the buffer that contains a compiled dictionary (see tps.dicts.compile_dict).
+        Nothing is materialised: lookups go right over the buffer, so the memory pages
+        of the mapped file are shared by all the processes that use the same dictionary.
+
+        :param buffer: bytes-like object
+            For example mmap.mmap, multiprocessing.shared_memory.SharedMemory.buf or bytes.
+        """
+        self._buffer = buffer
+        view = memoryview(buffer)
+
+        magic, version, _, count, table_size = _header.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not contain a compiled dictionary")
+        if version != VERSION:
+            raise ValueError("Unsupported compiled dictionary version {}, expected {}".format(version, VERSION))
+
+        self._count = count
+        self._mask = table_size - 1
+
+        offset = _header.size
+        self._table = _cast_offsets(view[offset:offset + 4 * table_size])
+        offset += 4 * table_size
+        self._key_offsets = _cast_offsets(view[offset:offset + 4 * (count + 1)])
+        offset += 4 * (count + 1)
+        self._value_offsets = _cast_offsets(view[offset:offset + 4 * (count + 1)])
+        offset += 4 * (count + 1)
+
+        keys_size = self._key_offsets[count]
+        self._keys = view[offset:offset + keys_size]
+        offset += keys_size
+        self._values = view[offset:offset + self._value_offsets[count]]
+
+
+    @classmethod
+    def open(cls, filepath: str):
+        """
+        Maps the compiled dictionary file into memory.
+
+        :param filepath: str
+
+        :return: CompiledDict
+        """
+        with open(filepath, "rb") as stream:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(buffer)
+
+
+    def close(self):
+        self._table = self._key_offsets = self._value_offsets = self._keys = self._values = None
+        self._count = 0
+
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+
+
+    @property
+    def nbytes(self):
+        return memoryview(self._buffer).nbytes if self._buffer is not None else 0
+
+
+    def warmup(self):
+        """
+        Loads the memory pages of the dictionary, so that the first lookups do not wait for the disk.
+        """
+        if self._buffer is not None:
+            touch_pages(self._buffer)
+
+
+    def _find(self, key: str) -> int:
+        try:
+            key = key.encode("utf-8")
+        except (AttributeError, UnicodeEncodeError):
+            return -1
+
+        table, offsets, keys, mask = self._table, self._key_offsets, self._keys, self._mask
+
+        slot = zlib.crc32(key) & mask
+        while True:
+            idx = table[slot] - 1
+            if idx == -1:
+                return -1
+            if keys[offsets[idx]:offsets[idx + 1]] == key:
+                return idx
+            slot = (slot + 1) & mask
+
+
+    def _key(self, idx):
+        return str(self._keys[self._key_offsets[idx]:self._key_offsets[idx + 1]], "utf-8")
+
+
+    def _value(self, idx):
+        return str(self._values[self._value_offsets[idx]:self._value_offsets[idx + 1]], "utf-8")
+
+
+    def __getitem__(self, key):
+        idx = self._find(key)
+        if idx == -1:
+            raise KeyError(key)
+
+        return self._value(idx)
+
+
+    def get(self, key, default=None):
+        idx = self._find(key)
+        return default if idx == -1 else self._value(idx)
+
+
+    def __contains__(self, key):
+        return self._find(key) != -1
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __iter__(self):
+        for idx in range(self._count):
+            yield self._key(idx)
+
+
+    def items(self):
+        for idx in range(self._count):
+            yield self._key(idx), self._value(idx)
+
+
+def touch_pages(buffer):
+    """
+    Reads one byte of each memory page of the buffer, so that the pages of a mapped file are loaded into memory.
+
+    :param buffer: bytes-like object
+    """
+    if isinstance(buffer, mmap.mmap) and hasattr(mmap, "MADV_WILLNEED"):
+        buffer.madvise(mmap.MADV_WILLNEED)
+
+    view = memoryview(buffer).cast("B")
+    return sum(view[::mmap.PAGESIZE])
+
+
+def _cast_offsets(view):
+    if sys.byteorder == "little":
+        return view.cast("I")
+
+    offsets = array("I", view)
+    offsets.byteswap()
+    return offsets
+
+
+def pack_dict(entries: Mapping) -> list:
+    """
+    Serializes the passed mapping into the compiled dictionary format.
+
+    :param entries: Mapping
+
+    :return: list
+        List of bytes-like chunks, which concatenation is the compiled dictionary.
+    """
+    pairs = sorted((key.encode("utf-8"), value.encode("utf-8")) for key, value in entries.items())
+
+    table_size = 1
+    while table_size < 2 * len(pairs):
+        table_size <<= 1
+    mask = table_size - 1
+
+    table = array("I", bytes(4 * table_size))
+    key_offsets = array("I", [0])
+    value_offsets = array("I", [0])
+    for idx, (key, value) in enumerate(pairs):
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+
+        slot = zlib.crc32(key) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = idx + 1
+
+    if sys.byteorder != "little":
+        table.byteswap()
+        key_offsets.byteswap()
+        value_offsets.byteswap()
+
+    return [
+        _header.pack(MAGIC, VERSION, 0, len(pairs), table_size),
+        table.tobytes(),
+        key_offsets.tobytes(),
+        value_offsets.tobytes(),
+        b"".join(key for key, _ in pairs),
+        b"".join(value for _, value in pairs)
+    ]
+
+
+def compile_dict(dict_source: Union[str, tuple, list, dict], filepath: str, fmt: str=None) -> str:
+    """
+    Converts the dictionary into the sorted read-only binary file, that can be opened by CompiledDict.
+
+    :param dict_source: Union[str, tuple, list, dict]
+        Any source supported by tps.utils.load_dict (tuple and list mean (path, format)).
+    :param filepath: str
+        Where to save the compiled dictionary.
+    :param fmt: Optional[str]
+        Format of the dict_source file (see tps.utils.load_dict).
+
+    :return: str
+        Path to the compiled dictionary.
+    """
+    if isinstance(dict_source, (tuple, list)):
+        dict_source, fmt = dict_source
+
+    entries = load_dict(dict_source, fmt)
+
+    tmp_path = "{}.{}.tmp".format(filepath, os.getpid())
+    with open(tmp_path, "wb") as stream:
+        for chunk in pack_dict(entries):
+            stream.write(chunk)
+    os.replace(tmp_path, filepath)
+
+    return filepath
+
+
+def ensure_compiled(filepath: str, fmt: str="plane", destination: str=None) -> str:
+    """
+    Returns the path to the compiled version of the dictionary file, compiling it if there is no such one
+    or if the source file is newer.
+
+    :param filepath: str
+        Path to the source dictionary.
+    :param fmt: str
+        Format of the source dictionary (see tps.utils.load_dict).
+    :param destination: Optional[str]
+        Folder for the compiled file. The folder of the source file is used by default,
+        if it's not writable - see tps.content.ops.get_download_dir.
+
+    :return: str
+    """
+    name, _ = os.path.splitext(os.path.basename(filepath))
+    destination = get_destination(filepath) if destination is None else destination
+    compiled_path = os.path.join(destination, name + ".cdict")
+
+    if is_outdated(compiled_path, filepath):
+        compile_dict(filepath, compiled_path, fmt)
+
+    return compiled_path
+
+
+def get_destination(filepath: str) -> str:
+    """
+    Returns the folder for the artifacts built from the passed file: the folder of the file itself,
+    if it's writable, see tps.content.ops.get_download_dir otherwise.
+
+    :param filepath: str
+
+    :return: str
+    """
+    destination = os.path.dirname(os.path.abspath(filepath))
+    return destination if os.access(destination, os.W_OK) else ops.get_download_dir()
+
+
+def is_outdated(filepath: str, *sources: str) -> bool:
+    """
+    Checks whether the artifact needs to be (re)built: it doesn't exist or some of its sources is newer.
+
+    :param filepath: str
+        Path to the artifact.
+    :param sources: str
+        Paths to the files the artifact is built from.
+
+    :return: bool
+    """
+    return not os.path.exists(filepath) or \
+           os.path.getmtime(filepath) < max(os.path.getmtime(source) for source in sources)
@@ -0,0 +1,110 @@
+import os
+import argparse
+from typing import Union
+
+from tps import modules as md
+from tps.symbols import accent
+from tps.utils import _punct_re
+from tps.dicts.compiled import compile_dict, get_destination, is_outdated
+
+
+def compose_dicts(e_source: Union[str, tuple, list, dict], yo_source: Union[str, tuple, list, dict],
+                  stress_source: Union[str, tuple, list, dict], prefer_user: bool=True) -> dict:
+    """
+    Precomputes the result of the Eficator -> Yoficator -> RuEmphasizer chain (see Handler.from_charset)
+    for every word of the passed dictionaries. The result is the dictionary for tps.modules.RuCompositeEmphasizer.
+
+    Words, which are found by the blind replacers, are stored as 'final<sep>masked', where masked is the
+    result of the chain with masked stress (empty if it's just the final form without accents).
+    Words, which the chain does not change in a way other than the default ё stress, are not stored at all.
+    If a replacement of the blind replacers consists of several tokens, the chain processes them separately,
+    so such words are passed through the modules as strings. If prefer_user is False, the stressed keys of
+    the stress dictionary are stored as well, since the chain looks up the words stressed by user as they are.
+
+    :param e_source, yo_source, stress_source: Union[str, tuple, list, dict]
+        Sources of the dictionaries (see tps.modules.Replacer).
+    :param prefer_user: bool
+        See tps.modules.RuEmphasizer
+
+    :return: dict
+    """
+    eficator = md.BlindReplacer(e_source, name="Eficator")
+    yoficator = md.BlindReplacer(yo_source, name="Yoficator")
+    emphasizer = md.RuEmphasizer(stress_source, prefer_user)
+    separator = md.RuCompositeEmphasizer.separator
+
+    words = set(eficator.entries)
+    words.update(yoficator.entries)
+    words.update(emphasizer.entries)
+
+    composite = {}
+    for word in words:
+        if accent in word:  # such keys are never found by the blind replacers
+            if not prefer_user and word in emphasizer.entries:
+                composite[word] = emphasizer._process_token(word, False)
+            continue
+
+        token = eficator._process_token(word, False)
+        token = yoficator._process_token(token, False) if _punct_re.search(token) is None else yoficator(token)
+
+        if _punct_re.search(token) is None:
+            final, masked = emphasizer._process_token(token, False), emphasizer._process_token(token, True)
+        else:
+            final, masked = emphasizer(token), emphasizer(token, mask_stress=True)
+
+        if word in eficator.entries or word in yoficator.entries:
+            composite[word] = final + separator + ("" if masked == final.replace(accent, "") else masked)
+        elif final != emphasizer._stress_yo(word):
+            composite[word] = final
+
+    return composite
+
+
+def build_composite(e_source: Union[str, tuple, list, dict], yo_source: Union[str, tuple, list, dict],
+                    stress_source: Union[str, tuple, list, dict], filepath: str, prefer_user: bool=True) -> str:
+    """
+    Builds the composite dictionary (see compose_dicts) and saves it in the compiled format.
+
+    :param e_source, yo_source, stress_source, prefer_user:
+        See compose_dicts
+    :param filepath: str
+        Where to save the composite dictionary.
+
+    :return: str
+        Path to the composite dictionary.
+    """
+    return compile_dict(compose_dicts(e_source, yo_source, stress_source, prefer_user), filepath)
+
+
+def ensure_composite(e_dict: str, yo_dict: str, stress_dict: str, destination: str=None) -> str:
+    """
+    Returns the path to the composite dictionary built from the plane dictionaries,
+    building it if there is no such one or if some of the sources is newer.
+
+    :param e_dict, yo_dict, stress_dict: str
+        Paths to the plane dictionaries.
+    :param destination: Optional[str]
+        Folder for the composite dictionary. See tps.dicts.compiled.get_destination for the stress dictionary
+        by default.
+
+    :return: str
+    """
+    destination = get_destination(stress_dict) if destination is None else destination
+    filepath = os.path.join(destination, "ru_composite.cdict")
+
+    sources = [e_dict, yo_dict, stress_dict]
+    if is_outdated(filepath, *sources):
+        build_composite(*[[source, "plane"] for source in sources], filepath)
+
+    return filepath
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Builds the composite dictionary for RuCompositeEmphasizer.")
+    parser.add_argument("e_dict", help="path to the plane e.dict")
+    parser.add_argument("yo_dict", help="path to the plane yo.dict")
+    parser.add_argument("stress_dict", help="path to the plane stress.dict")
+    parser.add_argument("output", help="path to the composite dictionary")
+    args = parser.parse_args()
+
+    build_composite(*[[source, "plane"] for source in [args.e_dict, args.yo_dict, args.stress_dict]], args.output)
@@ -0,0 +1,330 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Union
+
+from tps.utils import load_dict, find_stress, place_stress
+from tps.dicts.compiled import get_destination, is_outdated, touch_pages
+
+
+"""
+The dictionary is stored as a minimal acyclic automaton (DAWG) of the strings 'key<sep><payload>',
+so the common prefixes and suffixes of the keys are stored once. The payload keeps the value relative to the key:
+
+    _stressed + chr(_offset + d) for each accent  the value is the key with accents inserted at len(key) - d
+    _raw + value                                  any other value
+
+Counting accent positions from the end of the word makes the payloads of the inflected forms of a word
+(and of the words with the same ending) identical, so they are shared as well.
+
+States are packed into arrays: edges of the state i are labels[first[i]:first[i + 1]] (sorted code points)
+and targets[first[i]:first[i + 1]]; finals[i] is 1 if the state is final. The root has index 0.
+"""
+
+MAGIC = b"TPSA"
+VERSION = 1
+
+_header = struct.Struct("<4sHHIII")
+
+_sep = "\x00"
+_stressed = "\x01"
+_raw = "\x02"
+_offset = 0x20
+
+_missing = object()
+
+
+class DAWG(Mapping):
+    def __init__(self, first, labels, targets, finals, length, buffer=None):
+        """
+        Compact read-only dictionary. Use DAWG.from_mapping to build it and DAWG.save / DAWG.load to store it.
+
+        :param first, labels, targets, finals: Sequence[int]
+            Packed automaton (see the module description).
+        :param length: int
+            Number of the stored entries.
+        :param buffer: Optional[mmap.mmap]
+            The buffer the arrays are mapped from.
+        """
+        self._first = first
+        self._labels = labels
+        self._targets = targets
+        self._finals = finals
+        self._length = length
+        self._buffer = buffer
+
+
+    @classmethod
+    def from_mapping(cls, dict_source: Union[str, tuple, list, dict], fmt: str=None):
+        """
+        Builds the automaton from any dictionary source supported by tps.utils.load_dict.
+
+        :param dict_source: Union[str, tuple, list, dict]
+            Tuple and list mean (path, format).
+        :param fmt: Optional[str]
+
+        :return: DAWG
+        """
+        if isinstance(dict_source, (tuple, list)):
+            dict_source, fmt = dict_source
+
+        entries = load_dict(dict_source, fmt)
+        strings = sorted(key + _sep + _encode(key, value) for key, value in entries.items())
+
+        return cls(*_Builder().build(strings), len(strings))
+
+
+    @classmethod
+    def load(cls, filepath: str):
+        """
+        Maps the automaton saved by DAWG.save into memory.
+
+        :param filepath: str
+
+        :return: DAWG
+        """
+        with open(filepath, "rb") as stream:
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(buffer)
+        magic, version, _, states, edges, length = _header.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("File {} does not contain a DAWG".format(filepath))
+        if version != VERSION:
+            raise ValueError("Unsupported DAWG version {}, expected {}".format(version, VERSION))
+
+        offset = _header.size
+        arrays = []
+        for typecode, size in [("I", states + 1), ("I", edges), ("I", edges), ("B", states)]:
+            nbytes = size * array(typecode).itemsize
+            arrays.append(_cast(view[offset:offset + nbytes], typecode))
+            offset += nbytes
+
+        return cls(*arrays, length, buffer)
+
+
+    def save(self, filepath: str) -> str:
+        """
+        :param filepath: str
+
+        :return: str
+            Path to the saved automaton.
+        """
+        with open(filepath, "wb") as stream:
+            stream.write(_header.pack(MAGIC, VERSION, 0, len(self._finals), len(self._labels), self._length))
+            for typecode, values in [("I", self._first), ("I", self._labels), ("I", self._targets),
+                                     ("B", self._finals)]:
+                values = array(typecode, values)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                stream.write(values.tobytes())
+
+        return filepath
+
+
+    @property
+    def nbytes(self):
+        return sum(memoryview(values).nbytes for values in [self._first, self._labels, self._targets, self._finals])
+
+
+    def warmup(self):
+        """
+        Loads the memory pages of the mapped automaton, so that the first lookups do not wait for the disk.
+        """
+        if self._buffer is not None:
+            touch_pages(self._buffer)
+
+
+    def _walk(self, string, state=0):
+        first, labels, targets = self._first, self._labels, self._targets
+
+        for char in string:
+            lo, hi = first[state], first[state + 1]
+            code = ord(char)
+            idx = bisect_left(labels, code, lo, hi)
+            if idx == hi or labels[idx] != code:
+                return -1
+            state = targets[idx]
+
+        return state
+
+
+    def _completions(self, state, prefix=""):
+        first, labels, targets, finals = self._first, self._labels, self._targets, self._finals
+
+        stack = [(state, prefix)]
+        while stack:
+            state, prefix = stack.pop()
+            if finals[state]:
+                yield prefix
+            for idx in range(first[state + 1] - 1, first[state] - 1, -1):
+                stack.append((targets[idx], prefix + chr(labels[idx])))
+
+
+    def get(self, key, default=None):
+        if not isinstance(key, str):
+            return default
+
+        state = self._walk(key + _sep)
+        if state == -1:
+            return default
+
+        for payload in self._completions(state):
+            return _decode(key, payload)
+
+        return default
+
+
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+
+        return value
+
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._walk(key + _sep) != -1
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for string in self._completions(0):
+            yield string.split(_sep, 1)[0]
+
+
+    def items(self):
+        for string in self._completions(0):
+            key, payload = string.split(_sep, 1)
+            yield key, _decode(key, payload)
+
+
+class _Builder:
+    """
+    Incremental construction of the minimal automaton from the sorted strings (Daciuk et al., 2000).
+    Unchecked states are dicts of edges, registered ones are indices of the packed states.
+    """
+    def __init__(self):
+        self.register = {}
+        self.states = []  # (final, ((label, target), ...)) of the registered states
+
+
+    def build(self, strings):
+        root = {}
+        finals = {id(root): False}
+        path = []  # (parent, label, child) of the last added string
+        prev = ""
+
+        for string in strings:
+            common = 0
+            for a, b in zip(string, prev):
+                if a != b:
+                    break
+                common += 1
+
+            self._minimize(path, finals, common)
+
+            state = path[-1][2] if path else root
+            for char in string[common:]:
+                child = {}
+                finals[id(child)] = False
+                state[char] = child
+                path.append((state, char, child))
+                state = child
+
+            finals[id(state)] = True
+            prev = string
+
+        self._minimize(path, finals, 0)
+        root_idx = self._register(root, finals)
+
+        return self._pack(root_idx)
+
+
+    def _register(self, state, finals):
+        signature = (finals.pop(id(state)), tuple(sorted(state.items())))
+        idx = self.register.get(signature)
+        if idx is None:
+            idx = len(self.states)
+            self.register[signature] = idx
+            self.states.append(signature)
+
+        return idx
+
+
+    def _minimize(self, path, finals, down_to):
+        while len(path) > down_to:
+            parent, char, child = path.pop()
+            parent[char] = self._register(child, finals)
+
+
+    def _pack(self, root_idx):
+        # the root goes first, the rest keep the registration order
+        order = [root_idx] + [idx for idx in range(len(self.states)) if idx != root_idx]
+        new_idx = {idx: i for i, idx in enumerate(order)}
+
+        first, labels, targets, finals = array("I", [0]), array("I"), array("I"), array("B")
+        for idx in order:
+            final, edges = self.states[idx]
+            finals.append(final)
+            for char, target in edges:
+                labels.append(ord(char))
+                targets.append(new_idx[target])
+            first.append(len(labels))
+
+        return first, labels, targets, finals
+
+
+def ensure_dawg(filepath: str, fmt: str="plane", destination: str=None) -> str:
+    """
+    Returns the path to the saved DAWG built from the dictionary file, building it if there is no such one
+    or if the source file is newer.
+
+    :param filepath: str
+        Path to the source dictionary.
+    :param fmt: str
+        Format of the source dictionary (see tps.utils.load_dict).
+    :param destination: Optional[str]
+        Folder for the DAWG file. See tps.dicts.compiled.get_destination by default.
+
+    :return: str
+    """
+    name, _ = os.path.splitext(os.path.basename(filepath))
+    destination = get_destination(filepath) if destination is None else destination
+    dawg_path = os.path.join(destination, name + ".dawg")
+
+    if is_outdated(dawg_path, filepath):
+        DAWG.from_mapping(filepath, fmt).save(dawg_path)
+
+    return dawg_path
+
+
+def _encode(key, value):
+    positions = find_stress(key, value)
+    if positions is None:
+        return _raw + value
+
+    return _stressed + "".join(chr(_offset + len(key) - pos) for pos in positions)
+
+
+def _decode(key, payload):
+    if payload[0] == _raw:
+        return payload[1:]
+
+    return place_stress(key, [len(key) - ord(char) + _offset for char in payload[1:]])
+
+
+def _cast(view, typecode):
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+
+    values = array(typecode, view)
+    values.byteswap()
+    return values
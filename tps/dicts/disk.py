@@ -0,0 +1,314 @@
+import os
+import sys
+import math
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Union
+
+from tps.utils import load_dict
+from tps.dicts.compiled import get_destination, is_outdated
+
+
+"""
+The on-disk dictionary is a sqlite database with two tables:
+
+    entries     (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID
+    meta        (name TEXT PRIMARY KEY, value) - number of entries and the Bloom filter of the keys
+
+DiskDict keeps only a bounded LRU cache of the looked up words (and of the missed ones) in memory,
+the Bloom filter rejects most of the out of vocabulary words without touching the disk.
+"""
+
+_absent = object()
+_entry_overhead = 100  # approximate size of the LRU cache node and the pointers to the key and the value
+
+
+class BloomFilter:
+    def __init__(self, size: int, hashes: int, bits: bytearray=None):
+        """
+        Set of strings that can answer 'certainly absent' or 'probably present'.
+
+        :param size: int
+            Number of bits.
+        :param hashes: int
+            Number of bits set for each string.
+        :param bits: Optional[bytes-like object]
+        """
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray((size + 7) // 8) if bits is None else bytearray(bits)
+
+
+    @classmethod
+    def from_keys(cls, keys, count: int, error_rate: float=0.01):
+        """
+        :param keys: Iterable[str]
+        :param count: int
+            Expected number of the keys.
+        :param error_rate: float
+            Desired probability of the false positive answer.
+
+        :return: BloomFilter
+        """
+        size = max(8, int(-count * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / max(count, 1) * math.log(2)))
+
+        bloom = cls(size, hashes)
+        for key in keys:
+            bloom.add(key)
+
+        return bloom
+
+
+    def _positions(self, key):
+        data = key.encode("utf-8")
+        h1 = zlib.crc32(data)
+        h2 = zlib.adler32(data) | 1
+
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def build_disk_dict(dict_source: Union[str, tuple, list, dict], filepath: str, fmt: str=None,
+                    error_rate: float=0.01) -> str:
+    """
+    Saves the dictionary into the sqlite database, that can be opened by DiskDict.
+
+    :param dict_source: Union[str, tuple, list, dict]
+        Any source supported by tps.utils.load_dict (tuple and list mean (path, format)).
+    :param filepath: str
+        Where to save the database.
+    :param fmt: Optional[str]
+        Format of the dict_source file (see tps.utils.load_dict).
+    :param error_rate: float
+        False positive rate of the Bloom filter (see BloomFilter.from_keys).
+
+    :return: str
+        Path to the database.
+    """
+    if isinstance(dict_source, (tuple, list)):
+        dict_source, fmt = dict_source
+
+    entries = load_dict(dict_source, fmt)
+    bloom = BloomFilter.from_keys(entries, len(entries), error_rate)
+
+    tmp_path = "{}.{}.tmp".format(filepath, os.getpid())
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            connection.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID")
+            connection.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value)")
+            connection.executemany("INSERT INTO entries VALUES (?, ?)", sorted(entries.items()))
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("length", len(entries)),
+                ("bloom_size", bloom.size),
+                ("bloom_hashes", bloom.hashes),
+                ("bloom_bits", bytes(bloom.bits))
+            ])
+    finally:
+        connection.close()
+    os.replace(tmp_path, filepath)
+
+    return filepath
+
+
+def ensure_disk_dict(filepath: str, fmt: str="plane", destination: str=None) -> str:
+    """
+    Returns the path to the sqlite version of the dictionary file, building it if there is no such one
+    or if the source file is newer.
+
+    :param filepath: str
+        Path to the source dictionary.
+    :param fmt: str
+        Format of the source dictionary (see tps.utils.load_dict).
+    :param destination: Optional[str]
+        Folder for the database. See tps.dicts.compiled.get_destination by default.
+
+    :return: str
+    """
+    name, _ = os.path.splitext(os.path.basename(filepath))
+    destination = get_destination(filepath) if destination is None else destination
+    db_path = os.path.join(destination, name + ".sqlite")
+
+    if is_outdated(db_path, filepath):
+        build_disk_dict(filepath, db_path, fmt)
+
+    return db_path
+
+
+class DiskDict(Mapping):
+    def __init__(self, filepath: str, ram_budget: int=16 * 2 ** 20, use_bloom: bool=True):
+        """
+        Read-only dictionary over the sqlite database built by tps.dicts.build_disk_dict.
+        Looked up words (and the missed ones) are kept in the LRU cache limited by ram_budget.
+
+        :param filepath: str
+            Path to the database.
+        :param ram_budget: int
+            Approximate number of bytes the cache may take. 0 disables the cache.
+        :param use_bloom: bool
+            Whether to load the Bloom filter of the keys to skip the disk lookups of the absent words.
+        """
+        assert ram_budget >= 0
+
+        self.filepath = filepath
+        self.ram_budget = ram_budget
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._connection = None
+
+        meta = dict(self._execute("SELECT name, value FROM meta").fetchall())
+        self._length = meta["length"]
+        self.bloom = BloomFilter(meta["bloom_size"], meta["bloom_hashes"], meta["bloom_bits"]) if use_bloom else None
+
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        self._counters = dict.fromkeys(["ram_hits", "disk_hits", "misses", "bloom_rejects"], 0)
+
+
+    @property
+    def stats(self):
+        """
+        Counters of the lookups:
+            * ram_hits - the word (or its absence) was found in the cache;
+            * disk_hits - the word was found in the database;
+            * misses - the word was not found in the database;
+            * bloom_rejects - the word was rejected by the Bloom filter without a disk lookup.
+        Also contains the number of the cached words and the approximate cache size in bytes.
+        """
+        return dict(self._counters, cached=len(self._cache), cache_size=self._cache_size)
+
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+    def _execute(self, query, parameters=(), fetch_one=False):
+        # sqlite connections must not be shared with the forked processes, so each process opens its own one
+        with self._lock:
+            if self._pid != os.getpid():
+                uri = "file:{}?mode=ro".format(os.path.abspath(self.filepath))
+                self._connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                self._pid = os.getpid()
+
+            cursor = self._connection.execute(query, parameters)
+            return cursor.fetchone() if fetch_one else cursor
+
+
+    def _lookup(self, key):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self._counters["ram_hits"] += 1
+                return value
+
+        if self.bloom is not None and key not in self.bloom:
+            with self._lock:
+                self._counters["bloom_rejects"] += 1
+            return _absent
+
+        row = self._execute("SELECT value FROM entries WHERE key = ?", (key,), fetch_one=True)
+        value = _absent if row is None else row[0]
+        with self._lock:
+            self._counters["misses" if row is None else "disk_hits"] += 1
+
+        self._remember(key, value)
+
+        return value
+
+
+    def _remember(self, key, value):
+        if not self.ram_budget:
+            return
+
+        size = sys.getsizeof(key) + (sys.getsizeof(value) if value is not _absent else 0) + _entry_overhead
+        with self._lock:
+            if key in self._cache:
+                return
+
+            self._cache[key] = value
+            self._cache_size += size
+            while self._cache_size > self.ram_budget and self._cache:
+                old_key, old_value = self._cache.popitem(last=False)
+                self._cache_size -= sys.getsizeof(old_key) + _entry_overhead + \
+                                    (sys.getsizeof(old_value) if old_value is not _absent else 0)
+
+
+    def get(self, key, default=None):
+        if not isinstance(key, str):
+            return default
+
+        value = self._lookup(key)
+        return default if value is _absent else value
+
+
+    def __getitem__(self, key):
+        value = self.get(key, _absent)
+        if value is _absent:
+            raise KeyError(key)
+
+        return value
+
+
+    def __contains__(self, key):
+        return self.get(key, _absent) is not _absent
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for row in self._execute("SELECT key FROM entries"):
+            yield row[0]
+
+
+    def items(self):
+        yield from self._execute("SELECT key, value FROM entries")
+
+
+    def clear(self):
+        """
+        Empties the cache.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._cache_size = 0
+
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._pid = None
+
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_lock=None, _connection=None, _pid=None, _cache=OrderedDict(), _cache_size=0)
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
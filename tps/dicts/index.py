@@ -0,0 +1,65 @@
+from array import array
+
+
+class KeyIndex:
+    def __init__(self, keys: list):
+        """
+        Compact index of the strings, which maps each key to its position in the passed list:
+
+            * keys are concatenated into one string, offsets[i] is the start of the i-th key;
+            * an open addressing hash table of (key index + 1) is used to find the key.
+
+        :param keys: List[str]
+            The last position is kept in case of duplicate keys.
+        """
+        self._offsets = array("I", [0])
+        for key in keys:
+            self._offsets.append(self._offsets[-1] + len(key))
+        self._keys = "".join(keys)
+
+        table_size = 1
+        while table_size < 2 * len(keys):
+            table_size <<= 1
+        self._mask = table_size - 1
+        self._table = array("I", bytes(4 * table_size))
+
+        self.unique = 0
+        for idx, key in enumerate(keys):
+            slot = self._find_slot(key)
+            if not self._table[slot]:
+                self.unique += 1
+            self._table[slot] = idx + 1
+
+
+    @property
+    def nbytes(self):
+        return 2 * len(self._keys) + sum(memoryview(values).nbytes for values in [self._offsets, self._table])
+
+
+    def _find_slot(self, key):
+        table, offsets, keys, mask = self._table, self._offsets, self._keys, self._mask
+
+        slot = hash(key) & mask
+        while True:
+            idx = table[slot] - 1
+            if idx == -1 or keys[offsets[idx]:offsets[idx + 1]] == key:
+                return slot
+            slot = (slot + 1) & mask
+
+
+    def find(self, key: str) -> int:
+        """
+        :param key: str
+
+        :return: int
+            Position of the key or -1 if there is no such key.
+        """
+        return self._table[self._find_slot(key)] - 1
+
+
+    def key(self, idx: int) -> str:
+        return self._keys[self._offsets[idx]:self._offsets[idx + 1]]
+
+
+    def __len__(self):
+        return len(self._offsets) - 1
@@ -0,0 +1,434 @@
+import os
+import sys
+import json
+import struct
+import argparse
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from typing import Union
+
+from tps.utils import load_dict, find_stress, place_stress
+from tps.symbols import accent
+from tps.dicts.index import KeyIndex
+from tps.dicts.compiled import get_destination, is_outdated
+
+
+"""
+Each word of the stress dictionary is split into a stem and an ending (at most max_ending characters long).
+Stems are chosen by their signatures - sets of the endings that make a word together with the stem:
+the split, which stem has the largest signature shared by several stems, wins (the inflected forms
+of a word make such signatures). The stem keeps its accent position and the id of its paradigm:
+the set of pairs (ending, accent positions). An accent position is
+
+    p >= 0      position inside the ending
+    -1          the accent position of the stem
+    p <= -2     position len(stem) + p + 1 inside the stem (if the words of the stem are stressed differently)
+
+Inflected forms of the words with the same stress pattern have the same paradigm,
+so only stems and a small number of paradigms are stored.
+
+A word is resolved by trying its suffixes as endings from the longest one: the stem is looked up and the ending
+is checked in the stem paradigm. Every word is assigned to exactly one stem, so the result is the same as the one
+of the source dictionary for its keys, and there are no false hits for the other words.
+Values that can not be got by inserting accents into the key are kept in the exceptions dict.
+
+Layout of the file (all numbers are little-endian):
+
+    header          magic (4s), version (H), max_ending (H), number of stems (I), number of entries (I),
+                    stems size (I), meta size (I)
+    stems           utf-8 encoded stems joined by '\n'
+    paradigm ids    number of stems * uint32
+    stem accents    number of stems * uint8, accent position + 1 or 0 if the stem accent is not used
+    meta            utf-8 encoded json: paradigms, exceptions and the suffix rules
+"""
+
+MAGIC = b"TPSP"
+VERSION = 1
+
+_header = struct.Struct("<4sHHIIII")
+
+
+class ParadigmDict(Mapping):
+    def __init__(self, stems: list, paradigm_ids, stem_accents, paradigms: list, exceptions: dict,
+                 rules: dict=None, max_ending: int=5, guess: bool=False):
+        """
+        Read-only stress dictionary that stores stems and shared paradigms instead of every word form.
+        Use ParadigmDict.from_mapping to build it and ParadigmDict.save / ParadigmDict.load to store it.
+
+        :param stems: List[str]
+        :param paradigm_ids: Sequence[int]
+            Paradigm id of each stem.
+        :param stem_accents: Sequence[int]
+            Accent position + 1 of each stem, 0 if it's not used.
+        :param paradigms: List[Dict[str, Tuple[int]]]
+            Accent positions for each ending (see the module description).
+        :param exceptions: dict
+            Entries, which are not resolved by the paradigms (the keys must not be resolved by them as well).
+        :param rules: Optional[Dict[str, int]]
+            Word suffix -> accent position counted from the end of the word (see ParadigmDict.from_mapping).
+        :param max_ending: int
+            The longest ending of the paradigms.
+        :param guess: bool
+            If True, ParadigmDict.get places the accent by the suffix rules for the words that are not found.
+            Subscription and 'in' are not affected.
+        """
+        self._index = KeyIndex(stems)
+        self._paradigm_ids = paradigm_ids
+        self._stem_accents = stem_accents
+        self._paradigms = paradigms
+        self._endings = {ending for paradigm in paradigms for ending in paradigm}
+        self._exceptions = exceptions
+        self.rules = {} if rules is None else rules
+        self.max_ending = max_ending
+        self.guess = guess
+
+        self._max_rule = max((len(suffix) for suffix in self.rules), default=0)
+        self._length = sum(len(paradigms[idx]) for idx in paradigm_ids) + len(exceptions)
+
+
+    @classmethod
+    def from_mapping(cls, dict_source: Union[str, tuple, list, dict], fmt: str=None, max_ending: int=5,
+                     max_rule: int=4, min_support: int=5, min_confidence: float=0.9):
+        """
+        Compiles the stress dictionary from any source supported by tps.utils.load_dict.
+
+        :param dict_source: Union[str, tuple, list, dict]
+            Tuple and list mean (path, format).
+        :param fmt: Optional[str]
+        :param max_ending: int
+            The longest ending of the paradigms.
+        :param max_rule, min_support, min_confidence:
+            Suffix rules are collected for the suffixes up to max_rule characters long,
+            that are met in at least min_support single-accent words, and at least min_confidence
+            share of them have the accent at the same position from the end.
+
+        :return: ParadigmDict
+        """
+        if isinstance(dict_source, (tuple, list)):
+            dict_source, fmt = dict_source
+
+        entries = load_dict(dict_source, fmt)
+
+        words = {}
+        exceptions = {}
+        for key, value in entries.items():
+            positions = find_stress(key, value)
+            if positions is None or not key:
+                exceptions[key] = value
+            else:
+                words[key] = positions
+
+        groups = {}
+        for word, stem in _choose_stems(sorted(words), max_ending):
+            groups.setdefault(stem, []).append(word)
+
+        stems = []
+        paradigm_ids = array("I")
+        stem_accents = array("B")
+        paradigms = []
+        paradigm_index = {}
+        for stem, group in groups.items():
+            stem_positions = {pos for word in group for pos in words[word] if pos < len(stem)}
+            stem_accent = stem_positions.pop() + 1 if len(stem_positions) == 1 else 0
+            if stem_accent > 255:
+                stem_accent = 0
+
+            paradigm = tuple(sorted(
+                (word[len(stem):], tuple(_relative(pos, len(stem), stem_accent) for pos in words[word]))
+                for word in group
+            ))
+            idx = paradigm_index.get(paradigm)
+            if idx is None:
+                idx = paradigm_index[paradigm] = len(paradigms)
+                paradigms.append(dict(paradigm))
+
+            stems.append(stem)
+            paradigm_ids.append(idx)
+            stem_accents.append(stem_accent)
+
+        rules = _collect_rules(words, max_rule, min_support, min_confidence)
+
+        return cls(stems, paradigm_ids, stem_accents, paradigms, exceptions, rules, max_ending)
+
+
+    @classmethod
+    def load(cls, filepath: str, guess: bool=False):
+        """
+        Loads the dictionary saved by ParadigmDict.save.
+
+        :param filepath: str
+        :param guess: bool
+            See ParadigmDict.__init__
+
+        :return: ParadigmDict
+        """
+        with open(filepath, "rb") as stream:
+            data = stream.read()
+
+        magic, version, max_ending, count, _, stems_size, meta_size = _header.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("File {} does not contain a paradigm dictionary".format(filepath))
+        if version != VERSION:
+            raise ValueError("Unsupported paradigm dictionary version {}, expected {}".format(version, VERSION))
+
+        offset = _header.size
+        stems = data[offset:offset + stems_size].decode("utf-8").split("\n") if count else []
+        offset += stems_size
+
+        paradigm_ids = array("I", data[offset:offset + 4 * count])
+        if sys.byteorder != "little":
+            paradigm_ids.byteswap()
+        offset += 4 * count
+
+        stem_accents = array("B", data[offset:offset + count])
+        offset += count
+
+        meta = json.loads(data[offset:offset + meta_size].decode("utf-8"))
+        paradigms = [{ending: tuple(positions) for ending, positions in paradigm} for paradigm in meta["paradigms"]]
+
+        return cls(stems, paradigm_ids, stem_accents, paradigms, meta["exceptions"], meta["rules"], max_ending,
+                   guess)
+
+
+    def save(self, filepath: str) -> str:
+        """
+        :param filepath: str
+
+        :return: str
+            Path to the saved dictionary.
+        """
+        stems = "\n".join(self._index.key(idx) for idx in range(len(self._index))).encode("utf-8")
+
+        paradigm_ids = array("I", self._paradigm_ids)
+        if sys.byteorder != "little":
+            paradigm_ids.byteswap()
+
+        meta = json.dumps({
+            "paradigms": [sorted(paradigm.items()) for paradigm in self._paradigms],
+            "exceptions": self._exceptions,
+            "rules": self.rules
+        }, ensure_ascii=False).encode("utf-8")
+
+        tmp_path = "{}.{}.tmp".format(filepath, os.getpid())
+        with open(tmp_path, "wb") as stream:
+            stream.write(_header.pack(MAGIC, VERSION, self.max_ending, len(self._index), self._length,
+                                      len(stems), len(meta)))
+            stream.write(stems)
+            stream.write(paradigm_ids.tobytes())
+            stream.write(array("B", self._stem_accents).tobytes())
+            stream.write(meta)
+        os.replace(tmp_path, filepath)
+
+        return filepath
+
+
+    @property
+    def stats(self):
+        return {
+            "entries": self._length,
+            "stems": len(self._index),
+            "paradigms": len(self._paradigms),
+            "exceptions": len(self._exceptions),
+            "rules": len(self.rules)
+        }
+
+
+    def _resolve(self, key):
+        length = len(key)
+        for ending_length in range(min(self.max_ending, length - 1), -1, -1):
+            stem_length = length - ending_length
+            ending = key[stem_length:]
+            if ending not in self._endings:
+                continue
+
+            idx = self._index.find(key[:stem_length])
+            if idx == -1:
+                continue
+
+            positions = self._paradigms[self._paradigm_ids[idx]].get(ending)
+            if positions is None:
+                continue
+
+            stem_accent = self._stem_accents[idx] - 1
+            positions = [stem_length + pos if pos >= 0 else stem_accent if pos == -1 else stem_length + pos + 1
+                         for pos in positions]
+
+            if len(positions) == 1:
+                pos = positions[0]
+                return key[:pos] + accent + key[pos:]
+            return place_stress(key, positions)
+
+        return None
+
+
+    def _guess(self, key):
+        if not key.isalpha():
+            return None
+
+        for suffix_length in range(min(self._max_rule, len(key)), 0, -1):
+            distance = self.rules.get(key[-suffix_length:])
+            if distance is not None and distance <= len(key):
+                return place_stress(key, [len(key) - distance])
+
+        return None
+
+
+    def get(self, key, default=None):
+        if not isinstance(key, str):
+            return default
+
+        value = self._exceptions.get(key)
+        if value is None:
+            value = self._resolve(key)
+        if value is None and self.guess:
+            value = self._guess(key)
+
+        return default if value is None else value
+
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+
+        value = self._exceptions.get(key)
+        if value is None:
+            value = self._resolve(key)
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+
+    def __contains__(self, key):
+        return isinstance(key, str) and (key in self._exceptions or self._resolve(key) is not None)
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for idx in range(len(self._index)):
+            stem = self._index.key(idx)
+            for ending in self._paradigms[self._paradigm_ids[idx]]:
+                yield stem + ending
+
+        yield from self._exceptions
+
+
+def _relative(pos, stem_length, stem_accent):
+    if pos >= stem_length:
+        return pos - stem_length
+    elif pos == stem_accent - 1:
+        return -1
+    else:
+        return pos - stem_length - 1
+
+
+def _chunks(words):
+    # sorted words with the same first characters, the stems are mostly shared inside such chunks
+    chunk = []
+    for word in words:
+        if chunk and word[:3] != chunk[0][:3]:
+            yield chunk
+            chunk = []
+        chunk.append(word)
+
+    if chunk:
+        yield chunk
+
+
+def _candidates(word, max_ending):
+    return [word[:len(word) - ending_length] for ending_length in range(min(max_ending, len(word) - 1) + 1)]
+
+
+def _signatures(chunk, max_ending):
+    signatures = {}
+    for word in chunk:
+        for stem in _candidates(word, max_ending):
+            signatures.setdefault(stem, set()).add(word[len(stem):])
+
+    return {stem: hash(frozenset(endings)) for stem, endings in signatures.items()}, \
+           {stem: len(endings) for stem, endings in signatures.items()}
+
+
+def _choose_stems(words, max_ending, min_count=3):
+    """
+    Yields (word, stem) pairs. The stem is the word prefix (without at most max_ending last characters),
+    which signature is the largest among the ones shared by at least min_count stems.
+    The words must be sorted. The longest stem wins in case of a tie.
+    """
+    counts = Counter()
+    for chunk in _chunks(words):
+        signatures, sizes = _signatures(chunk, max_ending)
+        for stem, signature in signatures.items():
+            if sizes[stem] > 1:
+                counts[signature] += 1
+
+    for chunk in _chunks(words):
+        signatures, sizes = _signatures(chunk, max_ending)
+
+        def score(stem):
+            count = counts[signatures[stem]]
+            return (sizes[stem] if count >= min_count else 0), count, len(stem)
+
+        for word in chunk:
+            yield word, max(_candidates(word, max_ending), key=score)
+
+
+def _collect_rules(words, max_rule, min_support, min_confidence):
+    counts = Counter()
+    totals = Counter()
+    for word, positions in words.items():
+        if len(positions) != 1:
+            continue
+
+        distance = len(word) - positions[0]
+        for suffix_length in range(1, min(max_rule, len(word)) + 1):
+            suffix = word[-suffix_length:]
+            counts[suffix, distance] += 1
+            totals[suffix] += 1
+
+    rules = {}
+    for (suffix, distance), count in counts.items():
+        if totals[suffix] >= min_support and count >= min_confidence * totals[suffix]:
+            rules[suffix] = distance
+
+    return rules
+
+
+def ensure_paradigm(filepath: str, fmt: str="plane", destination: str=None) -> str:
+    """
+    Returns the path to the paradigm dictionary compiled from the dictionary file, compiling it if there is
+    no such one or if the source file is newer.
+
+    :param filepath: str
+        Path to the source dictionary.
+    :param fmt: str
+        Format of the source dictionary (see tps.utils.load_dict).
+    :param destination: Optional[str]
+        Folder for the paradigm dictionary. See tps.dicts.compiled.get_destination by default.
+
+    :return: str
+    """
+    name, _ = os.path.splitext(os.path.basename(filepath))
+    destination = get_destination(filepath) if destination is None else destination
+    paradigm_path = os.path.join(destination, name + ".pdict")
+
+    if is_outdated(paradigm_path, filepath):
+        ParadigmDict.from_mapping(filepath, fmt).save(paradigm_path)
+
+    return paradigm_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiles the plane stress dictionary into the paradigm one.")
+    parser.add_argument("stress_dict", help="path to the plane stress.dict")
+    parser.add_argument("output", help="path to the paradigm dictionary")
+    parser.add_argument("--max_ending", type=int, default=5)
+    args = parser.parse_args()
+
+    paradigm_dict = ParadigmDict.from_mapping(args.stress_dict, "plane", args.max_ending)
+    paradigm_dict.save(args.output)
+    print(paradigm_dict.stats)
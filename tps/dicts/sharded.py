@@ -0,0 +1,173 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from loguru import logger
+
+
+class ShardedDict(Mapping):
+    def __init__(self, filepath: str, prefix_length: int=1, max_shards: int=None, cache_index: bool=True):
+        """
+        Lazy read-only dictionary over the plane dictionary file (see tps.utils.load_dict).
+        The file is only indexed on creation: byte ranges of the lines are grouped into shards
+        by the key prefix. A shard is parsed when a key with its prefix is looked up for the first time.
+
+        :param filepath: str
+            Path to the plane dictionary.
+        :param prefix_length: int
+            Number of the first key characters that define the shard.
+        :param max_shards: Optional[int]
+            If not None, the least recently used shards are evicted, so that there are no more
+            than max_shards parsed shards in memory.
+        :param cache_index: bool
+            Whether to save the index next to the file (see ShardedDict.index_path),
+            so that the next time the file is not scanned.
+        """
+        assert prefix_length > 0
+        assert max_shards is None or max_shards > 0
+
+        self.filepath = filepath
+        self.prefix_length = prefix_length
+        self.max_shards = max_shards
+
+        self._index, self._length = self._load_index(cache_index)
+        self._shards = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    @property
+    def index_path(self):
+        return "{}.{}.idx".format(self.filepath, self.prefix_length)
+
+
+    @property
+    def loaded_shards(self):
+        return list(self._shards.keys())
+
+
+    def _load_index(self, cache_index):
+        stat = os.stat(self.filepath)
+        signature = [stat.st_size, stat.st_mtime_ns, self.prefix_length]
+
+        if cache_index and os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as stream:
+                    cached = json.load(stream)
+                if cached["signature"] == signature:
+                    return cached["index"], cached["length"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        index, length = self._build_index()
+
+        if cache_index:
+            try:
+                with open(self.index_path, "w", encoding="utf-8") as stream:
+                    json.dump({"signature": signature, "index": index, "length": length}, stream,
+                              ensure_ascii=False)
+            except OSError:
+                logger.warning("Can not save the index of {} dictionary, it will be rebuilt next time".
+                               format(self.filepath))
+
+        return index, length
+
+
+    def _build_index(self):
+        index = {}
+        length = 0
+        prefix_bytes = 4 * self.prefix_length  # the longest utf-8 sequence of prefix_length characters
+
+        prev_prefix = None
+        offset = 0
+        with open(self.filepath, "rb") as stream:
+            for line in stream:
+                start = offset
+                offset += len(line)
+
+                if not line.strip():
+                    continue
+                length += 1
+
+                prefix = line[:prefix_bytes].decode("utf-8", "ignore").split("|", 1)[0][:self.prefix_length]
+                if prefix == prev_prefix:
+                    index[prefix][-1][1] = offset
+                else:
+                    index.setdefault(prefix, []).append([start, offset])
+                    prev_prefix = prefix
+
+        return index, length
+
+
+    def _read_shard(self, prefix):
+        ranges = self._index.get(prefix)
+        if ranges is None:
+            return None
+
+        shard = {}
+        with open(self.filepath, "rb") as stream:
+            for start, end in ranges:
+                stream.seek(start)
+                for line in stream.read(end - start).decode("utf-8").splitlines():
+                    if line:
+                        elem = line.split("|")
+                        shard[elem[0]] = elem[1]
+
+        return shard
+
+
+    def _get_shard(self, prefix):
+        with self._lock:
+            shard = self._shards.get(prefix)
+            if shard is not None:
+                self._shards.move_to_end(prefix)
+                return shard
+
+        shard = self._read_shard(prefix)
+        if shard is None:
+            return None
+
+        with self._lock:
+            self._shards[prefix] = shard
+            if self.max_shards is not None:
+                while len(self._shards) > self.max_shards:
+                    self._shards.popitem(last=False)
+
+        return shard
+
+
+    def get(self, key, default=None):
+        shard = self._get_shard(key[:self.prefix_length])
+        return default if shard is None else shard.get(key, default)
+
+
+    def __getitem__(self, key):
+        shard = self._get_shard(key[:self.prefix_length])
+        if shard is None:
+            raise KeyError(key)
+
+        return shard[key]
+
+
+    def __contains__(self, key):
+        shard = self._get_shard(key[:self.prefix_length])
+        return shard is not None and key in shard
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for prefix in self._index:
+            shard = self._shards.get(prefix)
+            yield from (shard if shard is not None else self._read_shard(prefix))
+
+
+    def clear(self):
+        """
+        Evicts all the parsed shards.
+        """
+        with self._lock:
+            self._shards.clear()
@@ -0,0 +1,104 @@
+import os
+import sys
+import weakref
+from multiprocessing import shared_memory, resource_tracker
+from typing import Union
+
+from tps.utils import load_dict
+from tps.dicts.compiled import CompiledDict, pack_dict
+
+
+class SharedDict(CompiledDict):
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool=False):
+        """
+        Read-only dictionary placed in the shared memory block in the compiled dictionary format
+        (see tps.dicts.CompiledDict). Use SharedDict.create in the parent process and SharedDict.attach
+        (or just fork) in the children: lookups touch only the shared block, so there are no per-process
+        python objects whose refcounts could break copy-on-write.
+
+        :param shm: multiprocessing.shared_memory.SharedMemory
+        :param owner: bool
+            Whether the block must be unlinked when the dictionary is closed or garbage collected
+            in the process that created it.
+        """
+        super().__init__(shm.buf)
+        self._shm = shm
+        self._finalizer = weakref.finalize(self, _release, shm, os.getpid() if owner else None)
+
+
+    @classmethod
+    def create(cls, dict_source: Union[str, tuple, list, dict], fmt: str=None, name: str=None):
+        """
+        Loads the dictionary and copies it into a new shared memory block.
+
+        :param dict_source: Union[str, tuple, list, dict]
+            Any source supported by tps.utils.load_dict (tuple and list mean (path, format)).
+        :param fmt: Optional[str]
+            See tps.utils.load_dict
+        :param name: Optional[str]
+            Name of the shared memory block. A unique name is generated if None.
+
+        :return: SharedDict
+        """
+        if isinstance(dict_source, (tuple, list)):
+            dict_source, fmt = dict_source
+
+        chunks = pack_dict(load_dict(dict_source, fmt))
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=sum(len(chunk) for chunk in chunks))
+        offset = 0
+        for chunk in chunks:
+            shm.buf[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+
+        return cls(shm, owner=True)
+
+
+    @classmethod
+    def attach(cls, name: str):
+        """
+        Attaches to the dictionary created by SharedDict.create in another process.
+
+        :param name: str
+            See SharedDict.name
+
+        :return: SharedDict
+        """
+        # only the creator is responsible for the block, otherwise the resource tracker unlinks it
+        # as soon as the attached process exits
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                resource_tracker.unregister(shm._name, "shared_memory")
+
+        return cls(shm)
+
+
+    @property
+    def name(self):
+        return self._shm.name
+
+
+    def close(self):
+        super().close()
+        self._finalizer()
+
+
+    def __reduce__(self):
+        return SharedDict.attach, (self.name,)
+
+
+def _release(shm, owner_pid):
+    try:
+        shm.close()
+    except BufferError:
+        # views of the block are still alive, the memory is unmapped as soon as they are collected
+        pass
+
+    if owner_pid == os.getpid():
+        if sys.version_info < (3, 13) and os.name == "posix":
+            # the processes, which share the resource tracker with the creator, unregister the block on attaching
+            resource_tracker.register(shm._name, "shared_memory")
+        shm.unlink()
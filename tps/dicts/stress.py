@@ -0,0 +1,114 @@
+from array import array
+from collections.abc import Mapping
+from typing import Union
+
+from tps.utils import load_dict
+from tps.symbols import accent
+from tps.dicts.index import KeyIndex
+
+
+_missing = object()
+
+
+class StressDict(Mapping):
+    def __init__(self, items):
+        """
+        Compact read-only dictionary for the stress pairs such as {'hello': 'hell+o'}.
+        Instead of the stressed strings only the accent positions are stored: accents[i] is the accent position + 1
+        of the i-th key of the index (see tps.dicts.index.KeyIndex), 0 means that the value equals the key.
+
+        Values with several accents or the ones that can not be got by inserting an accent into the key
+        are kept in an ordinary dict.
+
+        :param items: Iterable[Tuple[str, str]]
+            Stress pairs, the last pair wins in case of duplicate keys.
+        """
+        keys = []
+        self._accents = array("B")
+        self._irregular = {}
+
+        for key, value in items:
+            pos = value.find(accent)
+            if pos == -1 and value == key:
+                pos = 0
+            elif 0 <= pos < 255 and value == key[:pos] + accent + key[pos:]:
+                pos += 1
+            else:
+                self._irregular[key] = value
+                continue
+
+            keys.append(key)
+            self._accents.append(pos)
+            if key in self._irregular:
+                del self._irregular[key]
+
+        self._index = KeyIndex(keys)
+        self._length = self._index.unique + sum(self._index.find(key) == -1 for key in self._irregular)
+
+
+    @classmethod
+    def from_file(cls, dict_source: Union[str, tuple, list, dict], fmt: str=None):
+        """
+        Builds the dictionary from any source supported by tps.utils.load_dict,
+        plane files are read line by line without loading the whole dictionary.
+
+        :param dict_source: Union[str, tuple, list, dict]
+            Tuple and list mean (path, format).
+        :param fmt: Optional[str]
+
+        :return: StressDict
+        """
+        if isinstance(dict_source, (tuple, list)):
+            dict_source, fmt = dict_source
+
+        if isinstance(dict_source, str) and fmt == "plane":
+            with open(dict_source, "r", encoding="utf-8") as stream:
+                return cls(line.rstrip("\n").split("|")[:2] for line in stream if line.strip())
+
+        return cls(load_dict(dict_source, fmt).items())
+
+
+    @property
+    def nbytes(self):
+        return self._index.nbytes + memoryview(self._accents).nbytes
+
+
+    def _find(self, key):
+        return self._index.find(key) if isinstance(key, str) else -1
+
+
+    def get(self, key, default=None):
+        if key in self._irregular:
+            return self._irregular[key]
+
+        idx = self._find(key)
+        if idx == -1:
+            return default
+
+        pos = self._accents[idx] - 1
+        return key[:pos] + accent + key[pos:] if pos != -1 else key
+
+
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+
+        return value
+
+
+    def __contains__(self, key):
+        return self._find(key) != -1 or key in self._irregular
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for idx in range(len(self._index)):
+            key = self._index.key(idx)
+            if self._index.find(key) == idx and key not in self._irregular:
+                yield key
+
+        yield from self._irregular
@@ -0,0 +1,214 @@
+import re
+from typing import Callable
+
+
+_word_re = re.compile(r"\w+(?:[-.'’+]\w+)*")
+_special_re = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+class AhoCorasick:
+    def __init__(self, patterns: list):
+        """
+        Multi-pattern automaton, which finds all occurrences of all the patterns in one pass over the text.
+
+        :param patterns: List[str]
+            Non-empty strings; the position of a pattern in the list is its id.
+        """
+        self.lengths = [len(pattern) for pattern in patterns]
+
+        goto, outputs = [{}], [[]]
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    outputs.append([])
+                node = child
+            outputs[node].append(idx)
+
+        # breadth-first, so the fail links of the shorter prefixes are ready
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for char, child in goto[node].items():
+                link = fail[node]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                link = goto[link].get(char, 0)
+
+                fail[child] = link
+                if outputs[link]:
+                    outputs[child] = outputs[child] + outputs[link]
+                queue.append(child)
+
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+
+
+    def finditer(self, text: str):
+        """
+        :param text: str
+
+        :return: Iterator[Tuple[int, int, int]]
+            (start, end, pattern id) of each occurrence in the order of the ends.
+        """
+        goto, fail, outputs, lengths = self._goto, self._fail, self._outputs, self.lengths
+
+        node = 0
+        for position, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            for idx in outputs[node]:
+                yield position - lengths[idx], position, idx
+
+
+    def findall(self, text: str, accept: Callable[[int], bool]=None) -> list:
+        """
+        :param text: str
+        :param accept: Optional[Callable[[int], bool]]
+            If passed, only the patterns with accepted ids are searched for.
+
+        :return: List[Tuple[int, int, int]]
+            Non-overlapping occurrences, the leftmost and then the longest ones are preferred.
+        """
+        found = self.finditer(text)
+        if accept is not None:
+            found = (match for match in found if accept(match[2]))
+        found = sorted(found, key=lambda match: (match[0], match[0] - match[1]))
+
+        matches = []
+        position = 0
+        for start, end, idx in found:
+            if start >= position:
+                matches.append((start, end, idx))
+                position = end
+
+        return matches
+
+
+class CompiledUserDict:
+    def __init__(self, user_dict: dict):
+        """
+        The user dictionary (see tps.Handler.dict_check) prepared once for many calls:
+            * words are found by a simple regular expression, which is much cheaper than nltk word_tokenize,
+            and replaced in place, so the rest of the string is kept as is;
+            * literal phrases of all keys are found in one pass by the AhoCorasick automaton;
+            * other phrase patterns are compiled once.
+
+        Phrases of a key are only replaced if the key word is found in the string, as in the user dictionary.
+        Unlike sequential re.sub calls, the phrases are replaced at once, so a replacement is never matched again.
+
+        :param user_dict: dict
+            See tps.Handler.dict_check
+        """
+        self.words = {}
+        self.phrase_keys = set()
+
+        self._phrases = []
+        self._phrase_values = []
+        self._phrase_keys = []
+        self._patterns = []
+        for key, item in user_dict.items():
+            key = key.lower()
+            if not isinstance(item, dict):
+                self.words[key] = item
+                continue
+
+            self.phrase_keys.add(key)
+            for case, value in item.items():
+                if case and _special_re.search(case) is None:
+                    self._phrases.append(case.lower())
+                    self._phrase_values.append(value)
+                    self._phrase_keys.append(key)
+                else:
+                    self._patterns.append((key, re.compile(case, re.IGNORECASE), value))
+
+        self._automaton = AhoCorasick(self._phrases) if self._phrases else None
+
+
+    def __len__(self):
+        return len(self.words) + len(self.phrase_keys)
+
+
+    def __contains__(self, key):
+        key = key.lower()
+        return key in self.words or key in self.phrase_keys
+
+
+    def process(self, string: str) -> str:
+        """
+        Applies the dictionary to the passed string.
+
+        :param string: str
+
+        :return: str
+        """
+        words, phrase_keys = self.words, self.phrase_keys
+
+        parts = []
+        found = set()
+        position = 0
+        for match in _word_re.finditer(string):
+            word = match.group(0)
+            key = word.lower()
+
+            if key in phrase_keys:
+                found.add(key)
+
+            item = words.get(key)
+            if item is None:
+                continue
+
+            if word.istitle():
+                item = item.capitalize()
+
+            start, end = match.span()
+            parts.append(string[position:start])
+            parts.append(item)
+            position = end
+
+        if parts:
+            parts.append(string[position:])
+            string = "".join(parts)
+
+        if found:
+            string = self._replace_phrases(string, found)
+
+        return string
+
+
+    def _replace_phrases(self, string, found):
+        if self._automaton is not None:
+            lowered = string.lower()
+            if len(lowered) == len(string):
+                string = self._replace_literals(string, lowered, found)
+            else:  # lowercasing has shifted the chars, so the phrases are replaced one by one
+                for phrase, value, key in zip(self._phrases, self._phrase_values, self._phrase_keys):
+                    if key in found:
+                        string = re.sub(re.escape(phrase), lambda elem: value, string, flags=re.IGNORECASE)
+
+        for key, regexp, value in self._patterns:
+            if key in found:
+                string = regexp.sub(lambda elem: value, string)
+
+        return string
+
+
+    def _replace_literals(self, string, lowered, found):
+        parts = []
+        position = 0
+        phrase_keys = self._phrase_keys
+        for start, end, idx in self._automaton.findall(lowered, lambda idx: phrase_keys[idx] in found):
+            parts.append(string[position:start])
+            parts.append(self._phrase_values[idx])
+            position = end
+
+        if not parts:
+            return string
+
+        parts.append(string[position:])
+        return "".join(parts)
@@ -1,7 +1,8 @@
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import typing
-from typing import Union, Callable, Iterator, Tuple, List
+from typing import Union, Callable, Iterator, AsyncIterator, Tuple, List
 
 from loguru import logger
 
@@ -9,15 +10,30 @@ import tps.symbols as smb
 import tps.utils.cleaners as tps_cleaners
 import tps.modules as md
 import tps.types as _types
+import tps.snapshot as _snapshot
+import tps.batch as _batch
+import tps.aio as _aio
 from tps.content import ops
+from tps.dicts import ensure_compiled, ensure_composite, ensure_dawg, ensure_disk_dict, ensure_paradigm, SharedDict, \
+    ShardedDict, StressDict, DiskDict, ParadigmDict, CompiledUserDict
+from tps.utils import load_dict
 from tps.modules.ssml.elements import Pause
+from tps.modules.splitter import get_splitter
 
 
 _curly = re.compile("({}.+?{})".format(*smb.shields))
 
+_punkt_checked = False
+
+_warmup_texts = {
+    "russian": "Съешь же ещё этих мягких французских булок, да выпей чаю. Ёжик нашёл 3 гриба!",
+    "english": "The quick brown fox jumps over the lazy dog. Peter Piper picked 3 pecks of peppers!"
+}
+
 
 class Handler(md.Processor):
-    def __init__(self, charset: str, modules: list=None, out_max_length: int=None, save_state=False, name="Handler"):
+    def __init__(self, charset: str, modules: list=None, out_max_length: int=None, save_state=False, name="Handler",
+                 sentence_splitter: Union[str, md.SentenceSplitter]="punkt"):
         """
         This class stores a chain of passed modules and processes texts using this chain.
 
@@ -28,12 +44,19 @@ class Handler(md.Processor):
             If None, then the Handler object will have only basic functionality.
         :param out_max_length: Optional[int]
             If not None, text will be split into units less than out_max_length each.
+        :param sentence_splitter: Union[tps.types.Splitter, tps.modules.SentenceSplitter]
+            How the texts are split into sentences (see Processor.split_to_sentences).
         """
         super().__init__(name=name)
+
         self.charset = charset
         self.symbols = smb.symbols_map[charset]
         self.language = smb.language_map[charset]
 
+        self.sentence_splitter = get_splitter(sentence_splitter, self.language)
+        if isinstance(self.sentence_splitter, md.PunktSplitter):
+            _check_punkt()
+
         # Mappings from symbol to numeric ID and vice versa:
         self.symbol_to_id = {s: i for i, s in enumerate(self.symbols)}
         self.id_to_symbol = {i: s for i, s in enumerate(self.symbols)}
@@ -79,38 +102,73 @@ class Handler(md.Processor):
         :return: str
             Returns processed string.
         """
-        module: md.Processor
-        origin_string = string
+        return self.process_sentences([string], cleaners, user_dict, **kwargs)[0]
 
-        cleaners = [] if cleaners is None else cleaners
-        cleaners = [cleaners] if not isinstance(cleaners, (tuple, list)) else cleaners
-        for _cleaner in cleaners:
-            if isinstance(_cleaner, Callable):
-                cleaner = _cleaner
-            else:
-                if hasattr(tps_cleaners, _cleaner):
-                    cleaner = getattr(tps_cleaners, _cleaner)
-                else:
-                    logger.warning("There is no such cleaner {} in tps library.".format(_cleaner))
-                    continue
 
-            string = cleaner(string)
+    def process_sentences(self, sentences: List[str], cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
+                          user_dict: Union[dict, CompiledUserDict]=None, **kwargs) -> List[str]:
+        """
+        Does the same as Handler.process for each sentence, but the sentences pass through the chain of modules
+        together, so the token-level modules handle them as one batch (see Processor.process_tokens_batch),
+        e.g. the replacers look up each distinct word of the batch once.
+
+        :param sentences: List[str]
+        :param cleaners, user_dict, kwargs:
+            See Handler.generate_text
+
+        :return: List[str]
+            Processed sentences.
+        """
+        if self.save_state and len(sentences) > 1:  # the states of equal sentences are kept in the order of the calls
+            return [self.process_sentences([sentence], cleaners, user_dict, **kwargs)[0] for sentence in sentences]
+
+        module: md.Processor
+        origin_strings = strings = list(sentences)
+
+        if cleaners is not None:
+            cleaners = tps_cleaners.compile_cleaners(cleaners)
+            strings = [cleaners(string) for string in strings]
 
         if user_dict is not None:
-            string = self.dict_check(string, user_dict)
-            if self.save_state:
-                self._out_data[origin_string].append(string)
+            if not isinstance(user_dict, CompiledUserDict):
+                user_dict = CompiledUserDict(user_dict)
+            strings = [self.dict_check(string, user_dict) for string in strings]
+            self._save_state(origin_strings, strings)
 
+        # consecutive token-level modules share one tokenization, the strings are joined only when it's needed
+        batch = None
         for module in self.modules:
-            string = module(string, **kwargs)
-            if self.save_state:
-                self._out_data[origin_string].append(string)
+            if module.token_level and module.max_unit_length is None:
+                if batch is None:
+                    batch = [module.tokenize(string) for string in strings]
+                module.process_tokens_batch(batch, **kwargs)
 
-        return string
+                if self.save_state:
+                    self._save_state(origin_strings, [module.join_tokens(tokens) for tokens, _ in batch])
+                continue
+
+            if batch is not None:
+                strings = [module.join_tokens(tokens) for tokens, _ in batch]
+                batch = None
+
+            strings = [module(string, **kwargs) for string in strings]
+            self._save_state(origin_strings, strings)
+
+        if batch is not None:
+            strings = [md.Processor.join_tokens(tokens) for tokens, _ in batch]
+
+        return strings
+
+
+    def _save_state(self, origin_strings, strings):
+        if self.save_state:
+            for origin_string, string in zip(origin_strings, strings):
+                self._out_data[origin_string].append(string)
 
 
     def process_text(self, text: Union[str, list], cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
-                     user_dict: dict=None, keep_delimiters: bool=True, **kwargs) -> Union[str, list]:
+                     user_dict: Union[dict, CompiledUserDict]=None, keep_delimiters: bool=True,
+                     **kwargs) -> Union[str, list]:
         """
         Process any text: first of all splits it to sentences, if it's possible.
         The Handler.process method is applied to each sentence after that.
@@ -144,13 +202,42 @@ class Handler(md.Processor):
 
         """
         return_string = isinstance(text, str) and not keep_delimiters
-        processed = list(self.generate_text(text, cleaners, user_dict, keep_delimiters, **kwargs))
+        processed = list(self.generate_text(text, cleaners, user_dict, keep_delimiters, batch_size=None, **kwargs))
 
         return " ".join(processed) if return_string else processed
 
 
+    def process_batch(self, texts: List[Union[str, list]], workers: int=None, chunksize: int=None,
+                      cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
+                      user_dict: Union[dict, CompiledUserDict]=None, keep_delimiters: bool=True, **kwargs) -> list:
+        """
+        Processes many independent texts in a pool of worker processes, so the throughput is not limited by the GIL.
+        The workers are forked from the current process and use this Handler with all its dictionaries without
+        pickling it (see tps.batch). The cleaners and the user dictionary are compiled once for the whole batch.
+
+        The pool lives for one call, so it pays off for batches of at least hundreds of sentences.
+        The state of the Handler (see save_state) is not collected from the workers.
+
+        :param texts: List[Union[str, list]]
+            Texts, each one is processed as by Handler.process_text.
+        :param workers: Optional[int]
+            Number of the worker processes, the number of CPUs by default.
+            If it's 1, the texts are processed in the current process.
+        :param chunksize: Optional[int]
+            Number of the texts sent to a worker at once, about 4 chunks per worker by default.
+        :param cleaners, user_dict, keep_delimiters, kwargs:
+            See Handler.generate_text
+
+        :return: list
+            Results of Handler.process_text in the order of the texts.
+        """
+        return _batch.process_batch(self, texts, workers, chunksize, cleaners=cleaners, user_dict=user_dict,
+                                    keep_delimiters=keep_delimiters, **kwargs)
+
+
     def generate_text(self, text: Union[str, list], cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
-                      user_dict: dict=None, keep_delimiters: bool=True,
+                      user_dict: Union[dict, CompiledUserDict]=None, keep_delimiters: bool=True,
+                      batch_size: int=1, workers: int=1, in_flight: int=None,
                       **kwargs) -> Iterator[Union[str, Pause]]:
         """
         Produces a generator of processed sentences or units (with Pause tokens, if keep_delimiters == True).
@@ -169,10 +256,22 @@ class Handler(md.Processor):
                     ]
         :param cleaners: Optional[Tuple[Union[str, Callable[[str], str]]]]
             Tuple of cleaner functions (e.g. such that provided in tps.utils.cleaners).
-        :param user_dict: dict
-            See Handler.dict_check
+            The chain is compiled once (see tps.utils.cleaners.compile_cleaners).
+        :param user_dict: Union[dict, tps.dicts.CompiledUserDict]
+            See Handler.dict_check. A dict is compiled once for the whole text.
         :param keep_delimiters: bool
             If True, final list will contain sentences and Pause tokens between them.
+        :param batch_size: Optional[int]
+            Number of the sentences processed together (see Handler.process_sentences). The larger batches are
+            processed faster, but the first sentence is yielded later. If None, the whole text is one batch.
+        :param workers: Optional[int]
+            Number of the worker processes, which process the batches of a long text in parallel (see tps.batch),
+            the number of CPUs if None. The sentences are still yielded in order, as soon as all the batches before
+            them are done. If batch_size is None, the text is split into about 4 batches per worker.
+            The state of the Handler (see save_state) is not collected from the workers.
+        :param in_flight: Optional[int]
+            Maximum number of the batches sent to the workers and not yielded yet, twice the number of workers
+            by default. The workers wait for the consumer, if it falls behind.
         :param kwargs:
             * mask_stress: Union[bool, float]
                 Whether to mask each token in sentence.
@@ -185,39 +284,151 @@ class Handler(md.Processor):
         """
         self._clear_state()
 
+        sentences, params = self._prepare_text(text, cleaners, user_dict, keep_delimiters, **kwargs)
+        self._out_data = {sentence: [] for sentence in sentences if not isinstance(sentence, Pause)}
+
+        processed = [sentence for sentence in sentences if not isinstance(sentence, Pause)]
+        if workers == 1:
+            processed = self._generate_sentences(processed, batch_size, **params)
+        else:
+            processed = _batch.generate_sentences(self, processed, workers, batch_size, in_flight, **params)
+
+        for sentence in sentences:
+            if not isinstance(sentence, Pause):
+                yield from self._split_output(next(processed), keep_delimiters)
+            elif keep_delimiters:
+                yield sentence
+            else:
+                continue
+
+
+    async def aprocess_text(self, text: Union[str, list], cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
+                            user_dict: Union[dict, CompiledUserDict]=None, keep_delimiters: bool=True,
+                            **kwargs) -> Union[str, list]:
+        """
+        Does the same as Handler.process_text without blocking the event loop. The sentences are processed
+        in an executor together with the sentences of the concurrent requests (see tps.aio and
+        Handler.configure_async). If the call is cancelled, its sentences, which are not processed yet, are dropped.
+
+        :param text, cleaners, user_dict, keep_delimiters, kwargs:
+            See Handler.generate_text
+
+        :return: Union[str, list]
+            See Handler.process_text
+        """
+        return await _aio.get_async_handler(self).process_text(text, cleaners, user_dict, keep_delimiters, **kwargs)
+
+
+    def agenerate_text(self, text: Union[str, list], cleaners: Tuple[Union[str, Callable[[str], str]]]=None,
+                       user_dict: Union[dict, CompiledUserDict]=None, keep_delimiters: bool=True,
+                       **kwargs) -> AsyncIterator[Union[str, Pause]]:
+        """
+        Does the same as Handler.generate_text without blocking the event loop (see Handler.aprocess_text).
+
+        :param text, cleaners, user_dict, keep_delimiters, kwargs:
+            See Handler.generate_text
+
+        :return: AsyncIterator[Union[str, tps.modules.ssml.Pause]]
+        """
+        return _aio.get_async_handler(self).generate_text(text, cleaners, user_dict, keep_delimiters, **kwargs)
+
+
+    def configure_async(self, executor=None, latency: float=0.002, max_batch_size: int=64,
+                        concurrency: int=None) -> "_aio.AsyncHandler":
+        """
+        Sets the parameters of Handler.aprocess_text and Handler.agenerate_text. The previous configuration is
+        stopped: the requests, whose sentences are still queued, are cancelled.
+
+        :param executor: Optional[concurrent.futures.Executor]
+            Executor of the processing, the default executor of the event loop if None.
+        :param latency: float
+            Time in seconds to wait for the sentences of the concurrent requests to process them together.
+            The larger window gives the larger batches, but delays each request.
+        :param max_batch_size: int
+            Maximum number of the sentences processed together.
+        :param concurrency: Optional[int]
+            Maximum number of the requests processed at once, the others wait for their turn. A request takes
+            its turn until all its sentences are processed, a slow consumer of Handler.agenerate_text doesn't hold it.
+
+        :return: tps.aio.AsyncHandler
+        """
+        return _aio.configure(self, executor=executor, latency=latency, max_batch_size=max_batch_size,
+                              concurrency=concurrency)
+
+
+    def _prepare_text(self, text, cleaners, user_dict, keep_delimiters, **kwargs):
+        """
+        Splits the text into sentences and compiles the cleaners and the user dictionary.
+
+        :return: Tuple[list, dict]
+            Sentences with Pause tokens and keyword arguments of Handler.process_sentences.
+        """
         if isinstance(text, str):
-            sentences = self.split_to_sentences(text, keep_delimiters, self.language)
+            sentences = self.split_to_sentences(text, keep_delimiters, self.language, self.sentence_splitter)
         elif isinstance(text, list):
             sentences = text
         else:
             raise TypeError
 
-        self._out_data = {sentence: [] for sentence in sentences if not isinstance(sentence, Pause)}
+        if user_dict is not None and not isinstance(user_dict, CompiledUserDict):
+            user_dict = CompiledUserDict(user_dict)
+        if cleaners is not None:
+            cleaners = tps_cleaners.compile_cleaners(cleaners)
 
-        for sentence in sentences:
-            if not isinstance(sentence, Pause):
-                sentence = self.process(sentence, cleaners, user_dict, **kwargs)
+        return sentences, dict(cleaners=cleaners, user_dict=user_dict, **kwargs)
 
-                if self.out_max_length is not None:
-                    _units = self.split_to_units(sentence, self.out_max_length, keep_delimiters)
 
-                    for unit in _units:
-                        yield unit
-                else:
-                    yield sentence
-            elif keep_delimiters:
-                yield sentence
-            else:
-                continue
+    def _split_output(self, sentence, keep_delimiters):
+        if self.out_max_length is not None:
+            return self.split_to_units(sentence, self.out_max_length, keep_delimiters)
+        return [sentence]
+
+
+    def _generate_sentences(self, sentences, batch_size, **params):
+        batch_size = max(len(sentences), 1) if batch_size is None else batch_size
+
+        for start in range(0, len(sentences), batch_size):
+            yield from self.process_sentences(sentences[start:start + batch_size], **params)
 
 
-    def dict_check(self, string: str, user_dict: dict) -> str:
+    def warmup(self, text: str=None):
+        """
+        Prepares the Handler for the first request, so that it's processed as fast as the next ones:
+        loads the Punkt model for the Handler language (if it's used), loads the memory pages of the mapped
+        dictionaries (see tps.modules.Replacer.warmup) and processes a sample text, so that all lazy resources
+        are initialized.
+
+        :param text: Optional[str]
+            Sample text. A pangram in the Handler language is used by default.
+
+        :return: Handler
+        """
+        text = _warmup_texts[self.language] if text is None else text
+
+        try:
+            sentences = self.split_to_sentences(text, False, self.language, self.sentence_splitter)
+        except LookupError:
+            logger.warning("Punkt model for {} language is not found, try to download it: "
+                           "nltk.download('punkt')".format(self.language))
+            sentences = [text]
+
+        for module in self.modules:
+            module.warmup()
+
+        for sentence in sentences:
+            for module in self.modules:
+                sentence = module(sentence)
+
+        return self
+
+
+    def dict_check(self, string: str, user_dict: Union[dict, CompiledUserDict]) -> str:
         """
         Checks the passed string using user_dict.
 
         :param string: str
             String that needs to be processed.
-        :param user_dict: dict
+        :param user_dict: Union[dict, tps.dicts.CompiledUserDict]
             A dictionary containing specific cases that may occur in the text that
             needs to be resolved before main processing uses chain of modules.
             Example:
@@ -229,34 +440,14 @@ class Handler(md.Processor):
                     },
                     "e.g": "for example"
                 }
+            Big dictionaries should be compiled once (see tps.dicts.CompiledUserDict), a dict is compiled on each call.
 
         :return: str
         """
-        words = self.split_to_words(string)
-
-        regexp_case = []
-        for i, word in enumerate(words):
-            key = word.lower()
-            if key in user_dict:
-                item = user_dict[key]
-
-                if word.istitle():
-                    item = item.capitalize()
-
-                if isinstance(item, dict):
-                    regexp_case.append(word)
-                else:
-                    words[i] = item
+        if not isinstance(user_dict, CompiledUserDict):
+            user_dict = CompiledUserDict(user_dict)
 
-        regexp_case = set(regexp_case)
-        string = self.join_words(words)
-
-        for word in regexp_case:
-            for case, value in user_dict[word].items():
-                regexp = re.compile(case, re.IGNORECASE)
-                string = regexp.sub(lambda elem: value, string)
-
-        return string
+        return user_dict.process(string)
 
 
     def text2vec(self, string: str) -> list:
@@ -357,7 +548,7 @@ class Handler(md.Processor):
 
     @classmethod
     def from_charset(cls, charset, out_max_length=None, data_dir=None, verify_checksum=True,
-                     silent=False):
+                     silent=False, storage="dict", composite=False, warmup=False, sentence_splitter="punkt"):
         """
         Makes instance of the Handler class that is used by default for the passed charset.
         It's possible that some additional files need to be downloaded before -
@@ -376,13 +567,65 @@ class Handler(md.Processor):
         :param silent: bool
             The dictionaries and models will be downloaded if ones don't exist or the checksums are invalid
             if silent == True, raises exceptions otherwise.
+        :param storage: tps.types.Storage
+            How the dictionaries are kept in memory:
+                * dict - ordinary python dicts;
+                * compiled - dictionaries are compiled once (see tps.dicts.compile_dict) and memory-mapped;
+                * shared - dictionaries are loaded into shared memory blocks (see tps.dicts.SharedDict),
+                so the processes forked after the Handler creation do not copy them;
+                * sharded - dictionaries are only indexed, and the parts of them are parsed on the first lookup
+                (see tps.dicts.ShardedDict);
+                * dawg - dictionaries are converted once into compact automatons (see tps.dicts.DAWG);
+                * stress - only accent positions are kept for the stress pairs (see tps.dicts.StressDict),
+                other dictionaries are effectively kept as ordinary dicts;
+                * disk - dictionaries are converted once into sqlite databases, only the LRU cache of the looked up
+                words is kept in memory (see tps.dicts.DiskDict);
+                * paradigm - dictionaries are compiled once into stems and shared inflection paradigms
+                (see tps.dicts.ParadigmDict), it pays off for the stress dictionary.
+        :param composite: bool
+            If True, the chain of Russian dictionary modules is replaced with one RuCompositeEmphasizer,
+            whose dictionary is built once from the default ones (see tps.dicts.build_composite).
+            The sharded storage is not supported in this case.
+        :param warmup: bool
+            Whether to call Handler.warmup after the creation.
+        :param sentence_splitter: Union[tps.types.Splitter, tps.modules.SentenceSplitter]
+            See Handler.__init__
 
         :return: Handler
         """
         charset = _types.Charset(charset)
-        modules = _get_default_modules(charset, data_dir, verify_checksum, silent)
+        storage = _types.Storage(storage)
+        modules = _get_default_modules(charset, data_dir, verify_checksum, silent, storage, composite)
+
+        handler = Handler(charset, modules, out_max_length, sentence_splitter=sentence_splitter)
 
-        return Handler(charset, modules, out_max_length)
+        return handler.warmup() if warmup else handler
+
+
+    def save_snapshot(self, filepath: str) -> str:
+        """
+        Saves the Handler with the whole module chain and all the dictionaries into one versioned file,
+        which can be memory-mapped by Handler.load_snapshot (see tps.snapshot).
+
+        :param filepath: str
+
+        :return: str
+            Path to the snapshot.
+        """
+        return _snapshot.save_snapshot(self, filepath)
+
+
+    @staticmethod
+    def load_snapshot(filepath: str):
+        """
+        Restores the Handler saved by Handler.save_snapshot. The dictionaries are not parsed:
+        they are used right over the memory-mapped file (see tps.dicts.CompiledDict).
+
+        :param filepath: str
+
+        :return: Handler
+        """
+        return _snapshot.load_snapshot(filepath)
 
 
     def _should_keep_symbol(self, s):
@@ -394,13 +637,16 @@ class Handler(md.Processor):
         lower_exists = False
         cleaner_exists = False
         phonetizer_type = None
-        auxiliary_idx = 0
+
+        self._fuse_normalization()
 
         for i, module in enumerate(self.modules):
             if isinstance(module, md.Lower):
                 lower_exists = True
             elif isinstance(module, md.Cleaner):
                 cleaner_exists = True
+            elif isinstance(module, md.Normalizer):
+                lower_exists = cleaner_exists = True
             elif isinstance(module, md.Emphasizer):
                 emphasizer_exists = True
             elif isinstance(module, md.Phonetizer):
@@ -411,11 +657,12 @@ class Handler(md.Processor):
                     logger.warning("There is no emphasizer in modules. "
                                    "Phonetizer will process words only with stress tokens set by user")
 
-        if not lower_exists:
-            self.modules.insert(auxiliary_idx, md.Lower())
-            auxiliary_idx += 1
-        if not cleaner_exists:
-            self.modules.insert(auxiliary_idx, md.Cleaner(self.charset))
+        if not lower_exists and not cleaner_exists:
+            self.modules.insert(0, md.Normalizer(self.charset))
+        elif not lower_exists:
+            self.modules.insert(0, md.Lower())
+        elif not cleaner_exists:
+            self.modules.insert(0, md.Cleaner(self.charset))
 
         if self.charset == _types.Charset.ru:
             assert phonetizer_type is None
@@ -423,6 +670,22 @@ class Handler(md.Processor):
         #     assert phonetizer_type == md.EnPhonetizer
 
 
+    def _fuse_normalization(self):
+        """
+        Replaces each Lower module, which is immediately followed by the Cleaner module of the handler charset,
+        with one Normalizer module, which gives the same result.
+        """
+        modules = []
+        for module in self.modules:
+            if type(module) is md.Cleaner and module.max_unit_length is None and module.charset == self.charset \
+                    and modules and type(modules[-1]) is md.Lower and modules[-1].max_unit_length is None:
+                modules[-1] = md.Normalizer(self.charset)
+            else:
+                modules.append(module)
+
+        self.modules[:] = modules
+
+
     def pop(self, item):
         if isinstance(item, int):
             idx = item
@@ -441,6 +704,20 @@ class Handler(md.Processor):
         self._out_data = {}
 
 
+def _check_punkt():
+    global _punkt_checked
+    if _punkt_checked:
+        return
+
+    import nltk
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        nltk.download("punkt")
+
+    _punkt_checked = True
+
+
 def get_symbols_length(charset: str):
     charset = _types.Charset[charset]
     return len(smb.symbols_map[charset])
@@ -457,22 +734,59 @@ def _get_file(name, data_dir, verify_checksum, raise_exception):
     return file
 
 
-def _get_default_modules(charset, data_dir=None, verify_checksum=True, silent=False):
+def _get_dict_source(file, storage, fmt="plane"):
+    if storage == _types.Storage.dict:
+        return [file, fmt] if fmt != "compiled" else dict(load_dict(file, fmt).items())
+    elif storage == _types.Storage.compiled:
+        return [ensure_compiled(file, fmt) if fmt != "compiled" else file, "compiled"]
+    elif storage == _types.Storage.shared:
+        return SharedDict.create(file, fmt)
+    elif storage == _types.Storage.sharded and fmt == "plane":
+        return ShardedDict(file, prefix_length=2)
+    elif storage == _types.Storage.dawg:
+        return [ensure_dawg(file, fmt), "dawg"]
+    elif storage == _types.Storage.stress:
+        return StressDict.from_file(file, fmt)
+    elif storage == _types.Storage.disk:
+        return DiskDict(ensure_disk_dict(file, fmt) if fmt != "sqlite" else file)
+    elif storage == _types.Storage.paradigm:
+        return ParadigmDict.load(ensure_paradigm(file, fmt))
+    else:
+        raise ValueError("{} storage is not supported for {} dictionaries".format(storage.value, fmt))
+
+
+def _load_dict_source(file, storage, fmt="plane"):
+    source = _get_dict_source(file, storage, fmt)
+    return load_dict(*source) if isinstance(source, list) else source
+
+
+def _get_default_modules(charset, data_dir=None, verify_checksum=True, silent=False, storage="dict",
+                         composite=False):
     modules = [
-        md.Lower(),
-        md.Cleaner(charset)
+        md.Normalizer(charset)
     ]
 
     if charset == _types.Charset.ru:
-        stress_dict = _get_file("stress.dict", data_dir, verify_checksum, not silent)
-        yo_dict = _get_file("yo.dict", data_dir, verify_checksum, not silent)
-        e_dict = _get_file("e.dict", data_dir, verify_checksum, not silent)
-
-        modules.extend([
-            md.BlindReplacer([e_dict, "plane"], name="Eficator"),
-            md.BlindReplacer([yo_dict, "plane"], name="Yoficator"),
-            md.RuEmphasizer([stress_dict, "plane"], True)
-        ])
+        # checksums are verified and dictionaries are loaded in parallel:
+        # hashlib releases the GIL while hashing, and the file reading overlaps with the parsing
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            stress_dict, yo_dict, e_dict = executor.map(
+                lambda name: _get_file(name, data_dir, verify_checksum, not silent),
+                ["stress.dict", "yo.dict", "e.dict"]
+            )
+
+            if composite:
+                composite_dict = ensure_composite(e_dict, yo_dict, stress_dict)
+                modules.append(md.RuCompositeEmphasizer(_get_dict_source(composite_dict, storage, "compiled"), True))
+            else:
+                e_source, yo_source, stress_source = executor.map(
+                    lambda file: _load_dict_source(file, storage), [e_dict, yo_dict, stress_dict]
+                )
+                modules.extend([
+                    md.BlindReplacer(e_source, name="Eficator"),
+                    md.BlindReplacer(yo_source, name="Yoficator"),
+                    md.RuEmphasizer(stress_source, True)
+                ])
     elif charset == _types.Charset.en:
         pass
     elif charset == _types.Charset.en_cmu:
@@ -1,9 +1,10 @@
 from tps.modules.processor import Processor
+from tps.modules.splitter import SentenceSplitter, PunktSplitter, RuleSplitter
 
 from tps.modules.custom.replacer import Replacer, BlindReplacer
-from tps.modules.custom.auxiliary import Lower, Cleaner
+from tps.modules.custom.auxiliary import Lower, Cleaner, Normalizer
 
 from tps.modules.emphasizer.rule_based.independent import Emphasizer
-from tps.modules.emphasizer.rule_based.russian import RuEmphasizer
+from tps.modules.emphasizer.rule_based.russian import RuEmphasizer, RuCompositeEmphasizer
 
 from tps.modules.phonetizer.rule_based.independent import Phonetizer
\ No newline at end of file
@@ -5,6 +5,9 @@ from tps.symbols import valid_symbols_map
 from tps.utils import cleaners
 
 
+_spaces = re.compile(" {2,}")
+
+
 class Lower(md.Processor):
     def process(self, string: str, **kwargs) -> str:
         return string.lower()
@@ -24,4 +27,41 @@ class Cleaner(md.Processor):
         string = cleaners.invalid_charset_cleaner(string, self._invalid_charset)
         string = cleaners.collapse_whitespace(string)  # need to clean multiple white spaces that have appeared
 
-        return string
\ No newline at end of file
+        return string
+
+
+class Normalizer(md.Processor):
+    def __init__(self, charset):
+        """
+        Lower and Cleaner fused into one module: lowercases the string, removes the characters, which are not in
+        the charset (see tps.symbols.valid_symbols_map), and collapses white spaces. Handler uses it instead of
+        the pair of modules.
+
+        Ascii strings are processed in one pass by a precomputed translate table, the others are lowercased
+        and then cleaned by one regular expression. In both cases only spaces may remain of the white spaces,
+        so the runs of them are collapsed only if there are any.
+
+        :param charset: tps.types.Charset
+        """
+        super().__init__()
+        self.charset = charset
+
+        valid_chars = set("".join(valid_symbols_map[self.charset]))
+        self._invalid_charset = re.compile("[^{}]+".format(re.escape("".join(sorted(valid_chars)))))
+
+        self._ascii_table = {}
+        for code in range(128):
+            char = chr(code).lower()
+            self._ascii_table[code] = char if char in valid_chars else None
+
+
+    def process(self, string: str, **kwargs) -> str:
+        if string.isascii():
+            string = string.translate(self._ascii_table)
+        else:
+            string = self._invalid_charset.sub("", string.lower())
+
+        if "  " in string:
+            string = _spaces.sub(" ", string)
+
+        return string
@@ -1,13 +1,43 @@
 from typing import Union
 
-from tps.utils import load_dict, prob2bool
-from tps.symbols import punctuation, accent
+from tps.utils import load_dict, prob2bool, _punct_re
+from tps.symbols import accent
+from tps.types import TokenKind
 from tps.modules import Processor
 
 
+_value = None  # the key of the phrase value in the trie nodes, tokens are never None
+_phrase = 255  # the kind of the replaced phrases, which is never processed as a single token
+
+
+def build_phrase_trie(entries) -> Union[dict, None]:
+    """
+    Builds the trie of the phrase keys (the keys of several tokens) over their tokens (see Processor.tokenize).
+
+    :param entries: Mapping
+
+    :return: Optional[dict]
+        Nested dicts {token: node}, the phrase value is kept under the None key. None if there are no phrases.
+    """
+    root = {}
+    for key in filter(_punct_re.search, entries):  # the keys without spaces and punctuation are single tokens
+        tokens = Processor.split_to_tokens(key)
+        if len(tokens) < 2:
+            continue
+
+        node = root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_value] = entries[key]
+
+    return root if root else None
+
+
 class Replacer(Processor):
+    token_level = True
+
     def __init__(self, dict_source: Union[str, tuple, list, dict]=None,
-                 name: str="Replacer"):
+                 name: str="Replacer", phrases: bool=False):
         """
         Base class for replacer-type processors.
 
@@ -21,6 +51,12 @@ class Replacer(Processor):
                     path - path to the dictionary file
                     format - format of the dictionary file (see tps.utils.load_dict function)
                 * dict - just a dict
+                * Mapping - any read-only dict-like object, e.g. tps.dicts.CompiledDict
+            Keys may be phrases of several tokens, e.g. {'to compact something': 'to comp+act something'},
+            if phrases is True: the longest phrase starting at each word wins over the replacements of single tokens.
+        :param phrases: bool
+            Whether to search the dictionary for phrase keys. It takes a pass over all the keys, so it's off
+            by default, and the keys with spaces or punctuation are never matched then.
         """
         super().__init__(None, name)
 
@@ -30,6 +66,17 @@ class Replacer(Processor):
 
         self.entries = load_dict(dict_source, fmt)
 
+        self.phrases = build_phrase_trie(self.entries) if phrases else None
+
+
+    def warmup(self):
+        """
+        Loads the memory pages of the dictionary, if it's memory-mapped (see tps.dicts.CompiledDict.warmup).
+        """
+        warmup = getattr(self.entries, "warmup", None)
+        if warmup is not None:
+            warmup()
+
 
     def process(self, string: str, **kwargs) -> str:
         """
@@ -45,16 +92,129 @@ class Replacer(Processor):
 
         :return: str
         """
+        tokens, kinds = self.tokenize(string)
+        self.process_tokens(tokens, kinds, **kwargs)
+
+        return self.join_tokens(tokens)
+
+
+    def process_tokens(self, tokens: list, kinds: bytearray, **kwargs):
+        """
+        Replaces each word token according to the dictionary (if exists) in place.
+        If some replacement consists of several tokens, the tokens are split again.
+
+        :param tokens: list
+        :param kinds: bytearray
+            See Processor.process_tokens
+        :param kwargs:
+            See Replacer.process
+        """
         mask = kwargs.get("mask", False)
-        tokens = self.split_to_tokens(string)
+        word = TokenKind.word
+
+        split = False
+        if self.phrases is not None:
+            split = self._replace_phrases(tokens, kinds, mask)
 
-        for idx, token in enumerate(tokens):
-            if token in punctuation:
+        for idx, kind in enumerate(kinds):
+            if kind != word:
                 continue
-            token = self._process_token(token, mask)
-            tokens[idx] = token
 
-        return self.join_tokens(tokens)
+            token = tokens[idx]
+            processed = self._process_token(token, mask)
+            if processed is not token:
+                tokens[idx] = processed
+                split = split or _punct_re.search(processed) is not None
+
+        if split:
+            tokens[:], kinds[:] = self.tokenize(self.join_tokens(tokens))
+
+
+    def process_tokens_batch(self, batch: list, **kwargs):
+        """
+        Does the same as Replacer.process_tokens for each string of the batch, but each distinct word of the batch
+        is looked up once: the words repeat a lot across the sentences, so it saves most of the lookups.
+        If the mask is a probability, each token is masked independently, so the strings are processed one by one.
+
+        :param batch: List[Tuple[list, bytearray]]
+        :param kwargs:
+            See Replacer.process
+        """
+        mask = kwargs.get("mask", False)
+        if not isinstance(mask, bool):
+            for tokens, kinds in batch:  # the descendants map their own mask arguments to the mask one
+                Replacer.process_tokens(self, tokens, kinds, mask=mask)
+            return
+
+        word = TokenKind.word
+
+        phrased = [False] * len(batch)
+        if self.phrases is not None:
+            phrased = [self._replace_phrases(tokens, kinds, mask) for tokens, kinds in batch]
+
+        words = set()
+        for tokens, kinds in batch:
+            words.update(token for token, kind in zip(tokens, kinds) if kind == word)
+
+        replacements = {}
+        for token in words:
+            processed = self._process_token(token, mask)
+            if processed != token:
+                replacements[token] = processed
+
+        if not replacements and not any(phrased):
+            return
+
+        splitting = {token for token, processed in replacements.items() if _punct_re.search(processed) is not None}
+        get = replacements.get
+        for (tokens, kinds), split in zip(batch, phrased):
+            split = split or not splitting.isdisjoint(tokens)
+
+            if split:  # the replaced phrases may look like words, so the kinds are checked
+                tokens[:] = [get(token, token) if kind == word else token for token, kind in zip(tokens, kinds)]
+                tokens[:], kinds[:] = self.tokenize(self.join_tokens(tokens))
+            else:  # only the words may be found among the replaced tokens
+                tokens[:] = [get(token, token) for token in tokens]
+
+
+    def _replace_phrases(self, tokens, kinds, mask):
+        """
+        Replaces the longest phrases of the dictionary in place. The replaced tokens are marked with
+        the _phrase kind, so they are not processed as single tokens.
+
+        :return: bool
+            Whether some phrase was replaced.
+        """
+        root = self.phrases
+        word = TokenKind.word
+
+        replaced = []
+        idx = 0
+        while idx < len(tokens):
+            node = root.get(tokens[idx]) if kinds[idx] == word else None
+
+            end, value = None, None
+            position = idx + 1
+            while node is not None:
+                if _value in node:
+                    end, value = position, node[_value]
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+            if end is None or prob2bool(mask):
+                idx += 1
+                continue
+
+            replaced.append((idx, end, value))
+            idx = end
+
+        for start, end, value in reversed(replaced):
+            tokens[start:end] = [value]
+            kinds[start:end] = bytes([_phrase])
+
+        return bool(replaced)
 
 
     def _process_token(self, token, mask):
@@ -10,7 +10,8 @@ language-specific rules, just add a new descendant class.
 """
 
 class Emphasizer(Replacer):
-    def __init__(self, dict_source: Union[str, tuple, list, dict]=None, prefer_user: bool=True):
+    def __init__(self, dict_source: Union[str, tuple, list, dict]=None, prefer_user: bool=True,
+                 phrases: bool=False):
         """
         Base emphasizer with common functionality for all languages.
 
@@ -26,27 +27,33 @@ class Emphasizer(Replacer):
                 * dict - just a dict
         :param prefer_user: bool
             If true, words with stress tokens set by user will be passed as is
+        :param phrases: bool
+            Whether to stress the phrase keys of the dictionary (see tps.modules.Replacer).
         """
-        super().__init__(dict_source, "Emphasizer")
+        super().__init__(dict_source, "Emphasizer", phrases)
         self.prefer_user = prefer_user
 
 
-    def process(self, string: str, **kwargs) -> str:
+    def process_tokens(self, tokens: list, kinds: bytearray, **kwargs):
         """
-        Splits passed string to tokens and convert each to stressed one if it presents in dictionary.
+        Converts each word token to stressed one if it presents in dictionary.
         Keep it mind, that tokenization is simple here and it's better to pass normalized string.
 
-        :param string: str
-            Your text.
+        :param tokens: list
+        :param kinds: bytearray
+            See tps.modules.Processor.process_tokens
         :param kwargs:
             * mask_stress: Union[bool, float]
                 Whether to mask each token.
                 If float, then masking probability will be computed for each token independently.
-
-        :return: str
         """
         mask = kwargs.get("mask_stress", False)
-        return super().process(string, mask=mask)
+        super().process_tokens(tokens, kinds, mask=mask)
+
+
+    def process_tokens_batch(self, batch: list, **kwargs):
+        mask = kwargs.get("mask_stress", False)
+        super().process_tokens_batch(batch, mask=mask)
 
 
     def _process_token(self, token, mask):
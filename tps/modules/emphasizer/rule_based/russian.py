@@ -6,8 +6,9 @@ from tps.symbols import accent
 
 
 class RuEmphasizer(Emphasizer):
-    def __init__(self, dict_source: Union[str, tuple, list, dict]=None, prefer_user: bool=True):
-        super().__init__(dict_source, prefer_user)
+    def __init__(self, dict_source: Union[str, tuple, list, dict]=None, prefer_user: bool=True,
+                 phrases: bool=False):
+        super().__init__(dict_source, prefer_user, phrases)
 
 
     def _process_token(self, token, mask):
@@ -20,8 +21,55 @@ class RuEmphasizer(Emphasizer):
 
         token = self.entries.get(token, token)
 
+        return self._stress_yo(token)
+
+
+    @staticmethod
+    def _stress_yo(token):
         if "ё" in token and accent not in token:
             if token != "сёрфингист" or "трёх" not in token:
                 token = token.replace("ё", "{}ё".format(accent))
 
-        return token
\ No newline at end of file
+        return token
+
+
+class RuCompositeEmphasizer(RuEmphasizer):
+    separator = "\x1f"
+
+    def __init__(self, dict_source: Union[str, tuple, list, dict]=None, prefer_user: bool=True):
+        """
+        Does the same as the chain of Eficator, Yoficator (see tps.modules.BlindReplacer) and RuEmphasizer,
+        but using one dictionary precomputed by tps.dicts.build_composite, so each token is looked up once.
+
+        :param dict_source: Union[str, tuple, list, dict]
+            Source of the composite dictionary (see tps.modules.Replacer).
+        :param prefer_user: bool
+            See RuEmphasizer. Must be the same as the one the composite dictionary was built with.
+        """
+        super().__init__(dict_source, prefer_user)
+
+
+    def _process_token(self, token, mask):
+        word = token.replace(accent, "")
+        entry = self.entries.get(word)
+
+        blind = entry is not None and self.separator in entry
+        if blind:
+            entry, masked = entry.split(self.separator)
+
+        if prob2bool(mask):
+            if blind:
+                return masked if masked else entry.replace(accent, "")
+            return word
+
+        if blind:
+            return entry
+        elif word != token:  # the stress is set by user
+            if self.prefer_user:
+                return token
+            entry = self.entries.get(token)
+            return self._stress_yo(token) if entry is None else entry
+        elif entry is None:
+            return self._stress_yo(token)
+        else:
+            return entry
@@ -29,22 +29,26 @@ class Phonetizer(Replacer):
         super().__init__(dict_source, "Phonetizer")
 
 
-    def process(self, string: str, **kwargs) -> str:
+    def process_tokens(self, tokens: list, kinds: bytearray, **kwargs):
         """
-        Splits passed string to tokens and convert each to phonetized one if it presents in dictionary.
+        Converts each word token to phonetized one if it presents in dictionary.
         Keep it mind, that tokenization is simple here and it's better to pass normalized string.
 
-        :param string: str
-            Your text.
+        :param tokens: list
+        :param kinds: bytearray
+            See tps.modules.Processor.process_tokens
         :param kwargs:
             * mask_phonemes: Union[bool, float]
                 Whether to mask each token.
                 If float, then masking probability will be computed for each token independently.
-
-        :return: str
         """
         mask = kwargs.get("mask_phonemes", False)
-        return super().process(string, mask=mask)
+        super().process_tokens(tokens, kinds, mask=mask)
+
+
+    def process_tokens_batch(self, batch: list, **kwargs):
+        mask = kwargs.get("mask_phonemes", False)
+        super().process_tokens_batch(batch, mask=mask)
 
 
     def _process_token(self, token, mask):
@@ -2,11 +2,10 @@ import re
 from collections import OrderedDict
 from typing import Union, Pattern, Iterator
 
-from nltk import sent_tokenize, word_tokenize
-
-from tps.utils import split_to_tokens
+from tps.utils import split_to_tokens, tokenize
 from tps.modules.ssml.elements import Pause
-from tps.symbols import separator, shields
+from tps.modules.splitter import SentenceSplitter, get_splitter
+from tps.symbols import separator, shields, punctuation
 
 
 char_map = OrderedDict({
@@ -20,9 +19,15 @@ char_map = OrderedDict({
 })
 
 _spaced_punctuation = re.compile(r" [{}]".format("".join([char for char in char_map if char != " "])))
+_punct_chars = "".join(re.escape(char) for char in punctuation)
+_separated_word = re.compile("(?<![^{0}]){1}*{2}{1}*".format(
+    _punct_chars, "[^{}]".format(_punct_chars), re.escape(separator)
+))
 
 
 class Processor:
+    token_level = False  # whether the processor implements Processor.process_tokens natively
+
     def __init__(self, max_unit_length: int=None, name="Processor"):
         """
         Base class for all text processors.
@@ -76,6 +81,43 @@ class Processor:
         raise NotImplementedError
 
 
+    def process_tokens(self, tokens: list, kinds: bytearray, **kwargs):
+        """
+        Processes the tokenized string in place (see Processor.tokenize). Token-level processors
+        (with token_level == True) implement it natively, so the chain of them shares one tokenization
+        (see tps.Handler.process). By default the tokens are joined, processed by Processor.process
+        and split again.
+
+        :param tokens: list
+        :param kinds: bytearray
+            Kinds of the tokens (see tps.types.TokenKind).
+        :param kwargs: dict
+            See tps.Handler.generate_text
+        """
+        tokens[:], kinds[:] = self.tokenize(self.process(self.join_tokens(tokens), **kwargs))
+
+
+    def process_tokens_batch(self, batch: list, **kwargs):
+        """
+        Processes a batch of tokenized strings in place, e.g. the sentences of a text (see tps.Handler.process_batch).
+        Processors may handle the whole batch at once, by default each string is processed by Processor.process_tokens.
+
+        :param batch: List[Tuple[list, bytearray]]
+            Tokens and kinds of each string (see Processor.process_tokens).
+        :param kwargs: dict
+            See tps.Handler.generate_text
+        """
+        for tokens, kinds in batch:
+            self.process_tokens(tokens, kinds, **kwargs)
+
+
+    def warmup(self):
+        """
+        Prepares the processor for the first request, e.g. loads the resources it needs. Does nothing by default.
+        """
+        pass
+
+
     def process_text(self, text: Union[str, list], keep_delimiters: bool=False, **kwargs) -> Union[str, list]:
         """
         Process any text: first of all splits it to sentences, if it's possible.
@@ -155,13 +197,17 @@ class Processor:
 
         :return: int
         """
-        _text = text
         for symb in shields:
-            _text = _text.replace(symb, "")
+            text = text.replace(symb, "")
 
-        _text = Processor.split_to_tokens(_text)
+        weight = len(text)
+        if separator not in text:
+            return weight
 
-        weight = sum(len(s.split(separator)) if separator in s else len(s) for s in _text)
+        # a word with separators weighs as the number of its parts
+        for match in _separated_word.finditer(text):
+            start, end = match.span()
+            weight -= end - start - text.count(separator, start, end) - 1
 
         return weight
 
@@ -223,19 +269,24 @@ class Processor:
 
 
     @staticmethod
-    def split_to_sentences(text: str, keep_delimiters: bool=False, language: str="russian") -> list:
+    def split_to_sentences(text: str, keep_delimiters: bool=False, language: str="russian",
+                           splitter: Union[str, SentenceSplitter]="punkt") -> list:
         """
-        Splits specified text into sentences using nltk library.
+        Splits specified text into sentences, using nltk library by default.
 
         :param text: str
         :param keep_delimiters: bool
             If True, final list will contain sentences and Pause tokens between them.
         :param language: str
             The model name in the nltk Punkt corpus
+        :param splitter: Union[tps.types.Splitter, tps.modules.SentenceSplitter]
+            * punkt - the nltk Punkt model (see tps.modules.PunktSplitter);
+            * rule - fast rule-based splitter (see tps.modules.RuleSplitter);
+            * any instance of tps.modules.SentenceSplitter.
 
         :return: list
         """
-        parts = sent_tokenize(text, language)
+        parts = get_splitter(splitter, language).split(text)
 
         if keep_delimiters:
             for i in range(1, len(parts)):
@@ -253,6 +304,7 @@ class Processor:
 
         :return: list
         """
+        from nltk import word_tokenize
         return word_tokenize(text)
 
 
@@ -296,6 +348,20 @@ class Processor:
         return split_to_tokens(text, punct_re)
 
 
+    @staticmethod
+    def tokenize(text: str, punct_re: Pattern=None) -> tuple:
+        """
+        Splits specified text into tokens as the self.split_to_tokens method does and marks the kind of each one.
+
+        :param text: str
+        :param punct_re: Pattern
+
+        :return: Tuple[list, bytearray]
+            Tokens and their kinds (see tps.types.TokenKind).
+        """
+        return tokenize(text, punct_re)
+
+
     @staticmethod
     def join_tokens(tokens: list) -> str:
         """
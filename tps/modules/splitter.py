@@ -0,0 +1,209 @@
+import re
+from typing import Union
+
+from tps.types import Splitter
+
+
+class SentenceSplitter:
+    def __init__(self, language: str="russian"):
+        """
+        Base class for sentence splitters (see tps.modules.Processor.split_to_sentences).
+
+        :param language: str
+            Language of the texts, e.g. "russian" or "english" (see tps.symbols.language_map).
+        """
+        self.language = language
+
+
+    def __call__(self, text: str) -> list:
+        return self.split(text)
+
+
+    def __str__(self):
+        return "<{}: {}>".format(type(self).__name__, self.language)
+
+
+    def split(self, text: str) -> list:
+        """
+        Must be implemented in the descendant classes. Splits the passed text into sentences.
+
+        :param text: str
+
+        :return: List[str]
+            Sentences without leading and trailing white spaces.
+        """
+        raise NotImplementedError
+
+
+class PunktSplitter(SentenceSplitter):
+    def split(self, text: str) -> list:
+        """
+        Splits the passed text into sentences using the nltk Punkt model for the splitter language.
+
+        :param text: str
+
+        :return: List[str]
+        """
+        from nltk import sent_tokenize
+        return sent_tokenize(text, self.language)
+
+
+_terminals = ".!?…"
+_closing = "\"'»”’)]"
+_opening = "\"'«“„([—–-"
+
+_boundary = re.compile(r"[{}]+[{}]*\s+".format(re.escape(_terminals), re.escape(_closing)))
+
+# abbreviations, which are written with a period and hardly ever end a sentence
+_abbreviations = {
+    "russian": {
+        "т.е", "т.к", "т.н", "т.о", "и.о", "в.т.ч", "напр", "др", "пр", "см", "ср", "стр", "рис", "табл",
+        "гл", "ст", "п", "пп", "ч", "г", "гг", "в", "вв", "ул", "пер", "просп", "пл", "обл", "р-н", "д", "кв",
+        "корп", "им", "проф", "акад", "доц", "канд", "чл.-корр", "тов", "г-н", "г-жа", "св", "ок",
+        "прим", "ред", "изд", "т", "с", "н", "о", "оз", "м", "руб", "коп", "тыс", "млн", "млрд", "трлн",
+        "кг", "км", "мм", "мин", "сек", "шт", "искл", "англ", "лат", "франц", "нем", "род", "ум", "а.с", "ж.д"
+    },
+    "english": {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "e.g", "i.e", "cf", "no", "nos", "vol",
+        "fig", "figs", "approx", "dept", "est", "gen", "gov", "lt", "col", "sgt", "capt", "rev", "mt", "ft",
+        "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k",
+        "u.n", "p", "pp", "ch", "sec", "ave", "blvd", "rd", "hon", "pres", "messrs", "mme", "op", "al"
+    }
+}
+
+# abbreviations of units and dates, which end a sentence after a number if the next word is capitalized,
+# e.g. "... в 1812 г. Армия ..." or "... at 5 p.m. The ..."
+_numeric_abbreviations = {
+    "russian": {"г", "гг", "в", "вв", "руб", "коп", "тыс", "млн", "млрд", "трлн", "кг", "км", "мм", "мин", "сек", "шт"},
+    "english": {"a.m", "p.m", "etc", "inc", "ltd", "co", "corp", "bc", "ad"}
+}
+
+# abbreviations, which end a sentence if the next word is capitalized
+_final_abbreviations = {
+    "russian": {"т.д", "т.п", "др"},
+    "english": {"etc", "inc", "ltd", "co", "corp", "a.m", "p.m"}
+}
+
+
+class RuleSplitter(SentenceSplitter):
+    def __init__(self, language: str="russian"):
+        """
+        Fast sentence splitter based on the terminal punctuation, the capitalization of the next word and
+        the tables of abbreviations. A sentence boundary is a run of terminal marks (.!?…) with optional
+        closing quotes or brackets, which is followed by a white space and a capitalized word or a number,
+        optionally behind opening quotes or a dash. A period after an abbreviation or an initial is not a boundary.
+
+        Texts without terminal punctuation (most of the short TTS requests) are not scanned at all.
+
+        :param language: str
+            "russian" or "english".
+        """
+        super().__init__(language)
+
+        if language not in _abbreviations:
+            raise ValueError("There are no abbreviation tables for {} language, use one of: {}".format(
+                language, ", ".join(_abbreviations)))
+
+        self._abbreviations = _abbreviations[language]
+        self._numeric_abbreviations = _numeric_abbreviations[language]
+        self._final_abbreviations = _final_abbreviations[language]
+
+
+    def split(self, text: str) -> list:
+        """
+        Splits the passed text into sentences.
+
+        :param text: str
+
+        :return: List[str]
+        """
+        text = text.strip()
+        if not any(char in text for char in _terminals):
+            return [text] if text else []
+
+        sentences = []
+        start = 0
+        for match in _boundary.finditer(text):
+            mark = match.group(0).rstrip()
+            if self._is_boundary(text, match.start(), mark, match.end()):
+                sentences.append(text[start:match.start() + len(mark)])
+                start = match.end()
+
+        sentences.append(text[start:])
+
+        return sentences
+
+
+    def _is_boundary(self, text, position, mark, next_position):
+        next_position = _skip(text, next_position, _opening + " ")
+        if next_position == len(text):
+            return False
+
+        next_char = text[next_position]
+        capitalized = next_char.isupper() or next_char.isdigit()
+        if not capitalized:
+            return False
+
+        if mark.rstrip(_closing) != ".":
+            return True
+
+        word_start, word = _previous_word(text, position)
+        if len(word) == 1 and word.isupper():  # an initial
+            return False
+
+        previous_start, previous = _previous_word(text, word_start)
+        if len(previous) == 2 and previous[-1] == "." and len(word) == 1:  # spaced abbreviations like "т. е."
+            word_start, word = previous_start, previous + word
+
+        word = word.lower()
+        if word in self._numeric_abbreviations:
+            previous = _previous_word(text, word_start)[1]
+            if any(char.isdigit() for char in previous) or previous.rstrip(".").lower() in self._numeric_abbreviations:
+                return True
+
+        if word in self._final_abbreviations:
+            return True
+
+        return word not in self._abbreviations
+
+
+def _previous_word(text, position):
+    """
+    :return: Tuple[int, str]
+        Start and the word before the position without opening quotes and brackets.
+    """
+    end = position
+    while end > 0 and text[end - 1].isspace():
+        end -= 1
+
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+
+    return start, text[start:end].lstrip(_opening)
+
+
+def _skip(text, position, chars):
+    while position < len(text) and text[position] in chars:
+        position += 1
+    return position
+
+
+_splitters = {
+    Splitter.punkt: PunktSplitter,
+    Splitter.rule: RuleSplitter
+}
+
+
+def get_splitter(splitter: Union[str, SentenceSplitter], language: str) -> SentenceSplitter:
+    """
+    :param splitter: Union[tps.types.Splitter, SentenceSplitter]
+        Name of the splitter (see tps.types.Splitter) or an instance of it, which is returned as is.
+    :param language: str
+
+    :return: SentenceSplitter
+    """
+    if isinstance(splitter, SentenceSplitter):
+        return splitter
+
+    return _splitters[Splitter(splitter)](language)
@@ -0,0 +1,130 @@
+import os
+import io
+import mmap
+import pickle
+import struct
+
+from tps import modules as md
+from tps.dicts.compiled import CompiledDict, pack_dict
+
+
+"""
+Snapshot is a single file with a fully configured Handler (all numbers are little-endian):
+
+    header          magic (4s), version (H), reserved (H), number of sections (I), pickle offset (Q), pickle size (Q)
+    sections        number of sections * (offset (Q), size (Q))
+    ...             dictionaries of the Replacer modules in the compiled format (see tps.dicts.compiled)
+    pickle          the pickled Handler, the dictionaries are referenced by the section numbers
+
+The file is memory-mapped on loading, and the dictionaries become CompiledDict objects over its sections,
+so only the module chain itself is unpickled.
+"""
+
+MAGIC = b"TPSS"
+VERSION = 1
+
+_header = struct.Struct("<4sHHIQQ")
+_section = struct.Struct("<QQ")
+_alignment = 8
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, dicts):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.dicts = dicts
+        self.sections = {}
+
+
+    def persistent_id(self, obj):
+        if id(obj) not in self.dicts:
+            return None
+
+        idx = self.sections.setdefault(id(obj), len(self.sections))
+        return "dict", idx
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, sections):
+        super().__init__(file)
+        self.sections = sections
+
+
+    def persistent_load(self, pid):
+        kind, idx = pid
+        if kind != "dict":
+            raise pickle.UnpicklingError("Unsupported persistent object {}".format(kind))
+
+        return CompiledDict(self.sections[idx])
+
+
+def save_snapshot(handler, filepath: str) -> str:
+    """
+    Saves the Handler with all its modules and dictionaries into one file.
+
+    :param handler: tps.Handler
+    :param filepath: str
+
+    :return: str
+        Path to the snapshot.
+    """
+    dicts = {id(module.entries): module.entries for module in handler.modules if isinstance(module, md.Replacer)}
+
+    stream = io.BytesIO()
+    pickler = _Pickler(stream, dicts)
+    pickler.dump(handler)
+    data = stream.getvalue()
+
+    sections = [None] * len(pickler.sections)
+    for obj_id, idx in pickler.sections.items():
+        sections[idx] = pack_dict(dicts[obj_id])
+
+    offset = _header.size + _section.size * len(sections)
+    table = []
+    for chunks in sections:
+        offset += -offset % _alignment
+        size = sum(len(chunk) for chunk in chunks)
+        table.append((offset, size))
+        offset += size
+
+    tmp_path = "{}.{}.tmp".format(filepath, os.getpid())
+    with open(tmp_path, "wb") as file:
+        file.write(_header.pack(MAGIC, VERSION, 0, len(sections), offset, len(data)))
+        for section in table:
+            file.write(_section.pack(*section))
+
+        for (section_offset, _), chunks in zip(table, sections):
+            file.write(bytes(section_offset - file.tell()))
+            for chunk in chunks:
+                file.write(chunk)
+
+        file.write(data)
+    os.replace(tmp_path, filepath)
+
+    return filepath
+
+
+def load_snapshot(filepath: str):
+    """
+    Maps the snapshot saved by save_snapshot into memory and restores the Handler.
+
+    :param filepath: str
+
+    :return: tps.Handler
+    """
+    with open(filepath, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    magic, version, _, count, pickle_offset, pickle_size = _header.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("File {} does not contain a Handler snapshot".format(filepath))
+    if version != VERSION:
+        raise ValueError("Unsupported snapshot version {}, expected {}".format(version, VERSION))
+
+    sections = []
+    for idx in range(count):
+        offset, size = _section.unpack_from(view, _header.size + idx * _section.size)
+        sections.append(view[offset:offset + size])
+
+    data = view[pickle_offset:pickle_offset + pickle_size]
+    return _Unpickler(io.BytesIO(data), sections).load()
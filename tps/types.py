@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class BasedOn(str, Enum):
@@ -13,6 +13,22 @@ class Charset(str, Enum):
     ru = "ru"
 
 
+class Storage(str, Enum):
+    dict = "dict"
+    compiled = "compiled"
+    shared = "shared"
+    sharded = "sharded"
+    dawg = "dawg"
+    stress = "stress"
+    disk = "disk"
+    paradigm = "paradigm"
+
+
+class Splitter(str, Enum):
+    punkt = "punkt"
+    rule = "rule"
+
+
 class Module(str, Enum):
     emphasizer = "emphasizer"
     phonetizer = "phonetizer"
@@ -30,4 +46,10 @@ class SSMLTag(str, Enum):
 
     @classmethod
     def nested(cls, value):
-        return value in [cls.speak, cls.p, cls.s, cls.prosody]
\ No newline at end of file
+        return value in [cls.speak, cls.p, cls.s, cls.prosody]
+
+
+class TokenKind(IntEnum):
+    word = 0
+    punctuation = 1
+    space = 2
@@ -1,26 +1,87 @@
 import os
 import re
 import json
-import yaml
-import numpy as np
+from itertools import repeat
+from collections.abc import Mapping
 
 from tps import symbols as smb
+from tps.types import TokenKind
 
 
 def prob2bool(prob):
-    return prob if isinstance(prob, bool) else np.random.choice([True, False], p=[prob, 1 - prob])
+    if isinstance(prob, bool):
+        return prob
+
+    import numpy as np
+    return np.random.choice([True, False], p=[prob, 1 - prob])
+
+
+_punct_chars = "".join(re.escape(char) for char in smb.punctuation)  # the chars like "\\", "]" and "^" are escaped
+_punct_re = re.compile("[{}]".format(_punct_chars))
+# a single pass lexer: the number of the matched group is the kind of the token (see tps.types.TokenKind)
+_token_re = re.compile("([{}])|({})|[^{}]+".format(
+    "".join(re.escape(char) for char in smb.punctuation if char != smb.space), re.escape(smb.space), _punct_chars
+))
+_split_re = re.compile("[{0}]|[^{0}]+".format(_punct_chars))
+_kinds = {char: TokenKind.punctuation.value for char in smb.punctuation}
+_kinds[smb.space] = TokenKind.space.value
+
+
+def token_spans(text, punct_re=None):
+    """
+    Splits the text into tokens in one pass without copying them.
+
+    :param text: str
+    :param punct_re: Pattern
+        Custom pattern of punctuation tokens, each match of it is a separate token.
+
+    :return: Iterator[Tuple[int, int, TokenKind]]
+        (start, end, kind) of each token.
+    """
+    if punct_re is None:
+        for match in _token_re.finditer(text):
+            start, end = match.span()
+            yield start, end, match.lastindex or TokenKind.word
+        return
+
+    position = 0
+    for match in punct_re.finditer(text):
+        start, end = match.span()
+        if start == end:
+            continue
+        if position < start:
+            yield position, start, TokenKind.word
+        yield start, end, TokenKind.space if match.group(0) == smb.space else TokenKind.punctuation
+        position = end
+
+    if position < len(text):
+        yield position, len(text), TokenKind.word
 
 
-_punct_re = re.compile("[{}]".format("".join(smb.punctuation)))
 def split_to_tokens(text, punct_re=None):
-    punct_re = _punct_re if punct_re is None else punct_re
+    if punct_re is None:
+        return _split_re.findall(text)
 
-    prepared = punct_re.sub(lambda elem: "⁑{}⁑".format(elem.group(0)), text)
+    return [text[start:end] for start, end, _ in token_spans(text, punct_re)]
 
-    prepared = prepared.split("⁑")
-    prepared = [t for t in prepared if t != ""]
 
-    return prepared
+def tokenize(text, punct_re=None):
+    """
+    Splits the text as split_to_tokens does and marks the kind of each token (see tps.types.TokenKind).
+
+    :return: Tuple[list, bytearray]
+        Tokens and their kinds.
+    """
+    if punct_re is None:
+        tokens = _split_re.findall(text)
+        return tokens, bytearray(map(_kinds.get, tokens, repeat(TokenKind.word.value)))
+
+    tokens, kinds = [], bytearray()
+    for start, end, kind in token_spans(text, punct_re):
+        tokens.append(text[start:end])
+        kinds.append(kind)
+
+    return tokens, kinds
 
 
 def hide_stress(regexp, text):
@@ -31,6 +92,31 @@ def reveal_stress(regexp, text):
     return regexp.sub(lambda elem: "+" + elem.group(0).lower(), text)
 
 
+def find_stress(word, stressed):
+    """
+    Returns positions of the accent tokens, such that place_stress(word, positions) == stressed,
+    or None if stressed is not just the word with accent tokens inserted.
+    """
+    if stressed.replace(smb.accent, "") != word:
+        return None
+
+    positions = []
+    idx = 0
+    for char in stressed:
+        if char == smb.accent:
+            positions.append(idx)
+        else:
+            idx += 1
+
+    return tuple(positions)
+
+
+def place_stress(word, positions):
+    for pos in reversed(positions):
+        word = word[:pos] + smb.accent + word[pos:]
+    return word
+
+
 def load_dict(dict_source, fmt=None):
     _dict = {}
 
@@ -38,24 +124,36 @@ def load_dict(dict_source, fmt=None):
         _, ext = os.path.splitext(dict_source)
         if ext in [".json", ".yaml"]:
             fmt = ext.replace(".", "")
+        elif ext == ".cdict":
+            fmt = "compiled"
+        elif ext == ".dawg":
+            fmt = "dawg"
         elif fmt is None:
-            raise ValueError("File format must be specified ['json', 'yaml', 'plane']")
+            raise ValueError("File format must be specified ['json', 'yaml', 'plane', 'compiled', 'dawg']")
 
         assert os.path.exists(dict_source)
 
+        if fmt == "compiled":
+            from tps.dicts import CompiledDict
+            return CompiledDict.open(dict_source)
+        elif fmt == "dawg":
+            from tps.dicts import DAWG
+            return DAWG.load(dict_source)
+
         with open(dict_source, "r", encoding="utf-8") as stream:
             if fmt == "json":
                 _dict = json.load(stream)
             elif fmt == "yaml":
+                import yaml
                 _dict = yaml.safe_load(stream)
             elif fmt == "plane":
                 _dict = stream.read().splitlines()
                 _dict = tuple(line.split("|") for line in _dict)
                 _dict = {elem[0]: elem[1] for elem in _dict}
             else:
-                raise ValueError("File format must be specified ['json', 'yaml', 'plane']")
+                raise ValueError("File format must be specified ['json', 'yaml', 'plane', 'compiled', 'dawg']")
 
-    elif isinstance(dict_source, dict):
+    elif isinstance(dict_source, Mapping):
         _dict = dict_source
     elif dict_source is None:
         pass
@@ -78,6 +176,7 @@ def save_dict(dict_obj, filepath, fmt=None):
         if fmt == "json":
             json.dump(dict_obj, stream, indent=2, ensure_ascii=False)
         elif fmt == "yaml":
+            import yaml
             yaml.dump(dict_obj, stream, indent=2, allow_unicode=True)
         else:
             raise ValueError("File format must be specified ['json', 'yaml']")
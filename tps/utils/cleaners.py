@@ -3,9 +3,13 @@ Based on https://github.com/keithito/tacotron
 """
 
 import re
+from functools import lru_cache
+from typing import Callable, Union
+
+from loguru import logger
 from unidecode import unidecode
 
-from .numbs import normalize_numbers
+from .numbs import normalize_numbers_chunked, normalize_number_chunk, _chunk_re
 
 
 _punctuation_quote_1 = re.compile(r"(\b «)(?=[A-ZА-Я](?:\S*[^»] ){2,}(?:\S+»|\S+$))")  # поиск ёлочек, открывающих фразу
@@ -14,27 +18,30 @@ _punctuation_quote_2 = re.compile(r"(\b „)(?=[A-ZА-Я](?:\S*[^“] ){2,}(?:\S
 _hyphen = re.compile(r"\b-\b")
 _star = re.compile(r"\b\#\b")
 
-_punctuation_phrase_1 = re.compile(r"([?!.]+ - (?=[А-Я]))")  # конец реплики (строки вида '? - ')
-_punctuation_phrase_2 = re.compile(", - ")  # строки вида ', - ', т.е. разрыв реплики
+# The patterns of punctuation_cleaners are applied until there are no matches, so they are written in the form,
+# which reaches the same result in one linear pass: runs of repeated characters are matched as a whole and only
+# from their first character. The character after each run can't continue it, so the backtracking into a run
+# fails at once.
+_punctuation_phrase_1 = re.compile(r"(?<![?!.])([?!.])[?!.]* - (?=[А-Я])")  # конец реплики (строки вида '? - ')
+_punctuation_phrase_2 = re.compile(r"(?<!,)(?<!, -)(?:,+ -)+ ")  # строки вида ', - ', т.е. разрыв реплики
 _punctuation_signs_1 = re.compile("(\|[?!.]|^[?!.])") # знаки препинания в начале строки
-_punctuation_phrase_3 = re.compile("(\| |^ |\|- |^- )")  # пробелы или дефисы в начале строки
+_punctuation_phrase_3 = re.compile(r"[^| -]+|.", re.DOTALL)  # пробелы или дефисы в начале строки
+_line_start = re.compile(r"(?: |- )*")
 
 _punctuation_garbage = re.compile(r"(\.\b|\b-|-\b|“|”|„|«|»)")  # ниочёмные дефисы и всякий шлак вроде кавычек
-_punctuation_bracket_1 = re.compile(r"\([^)]+$")  # поиск одинокой открывающей скобки
-_punctuation_bracket_2 = re.compile(r"^[^(]+\)(?=.+$)") # поиск одинокой закрывающей скобки
 
 _punctuation_colon = re.compile(r"\b: (?=\S+)") # двоеточие с последующим пояснением (не протестировано как следует)
 _punctuation_signs_2 = re.compile("[?.!]{2,}") # двойные знаки препинания
 _punctuation_signs_3 = re.compile("(?<=\W)[А-Я]{1}\.(?= [А-Я+])") # сокращение имён
 _punctuation_signs_4 = re.compile("[, \n]+\.$") # неправильно стоящая точка в конце предложения
-_punctuation_signs_5 = re.compile(r"\.(?=[А-Яа-я+])") # точка в начале слова
+_punctuation_signs_5 = re.compile(r"(?<!\.)\.+(?=[А-Яа-я+])") # точка в начале слова
 
 # Regular expression matching whitespace:
 _whitespace_1 = re.compile(r"[ \t]+")
 _whitespace_2 = re.compile(r"\n+")
 
-# List of (regular expression, replacement) pairs for abbreviations:
-_abbreviations_en = [(re.compile('\\b%s\\.' % x[0], re.IGNORECASE), x[1]) for x in [
+# List of (abbreviation, replacement) pairs:
+_abbreviation_pairs_en = [
     ('mrs', 'misess'),
     ('mr', 'mister'),
     ('dr', 'doctor'),
@@ -53,7 +60,59 @@ _abbreviations_en = [(re.compile('\\b%s\\.' % x[0], re.IGNORECASE), x[1]) for x
     ('ltd', 'limited'),
     ('col', 'colonel'),
     ('ft', 'fort'),
-]]
+]
+_abbreviations_en = [(re.compile('\\b%s\\.' % x[0], re.IGNORECASE), x[1]) for x in _abbreviation_pairs_en]
+
+# numbers and abbreviations of english_cleaners found in one pass (see _normalize_english)
+_english_re = re.compile(r"(?P<number>{})|\b(?P<abbreviation>{})\.".format(
+    _chunk_re.pattern, "|".join(abbreviation for abbreviation, _ in _abbreviation_pairs_en)
+))
+_abbreviation_order_en = {abbreviation: i for i, (abbreviation, _) in enumerate(_abbreviation_pairs_en)}
+_abbreviation_map_en = dict(_abbreviation_pairs_en)
+
+
+
+class _Translation:
+    def __init__(self, mapping: dict):
+        """
+        Replacement of single characters with strings (an empty one removes the character), which can be merged
+        with the adjacent translations into one pass (see compile_cleaners).
+
+        :param mapping: Dict[str, str]
+        """
+        self.mapping = mapping
+        self._table = str.maketrans(mapping)
+        # str.translate is fast on ascii texts only, otherwise the replacements are made one by one,
+        # which is correct as long as no replacement brings a character that is replaced after it
+        self._sequential = not any(char in value for value in mapping.values() for char in mapping)
+
+
+    def __call__(self, text: str) -> str:
+        if text.isascii() or not self._sequential:
+            return text.translate(self._table)
+
+        for char, value in self.mapping.items():
+            text = text.replace(char, value)
+
+        return text
+
+
+    def __add__(self, other):
+        """
+        :param other: _Translation
+            Translation, which is applied after this one.
+
+        :return: _Translation
+        """
+        mapping = {char: other(value) for char, value in self.mapping.items()}
+        for char, value in other.mapping.items():
+            mapping.setdefault(char, value)
+
+        return _Translation(mapping)
+
+
+_replace_punctuation_chars = _Translation({"–": "-", "‑": "-", "…": "."})
+_remove_quotes = _Translation(dict.fromkeys(['"', '“', '”', '„', '«', '»', '\''], ""))
 
 
 def apply_regexp(regexp, line, replacement: callable):
@@ -84,49 +143,143 @@ def collapse_whitespace(text):
 
 
 def convert_to_ascii(text):
-    return unidecode(text)
+    return text if text.isascii() else unidecode(text)
 
 
 def expand_numbers(text):
-    return normalize_numbers(text)
+    return normalize_numbers_chunked(text)
+
+
+def _normalize_english(text):
+    """
+    expand_numbers and expand_abbreviations_en in one pass over the lowercased text.
+
+    The numbers and the abbreviations never overlap and don't change the word boundaries around them,
+    so each match is replaced independently, with one exception: the abbreviations are expanded one after another
+    in the order of _abbreviation_pairs_en, so an abbreviation right after the expanded one is left as is
+    if it goes later in the list, e.g. 'st.co.' becomes 'saintco.'.
+    """
+    parts = []
+    position = 0
+    expanded_end = expanded_order = -1
+    for match in _english_re.finditer(text):
+        start, end = match.span()
+        number, abbreviation = match.group("number", "abbreviation")
+
+        if number is not None:
+            value = normalize_number_chunk(number)
+        else:
+            order = _abbreviation_order_en[abbreviation]
+            if start == expanded_end and expanded_order < order:
+                continue
+
+            value = _abbreviation_map_en[abbreviation]
+            expanded_end, expanded_order = end, order
+
+        parts.append(text[position:start])
+        parts.append(value)
+        position = end
+
+    if not parts:
+        return text
+
+    parts.append(text[position:])
+    return "".join(parts)
 
 
 def punctuation_cleaners(text):
-    text = text.replace("–", "-")
-    text = text.replace("‑", "-")
-    text = text.replace("…", ".")
+    text = _replace_punctuation_chars(text)
+    text = _clean_punctuation(text)
+    return text
 
-    text = apply_regexp(_hyphen, text, lambda elem: "#")  # экраниурем слова с дефисами
 
-    text = apply_regexp(_punctuation_phrase_1, text, lambda elem: elem[0] + " ")
-    text = apply_regexp(_punctuation_phrase_2, text, lambda elem: elem[1:])
-    text = apply_regexp(_punctuation_phrase_3, text, lambda elem: "")
+def _clean_punctuation(text):
+    text = _hyphen.sub("#", text)  # экраниурем слова с дефисами
 
-    text = apply_regexp(_punctuation_bracket_1, text, lambda elem: elem[1:])
-    text = apply_regexp(_punctuation_bracket_2, text, lambda elem: elem[:-1])
+    text = _punctuation_phrase_1.sub(r"\1 ", text)
+    text = _punctuation_phrase_2.sub(lambda elem: elem.group(0).replace(",", ""), text)
+    text = _remove_line_starts(text)
 
-    text = apply_regexp(_punctuation_signs_3, text, lambda elem: elem[0])
-    text = apply_regexp(_punctuation_signs_5, text, lambda elem: "")
+    text = _remove_unclosed_brackets(text)
+    text = _remove_unopened_brackets(text)
 
-    text = apply_regexp(_star, text, lambda elem: "-")  # восстанавливаем дефисы
+    text = _punctuation_signs_3.sub(lambda elem: elem.group(0)[0], text)
+    text = _punctuation_signs_5.sub("", text)
+
+    text = _star.sub("-", text)  # восстанавливаем дефисы
     text = text.replace(" - ", " — ")
 
     return text
 
 
+def _remove_line_starts(text):
+    """
+    Removes '| ', '|- ' and also spaces and '- ' in the beginning of the text until there are none of them.
+    All the patterns end with a space, so the text is scanned once and the pattern is removed
+    from the end of the result as soon as it appears there.
+    """
+    if "|" not in text:
+        return text[_line_start.match(text).end():]
+
+    result = []
+    for match in _punctuation_phrase_3.finditer(text):
+        result.append(match.group(0))
+        if result[-1] != " ":
+            continue
+
+        if len(result) > 1 and result[-2] == "|":
+            del result[-2:]
+        elif len(result) > 2 and result[-2] == "-" and result[-3] == "|":
+            del result[-3:]
+        elif len(result) == 1 or len(result) == 2 and result[0] == "-":
+            result.clear()
+
+    return "".join(result)
+
+
+def _remove_unclosed_brackets(text):
+    """
+    Removes the opening brackets after the last closing one, except the last character of the text.
+    """
+    start = text.rfind(")") + 1
+    if text.find("(", start, len(text) - 1) == -1:
+        return text
+
+    return text[:start] + text[start:-1].replace("(", "") + text[-1]
+
+
+def _remove_unopened_brackets(text):
+    """
+    Removes the closing brackets before the first opening one, which are followed by a line of at least one character
+    till the end of the text (an optional trailing newline is ignored). The first character of the text is kept.
+    """
+    end = len(text) - 1 if text.endswith("\n") else len(text)
+    start = max(text.rfind("\n", 0, end) + 1, 1)
+
+    first_opening = text.find("(")
+    stop = min(end - 1, first_opening if first_opening != -1 else len(text))
+    if text.find(")", start, stop) == -1:
+        return text
+
+    return text[:start] + text[start:stop].replace(")", "") + text[stop:]
+
+
 def invalid_charset_cleaner(text, charset_re):
     return charset_re.sub("", text)
 
 
 def light_punctuation_cleaners(text):
     text = text.strip()
-    text = text.replace(" - ", " — ")
-    for s in ['"', '“', '”', '„', '«', '»', '\'']:
-        text = text.replace(s, "")
+    text = _replace_dashes(text)
+    text = _remove_quotes(text)
     text = collapse_whitespace(text)
     return text
 
 
+def _replace_dashes(text):
+    return text.replace(" - ", " — ")
+
+
 def basic_cleaners(text):
     '''Basic pipeline that lowercases and collapses whitespace without transliteration.'''
     text = lowercase(text)
@@ -146,7 +299,111 @@ def english_cleaners(text):
     '''Pipeline for English text, including number and abbreviation expansion.'''
     text = convert_to_ascii(text)
     text = lowercase(text)
-    text = expand_numbers(text)
-    text = expand_abbreviations_en(text)
+    text = _normalize_english(text)
     text = collapse_whitespace(text)
-    return text
\ No newline at end of file
+    return text
+
+
+# cleaners, which can be passed by name
+_cleaners = {
+    cleaner.__name__: cleaner for cleaner in [
+        expand_abbreviations_en, lowercase, collapse_whitespace, convert_to_ascii, expand_numbers,
+        punctuation_cleaners, light_punctuation_cleaners, basic_cleaners, transliteration_cleaners, english_cleaners
+    ]
+}
+
+# steps of the library cleaners, which compile_cleaners merges across the cleaner boundaries
+_cleaner_steps = {
+    light_punctuation_cleaners: [str.strip, _replace_dashes, _remove_quotes, collapse_whitespace],
+    basic_cleaners: [lowercase, collapse_whitespace],
+    transliteration_cleaners: [convert_to_ascii, lowercase, collapse_whitespace],
+    english_cleaners: [convert_to_ascii, lowercase, _normalize_english, collapse_whitespace],
+    punctuation_cleaners: [_replace_punctuation_chars, _clean_punctuation]
+}
+
+# steps, which give the same result when they are applied twice in a row
+# (collapse_whitespace is not among them: removed newlines may leave adjacent spaces for the second call)
+_idempotent_steps = (str.strip, lowercase, convert_to_ascii)
+
+
+class CompiledCleaners:
+    def __init__(self, cleaners: list):
+        """
+        Chain of cleaners prepared once for many calls (see compile_cleaners).
+
+        :param cleaners: List[Callable[[str], str]]
+            The library cleaners are split into steps, so their steps are merged with the neighbouring ones.
+        """
+        self.cleaners = tuple(cleaners)
+
+        steps = []
+        for cleaner in self.cleaners:
+            # cleaners are compared by identity, since a user one may be unhashable
+            parts = next((parts for function, parts in _cleaner_steps.items() if function is cleaner), [cleaner])
+            for step in parts:
+                if steps and isinstance(step, _Translation) and isinstance(steps[-1], _Translation):
+                    steps[-1] = steps[-1] + step
+                elif steps and step is steps[-1] and step in _idempotent_steps:
+                    continue
+                else:
+                    steps.append(step)
+
+        self.steps = tuple(steps)
+
+
+    def __call__(self, text: str) -> str:
+        for step in self.steps:
+            text = step(text)
+        return text
+
+
+    def __len__(self):
+        return len(self.steps)
+
+
+def compile_cleaners(cleaners: Union[str, Callable[[str], str], tuple, list, None]) -> CompiledCleaners:
+    """
+    Resolves the names of the cleaners once and merges their steps: adjacent character replacements are applied
+    in one pass, repeated steps like lowercase at the end of a cleaner and in the next one are applied once.
+    The result is cached for each configuration, so the call is cheap for the same cleaners.
+
+    :param cleaners: Union[str, Callable[[str], str], dict, Tuple[Union[str, Callable[[str], str], dict]]]
+        Names of the cleaners from this module, cleaner functions (see tps.Handler.generate_text) or
+        dictionaries, which map single characters to their replacements (an empty string removes the character).
+        A CompiledCleaners object is returned as is.
+
+    :return: CompiledCleaners
+    """
+    if isinstance(cleaners, CompiledCleaners):
+        return cleaners
+
+    cleaners = () if cleaners is None else cleaners
+    cleaners = tuple(cleaners) if isinstance(cleaners, (tuple, list)) else (cleaners, )
+
+    try:
+        return _compile_cleaners(cleaners)
+    except TypeError:
+        pass
+
+    # the order of the character replacements doesn't matter, so they are hashed as sets
+    cleaners = tuple(frozenset(cleaner.items()) if isinstance(cleaner, dict) else cleaner for cleaner in cleaners)
+    try:
+        return _compile_cleaners(cleaners)
+    except TypeError:  # unhashable callables are not cached
+        return _compile_cleaners.__wrapped__(cleaners)
+
+
+@lru_cache(maxsize=128)
+def _compile_cleaners(cleaners):
+    functions = []
+    for cleaner in cleaners:
+        if isinstance(cleaner, frozenset):
+            functions.append(_Translation(dict(cleaner)))
+        elif isinstance(cleaner, Callable):
+            functions.append(cleaner)
+        elif isinstance(cleaner, str) and cleaner in _cleaners:
+            functions.append(_cleaners[cleaner])
+        else:
+            logger.warning("There is no such cleaner {} in tps library.".format(cleaner))
+
+    return CompiledCleaners(functions)
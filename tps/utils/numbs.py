@@ -1,10 +1,10 @@
 """ from https://github.com/keithito/tacotron """
 
-import inflect
 import re
+from functools import lru_cache
 
 
-_inflect = inflect.engine()
+_inflect = None
 _comma_number_re = re.compile(r'([0-9][0-9\,]+[0-9])')
 _decimal_number_re = re.compile(r'([0-9]+\.[0-9]+)')
 _pounds_re = re.compile(r'£([0-9\,]*[0-9]+)')
@@ -12,6 +12,24 @@ _dollars_re = re.compile(r'\$([0-9\.\,]*[0-9]+)')
 _ordinal_re = re.compile(r'[0-9]+(st|nd|rd|th)')
 _number_re = re.compile(r'[0-9]+')
 
+# The patterns above only match the characters 0-9.,£$ and an ordinal suffix right after a digit, so the maximal runs
+# of them are normalized independently of each other and of the rest of the text.
+_chunk_re = re.compile(r'[0-9£$][0-9.,£$]*(?:(?<=[0-9])(?:st|nd|rd|th))?')
+
+
+def _get_inflect():
+  # the engine is heavy to import and to create, so it's done on the first use
+  global _inflect
+  if _inflect is None:
+    import inflect
+    _inflect = inflect.engine()
+  return _inflect
+
+
+@lru_cache(maxsize=4096)
+def _number_to_words(num, **kwargs):
+  return _get_inflect().number_to_words(num, **kwargs)
+
 
 def _remove_commas(m):
   return m.group(1).replace(',', '')
@@ -43,7 +61,7 @@ def _expand_dollars(m):
 
 
 def _expand_ordinal(m):
-  return _inflect.number_to_words(m.group(0))
+  return _number_to_words(m.group(0))
 
 
 def _expand_number(m):
@@ -52,13 +70,13 @@ def _expand_number(m):
     if num == 2000:
       return 'two thousand'
     elif num > 2000 and num < 2010:
-      return 'two thousand ' + _inflect.number_to_words(num % 100)
+      return 'two thousand ' + _number_to_words(num % 100)
     elif num % 100 == 0:
-      return _inflect.number_to_words(num // 100) + ' hundred'
+      return _number_to_words(num // 100) + ' hundred'
     else:
-      return _inflect.number_to_words(num, andword='', zero='oh', group=2).replace(', ', ' ')
+      return _number_to_words(num, andword='', zero='oh', group=2).replace(', ', ' ')
   else:
-    return _inflect.number_to_words(num, andword='')
+    return _number_to_words(num, andword='')
 
 
 def normalize_numbers(text):
@@ -69,3 +87,14 @@ def normalize_numbers(text):
   text = re.sub(_ordinal_re, _expand_ordinal, text)
   text = re.sub(_number_re, _expand_number, text)
   return text
+
+
+@lru_cache(maxsize=4096)
+def normalize_number_chunk(chunk):
+  '''Same as normalize_numbers for a single match of _chunk_re, the results are cached.'''
+  return normalize_numbers(chunk)
+
+
+def normalize_numbers_chunked(text):
+  '''Same as normalize_numbers, but the text is scanned once and the numbers are verbalized by the cache.'''
+  return _chunk_re.sub(lambda m: normalize_number_chunk(m.group(0)), text)